@@ -1,8 +1,15 @@
 # [REPLACE] ~/repositories/cx-shell/src/cx_shell/engine/connector/engine.py
 
+import asyncio
 import json
+import logging
+import os
+import re
+import stat
+import time
 import uuid
-import hashlib
+from collections import OrderedDict
+from functools import lru_cache
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import (
@@ -12,9 +19,11 @@ from typing import (
     Callable,
     Dict,
     Literal,
+    Mapping,
     Optional,
     Tuple,
 )
+import jmespath
 import structlog
 import yaml
 import networkx as nx
@@ -23,15 +32,20 @@ from ...utils import CX_HOME
 from jinja2 import Environment, TemplateError
 from cx_core_schemas.connector_script import ConnectorStep
 from cx_core_schemas.vfs import RunManifest, StepResult, Artifact
-from ...management.cache_manager import CacheManager
+from ...management.cache_manager import HASH_ALGORITHM, CacheManager, new_hasher
 from ...engine.context import RunContext
 from ...management.notebook_parser import NotebookParser
 from cx_core_schemas.notebook import ContextualPage
 from cx_core_schemas.connector_script import FileToWrite, WriteFilesAction
 from cx_core_schemas.server_schemas import BlockOutput, DataRef, SduiPayload
-from .utils import safe_serialize
+from .utils import json_loads, safe_serialize
 from .config import ConnectionResolver
 
+try:
+    from yaml import CSafeLoader as _YAMLLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YAMLLoader
+
 if TYPE_CHECKING:
     from .service import ConnectorService
 
@@ -40,11 +54,46 @@ if TYPE_CHECKING:
 logger = structlog.get_logger(__name__)
 RUNS_DIR = CX_HOME / "runs"
 
+# `run` actions handled by internal strategies that need no connection_source.
+CONNECTIONLESS_RUN_ACTIONS = frozenset({"run_python_script", "run_flow"})
+
+# Step results up to this serialized size are embedded inline in status events;
+# larger ones are sent as a DataRef "claim check".
+EMBED_THRESHOLD_BYTES = 256 * 1024  # 256KB
+
+# JMESPath queries of this shape are plain field lookups (see compile_jmespath).
+_DOT_PATH_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)*")
+
+# How many claim-check BlockOutputs are kept for reuse across identical outputs.
+RECENT_REFS_MAX = 256
+
+# Steps with at least this many Jinja template strings are rendered off the event loop.
+RENDER_OFFLOAD_MIN_TEMPLATES = 32
+
+# Steps known to have no side effects and to leave the run's shared context
+# alone; only these run alongside other steps of their generation. Anything
+# else (file writes, SQL, scripts, declarative API calls, transforms, sub-flows)
+# may be relied on through its side effects, so it keeps document order.
+CONCURRENT_SAFE_ENGINES = frozenset({"markdown", "ui-component"})
+CONCURRENT_SAFE_RUN_ACTIONS = frozenset({"read_content", "browse_path"})
+
+# A reference to another step's results in a template or `if` expression,
+# e.g. `steps.get_data.outputs` or `steps['get-data']`.
+_STEP_REFERENCE_RE = re.compile(
+    r"\bsteps\s*(?:\.\s*([A-Za-z_]\w*)|\[\s*['\"]([^'\"]+)['\"]\s*\])"
+)
+
+
+_SQL_QUOTE_ESCAPE = str.maketrans({"'": "''"})
+
 
 def sql_quote_filter(value):
     if value is None:
         return "NULL"
-    return f"'{str(value).replace("'", "''")}'"
+    s = value if isinstance(value, str) else str(value)
+    if "'" in s:
+        s = s.translate(_SQL_QUOTE_ESCAPE)
+    return f"'{s}'"
 
 
 class ScriptEngine:
@@ -60,6 +109,22 @@ class ScriptEngine:
         self.cache_manager = CacheManager()
         RUNS_DIR.mkdir(exist_ok=True, parents=True)
 
+        # LRU of claim-check outputs keyed by content hash (see _get_data_ref_output).
+        self._recent_refs: OrderedDict[str, BlockOutput] = OrderedDict()
+
+        # Maps a `run` block's action name to the coroutine that executes it.
+        # Every handler takes (strategy, connection, secrets, action, context).
+        self._run_action_dispatch: Dict[str, Callable[..., Awaitable[Any]]] = {
+            "read_content": self._run_read_content,
+            "browse_path": self._run_browse_path,
+            "run_declarative_action": self._run_declarative_action,
+            "write_files": self._run_file_action,
+            "aggregate_content": self._run_file_action,
+            "run_python_script": self._run_python_script,
+            "run_sql_query": self._run_sql_query,
+            "run_flow": self._run_flow,
+        }
+
         self.jinja_env = Environment()
         self.jinja_env.filters["sqlquote"] = sql_quote_filter
 
@@ -69,46 +134,74 @@ class ScriptEngine:
             return datetime.now()
 
         self.jinja_env.globals["now"] = get_now
+        # Built once so its compiled-template cache is shared across runs.
+        self._recursive_render = recursive_render_factory(self.jinja_env)
+
+    async def _resolve_cached(
+        self, source: str, context: RunContext
+    ) -> Tuple[Any, Any]:
+        """Resolves a connection source once per run and reuses the result."""
+        resolved = context.resolved_connections.get(source)
+        if resolved is None:
+            resolved = await context.services.resolver.resolve(source)
+            context.resolved_connections[source] = resolved
+        return resolved
 
     def _build_dependency_graph(self, steps: list[ConnectorStep]) -> nx.DiGraph:
-        # [This method remains unchanged]
         dag = nx.DiGraph()
-        step_map = {step.id: step for step in steps}
+        step_ids = {step.id for step in steps}
         for step in steps:
             dag.add_node(step.id, step_data=step)
+        for step in steps:
             if step.depends_on:
-                for dep_id in step.depends_on:
-                    if dep_id in step_map:
-                        dag.add_edge(dep_id, step.id)
-                    else:
-                        raise ValueError(
-                            f"Step '{step.id}' has an invalid dependency: '{dep_id}'"
-                        )
+                missing = set(step.depends_on).difference(step_ids)
+                if missing:
+                    raise ValueError(
+                        f"Step '{step.id}' has invalid dependencies: {sorted(missing)}"
+                    )
+                dag.add_edges_from((dep_id, step.id) for dep_id in step.depends_on)
+            # Steps read through `inputs` or templates must also finish first,
+            # since a generation's steps run concurrently.
+            implicit = (_implicit_step_references(step) & step_ids) - {step.id}
+            dag.add_edges_from((dep_id, step.id) for dep_id in sorted(implicit))
         if not nx.is_directed_acyclic_graph(dag):
             cycle = nx.find_cycle(dag, orientation="original")
             raise ValueError(f"Workflow contains a circular dependency: {cycle}")
         return dag
 
     def _calculate_cache_key(
-        self, step: ConnectorStep, parent_hashes: Dict[str, str]
+        self, step: ConnectorStep, parent_hashes: list[Tuple[str, Optional[str]]]
     ) -> str:
-        # [This method remains unchanged]
-        hasher = hashlib.sha256()
-        step_def_dict = step.model_dump()
-        step_def_str = json.dumps(step_def_dict, sort_keys=True)
-        hasher.update(step_def_str.encode("utf-8"))
-        sorted_parent_hashes = sorted(parent_hashes.items())
-        for step_id, hash_val in sorted_parent_hashes:
-            hasher.update(f"{step_id}:{hash_val}".encode("utf-8"))
-        return f"sha256:{hasher.hexdigest()}"
-
-    def _find_cached_step(self, cache_key: str) -> Optional[StepResult]:
-        # [This method remains unchanged]
+        """
+        Derives a step's cache key from its rendered definition and the output
+        hashes of its parents, given as (step_id, hash) pairs sorted by step_id.
+        """
+        hasher = new_hasher()
+        # Sorted keys make the dump canonical: params dicts keep their insertion
+        # order, so logically identical steps could otherwise hash differently.
+        step_json = json.dumps(
+            step.model_dump(mode="json", exclude_none=True),
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+        hasher.update(step_json.encode("utf-8"))
+        hasher.update(
+            "".join(
+                f"{step_id}:{hash_val}" for step_id, hash_val in parent_hashes
+            ).encode("utf-8")
+        )
+        return f"{HASH_ALGORITHM}:{hasher.hexdigest()}"
+
+    async def _find_cached_step(self, cache_key: str) -> Optional[StepResult]:
+        """Scans recent run manifests for a cache hit without blocking the event loop."""
+        return await asyncio.to_thread(self._find_cached_step_sync, cache_key)
+
+    def _find_cached_step_sync(self, cache_key: str) -> Optional[StepResult]:
         try:
             for manifest_file in sorted(
                 RUNS_DIR.glob("**/manifest.json"), reverse=True
             )[:100]:
-                manifest_data = json.loads(manifest_file.read_text())
+                manifest_data = json_loads(manifest_file.read_bytes())
                 for step_result in manifest_data.get("steps", []):
                     if (
                         step_result.get("cache_key") == cache_key
@@ -125,6 +218,11 @@ class ScriptEngine:
         logger.debug("engine.cache.miss", cache_key=cache_key)
         return None
 
+    def _load_cached_output(self, output_hash: str) -> Tuple[Any, int]:
+        """Reads and parses a cached step output, returning it with its size."""
+        cached_bytes = self.cache_manager.read_bytes(output_hash)
+        return json_loads(cached_bytes), len(cached_bytes)
+
     def _unwrap_engine_result(self, raw_result: Any) -> Any:
         """
         Applies the default unwrapping logic for results coming from the engine.
@@ -143,6 +241,57 @@ class ScriptEngine:
             return unwrapped
         return raw_result
 
+    async def _run_read_content(self, strategy, connection, secrets, action, context):
+        vfs_response = await strategy.get_content(
+            path_parts=[action.path], connection=connection, secrets=secrets
+        )
+        return vfs_response.content
+
+    async def _run_browse_path(self, strategy, connection, secrets, action, context):
+        return await strategy.browse_path(
+            path_parts=[action.path], connection=connection, secrets=secrets
+        )
+
+    async def _run_declarative_action(
+        self, strategy, connection, secrets, action, context
+    ):
+        return await strategy.run_declarative_action(
+            connection=connection,
+            secrets=secrets,
+            action_params=action.model_dump(),
+            script_input=action.context,
+        )
+
+    async def _run_file_action(self, strategy, connection, secrets, action, context):
+        # Covers `write_files` and `aggregate_content`, which share a signature.
+        method_to_call = getattr(strategy, action.action)
+        return await method_to_call(connection, action.model_dump(), context)
+
+    async def _run_python_script(self, strategy, connection, secrets, action, context):
+        python_strategy = self.connector.strategies.get("python-sandboxed")
+        return await python_strategy.run_python_script(
+            connection, action.model_dump(), context
+        )
+
+    async def _run_sql_query(self, strategy, connection, secrets, action, context):
+        # The strategy is responsible for parsing the action payload itself.
+        return await strategy.run_sql_query(
+            connection, secrets, action.model_dump(), context
+        )
+
+    async def _run_flow(self, strategy, connection, secrets, action, context):
+        flow_path = context.services.flow_manager._find_flow(action.flow_name)
+        sub_flow_context = RunContext(
+            services=context.services,
+            session=context.session,
+            script_input=action.inputs,
+            piped_input=context.piped_input,
+            current_flow_path=flow_path,
+            resolved_connections=context.resolved_connections,
+            resolved_strategies=context.resolved_strategies,
+        )
+        return await self.run_script(sub_flow_context)
+
     async def _execute_step(
         self,
         context: RunContext,
@@ -165,10 +314,12 @@ class ScriptEngine:
         # Step 2: Resolve Connection & Strategy (but only if a source is provided)
         connection, secrets, strategy = None, None, None
         if validated_step.connection_source:
-            connection, secrets = await context.services.resolver.resolve(
-                validated_step.connection_source
-            )
-            strategy = self.connector._get_strategy_for_connection_model(connection)
+            source = validated_step.connection_source
+            connection, secrets = await self._resolve_cached(source, context)
+            strategy = context.resolved_strategies.get(source)
+            if strategy is None:
+                strategy = self.connector._get_strategy_for_connection_model(connection)
+                context.resolved_strategies[source] = strategy
 
         # Step 3: Engine-Aware Dispatcher
 
@@ -180,61 +331,20 @@ class ScriptEngine:
             )
 
             # Certain actions are connectionless and handled by internal strategies.
-            if action.action == "run_python_script":
-                python_strategy = self.connector.strategies.get("python-sandboxed")
-                return await python_strategy.run_python_script(
-                    None, action.model_dump(), context
-                )
-            if action.action == "run_flow":
-                flow_path = context.services.flow_manager._find_flow(action.flow_name)
-                sub_flow_context = RunContext(
-                    services=context.services,
-                    session=context.session,
-                    script_input=action.inputs,
-                    piped_input=context.piped_input,
-                    current_flow_path=flow_path,
-                )
-                return await self.run_script(sub_flow_context)
-
             # All other actions require a connection and strategy.
-            if not strategy:
+            if action.action not in CONNECTIONLESS_RUN_ACTIONS and not strategy:
                 raise ValueError(
                     f"Step '{validated_step.name or validated_step.id}' with action '{action.action}' requires a 'connection_source'."
                 )
 
-            if hasattr(strategy, action.action):
-                method_to_call = getattr(strategy, action.action)
-                # Dispatch to the correct strategy method with the correct arguments.
-                if action.action in ["write_files", "aggregate_content"]:
-                    return await method_to_call(
-                        connection, action.model_dump(), context
-                    )
-                elif action.action == "run_declarative_action":
-                    return await method_to_call(
-                        connection=connection,
-                        secrets=secrets,
-                        action_params=action.model_dump(),
-                        script_input=action.context,
-                    )
-                elif action.action == "read_content":
-                    vfs_response = await strategy.get_content(
-                        path_parts=[action.path], connection=connection, secrets=secrets
-                    )
-                    return vfs_response.content
-                elif action.action == "run_sql_query":
-                    # The ScriptEngine's responsibility is now much simpler.
-                    # It just needs to call the strategy's public method that matches the action name.
-                    # It passes the full action payload and the run context. The strategy itself
-                    # is now responsible for parsing these arguments.
-                    return await strategy.run_sql_query(
-                        connection, secrets, action.model_dump(), context
-                    )
-
-            raise NotImplementedError(
-                f"Action '{action.action}' is not implemented by the '{strategy.strategy_key}' strategy."
-            )
+            handler = self._run_action_dispatch.get(action.action)
+            if not handler:
+                raise NotImplementedError(
+                    f"Action '{action.action}' is not implemented by the '{strategy.strategy_key}' strategy."
+                )
+            return await handler(strategy, connection, secrets, action, context)
 
-        # --- PATH A: Notebook Block Execution (driven by `engine` key) ---
+        # --- PATH B: Notebook Block Execution (driven by `engine` key) ---
         if validated_step.engine:
             engine_name = validated_step.engine
             log.debug("engine.step.execution_started_from_notebook", engine=engine_name)
@@ -252,7 +362,7 @@ class ScriptEngine:
                 input_data = context.steps[block_id]["outputs"][output_name]
 
                 # 2. Parse the operation from the block's content
-                operation = yaml.safe_load(validated_step.content)
+                operation = yaml.load(validated_step.content, Loader=_YAMLLoader)
                 target_format = operation.get("format")
                 target_path_template = operation.get("target_path")
 
@@ -302,8 +412,8 @@ class ScriptEngine:
                 if not fs_strategy:
                     raise RuntimeError("Internal Error: Filesystem strategy not found.")
 
-                fs_connection, _ = await context.services.resolver.resolve(
-                    "user:fs_generic"
+                fs_connection, _ = await self._resolve_cached(
+                    "user:fs_generic", context
                 )
 
                 return await fs_strategy.write_files(
@@ -314,7 +424,7 @@ class ScriptEngine:
 
             if engine_name == "transform":
                 transformer = context.services.transformer_service
-                script_data = yaml.safe_load(validated_step.content)
+                script_data = yaml.load(validated_step.content, Loader=_YAMLLoader)
 
                 # --- START OF DEFINITIVE, CONTEXT-AWARE LOGIC ---
 
@@ -373,7 +483,9 @@ class ScriptEngine:
 
                 elif engine_name == "ui-component":
                     log.debug("engine.step.passing_through_ui_component")
-                    ui_component_definition = yaml.safe_load(validated_step.content)
+                    ui_component_definition = yaml.load(
+                        validated_step.content, Loader=_YAMLLoader
+                    )
                     if validated_step.inputs:
                         input_data = {}
                         for input_str in validated_step.inputs:
@@ -416,78 +528,9 @@ class ScriptEngine:
                     f"Execution for notebook engine '{engine_name}' is not yet implemented."
                 )
 
-        # --- PATH B: Flow/Notebook `run` Block Execution ---
-        elif validated_step.run:
-            # The 'run' block from the notebook will now correctly enter this path,
-            # just like a step from a .flow.yaml file.
-            action = validated_step.run
-            log.debug(
-                "engine.step.execution_started_from_run_block", action=action.action
-            )
-
-            if not strategy:
-                raise ValueError(
-                    f"Step '{validated_step.name or validated_step.id}' requires a 'connection_source' for action '{action.action}'."
-                )
-
-            # This is the explicit dispatcher for all known flow actions.
-            if action.action == "read_content":
-                vfs_response = await strategy.get_content(
-                    path_parts=[action.path], connection=connection, secrets=secrets
-                )
-                return vfs_response.content
-
-            elif action.action == "browse_path":
-                return await strategy.browse_path(
-                    path_parts=[action.path], connection=connection, secrets=secrets
-                )
-
-            elif action.action == "run_declarative_action":
-                return await strategy.run_declarative_action(
-                    connection=connection,
-                    secrets=secrets,
-                    action_params=action.model_dump(),
-                    script_input=action.context,
-                )
-
-            elif action.action in ["write_files", "aggregate_content"]:
-                method_to_call = getattr(strategy, action.action)
-                return await method_to_call(connection, action.model_dump(), context)
-
-            elif action.action == "run_python_script":
-                python_strategy = self.connector.strategies.get("python-sandboxed")
-                return await python_strategy.run_python_script(
-                    connection, action.model_dump(), context
-                )
-
-            elif action.action == "run_sql_query":
-                # The ScriptEngine's responsibility is now much simpler.
-                # It just needs to call the strategy's public method that matches the action name.
-                # It passes the full action payload and the run context. The strategy itself
-                # is now responsible for parsing these arguments.
-                return await strategy.run_sql_query(
-                    connection, secrets, action.model_dump(), context
-                )
-
-            elif action.action == "run_flow":
-                flow_path = context.services.flow_manager._find_flow(action.flow_name)
-                sub_flow_context = RunContext(
-                    services=context.services,
-                    session=context.session,
-                    script_input=action.inputs,
-                    piped_input=context.piped_input,
-                    current_flow_path=flow_path,
-                )
-                return await self.run_script(sub_flow_context)
-
-            raise NotImplementedError(
-                f"Action '{action.action}' is not implemented by the '{strategy.strategy_key}' strategy."
-            )
-
-        else:
-            raise ValueError(
-                f"Step '{validated_step.id}' is invalid: must have either an 'engine' or a 'run' block."
-            )
+        raise ValueError(
+            f"Step '{validated_step.id}' is invalid: must have either an 'engine' or a 'run' block."
+        )
 
     async def run_script(
         self,
@@ -520,7 +563,7 @@ class ScriptEngine:
         elif script_path.name.endswith((".flow.yaml", ".flow.yml")):
             log.debug("engine.load_script.detected_flow")
             with open(script_path, "r", encoding="utf-8") as f:
-                script_data = yaml.safe_load(f)
+                script_data = yaml.load(f, Loader=_YAMLLoader)
             run_type = "flow"
         else:
             raise ValueError(f"Unsupported script type: '{script_path.suffix}'")
@@ -613,295 +656,391 @@ class ScriptEngine:
 
         dag = self._build_dependency_graph([ConnectorStep(**s) for s in raw_steps_list])
         topological_generations = list(nx.topological_generations(dag))
+        # Sorted once here so cache keys can consume parent hashes in order.
+        predecessors = {
+            step_id: tuple(sorted(dag.predecessors(step_id))) for step_id in dag.nodes
+        }
         final_results: Dict[str, Any] = {}
-        recursive_render = recursive_render_factory(self.jinja_env)
+        recursive_render = self._recursive_render
 
-        # Define the threshold for embedding data directly in bytes
-        EMBED_THRESHOLD_BYTES = 256 * 1024  # 256KB
+        # The page is immutable for the duration of the run, so dump it once.
+        page_dump = (
+            script_data.model_dump()
+            if isinstance(script_data, ContextualPage)
+            else script_data
+        )
 
         try:
             for generation in topological_generations:
-                for step_id in generation:
-                    step_start_time = datetime.now(timezone.utc)
-                    raw_step_dict = dag.nodes[step_id]["step_data"].model_dump(
-                        by_alias=True
-                    )
+                for batch in self._split_generation(dag, generation):
+                    # Steps within a batch have no dependencies on each other
+                    # and no side effects, so they run concurrently. Results
+                    # are recorded in batch order afterwards to keep the
+                    # manifest deterministic; steps that succeeded are
+                    # recorded even when a sibling failed, so a re-run finds
+                    # their cache entries.
+                    tasks = [
+                        asyncio.create_task(
+                            self._run_single_step(
+                                context,
+                                dag,
+                                predecessors,
+                                step_id,
+                                page_dump,
+                                recursive_render,
+                                manifest,
+                                no_cache,
+                                status_callback,
+                                log,
+                            )
+                        )
+                        for step_id in batch
+                    ]
+                    outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+
+                    failure: Optional[BaseException] = None
+                    for step_id, outcome in zip(batch, outcomes):
+                        if isinstance(outcome, BaseException):
+                            failure = failure or outcome
+                            continue
+                        step_result_obj, raw_result, step_outputs = outcome
+                        manifest.steps.append(step_result_obj)
+                        final_results[step_id] = raw_result
+                        context.steps[step_id] = {
+                            "result": raw_result,
+                            "outputs": step_outputs,
+                            "output_hash": step_result_obj.output_hash,
+                        }
+                    if failure is not None:
+                        raise failure
 
-                    full_render_context = {
-                        "page": script_data.model_dump()
-                        if isinstance(script_data, ContextualPage)
-                        else script_data,
-                        "inputs": context.script_input,
-                        "steps": context.steps,
-                        **context.session.variables,
-                        **(raw_step_dict.get("context") or {}),
-                    }
+            manifest.status = "completed"
+            log.info("engine.run.success")
+            return final_results
+        except Exception as e:
+            # The failing step has already reported its own error via the callback.
+            manifest.status = "failed"
+            log.error("engine.run.failed", error=str(e), exc_info=True)
+            # The fields are known-valid, so skip validation on the failure path.
+            manifest.steps.append(
+                StepResult.model_construct(
+                    step_id="error",
+                    status="failed",
+                    summary=str(e),
+                    cache_key="",
+                    cache_hit=False,
+                )
+            )
+            final_results["error"] = f"{type(e).__name__}: {e}"
+            return final_results
+        finally:
+            manifest_path = run_dir / "manifest.json"
+            # Manifests are written compactly; pretty-print only when debugging.
+            # The manifest stays one JSON document because the cache scan,
+            # IndexManager and HistoryLogger all parse it whole; serializing it
+            # in the worker thread keeps large runs from stalling the loop.
+            indent = 2 if logging.getLogger().isEnabledFor(logging.DEBUG) else None
+            await asyncio.to_thread(
+                self._write_manifest_sync, manifest_path, manifest, indent
+            )
+            log.info("engine.run.manifest_written", path=str(manifest_path))
 
-                    if if_condition := raw_step_dict.get("if"):
-                        try:
-                            if not self.jinja_env.compile_expression(if_condition)(
-                                **full_render_context
-                            ):
-                                log.info(
-                                    "engine.step.skipped",
-                                    step_id=step_id,
-                                    reason="if_condition",
-                                )
-                                if status_callback:
-                                    await status_callback(
-                                        step_id, "skipped", "Conditional returned false"
-                                    )
-                                manifest.steps.append(
-                                    StepResult(
-                                        step_id=step_id,
-                                        status="skipped",
-                                        summary="Skipped: 'if' condition was false.",
-                                        cache_key="",
-                                        cache_hit=False,
-                                    )
-                                )
-                                context.steps[step_id] = {
-                                    "result": None,
-                                    "outputs": {},
-                                    "output_hash": None,
-                                }
-                                final_results[step_id] = None
-                                continue
-                        except Exception as e:
-                            raise ValueError(
-                                f"Failed to evaluate 'if' condition for step '{step_id}': {e}"
-                            ) from e
+    @staticmethod
+    def _split_generation(dag: nx.DiGraph, generation: list[str]) -> list[list[str]]:
+        """
+        Splits a generation, in order, into batches that may run concurrently.
+        Consecutive side-effect-free steps (see CONCURRENT_SAFE_ENGINES) share
+        a batch; every other step gets a batch of its own, so it runs as it
+        would in a sequential run.
+        """
+        batches: list[list[str]] = []
+        open_batch: Optional[list[str]] = None
+        for step_id in generation:
+            step = dag.nodes[step_id]["step_data"]
+            if step.run is not None:
+                exclusive = step.run.action not in CONCURRENT_SAFE_RUN_ACTIONS
+            else:
+                exclusive = step.engine not in CONCURRENT_SAFE_ENGINES
+            if exclusive:
+                batches.append([step_id])
+                open_batch = None
+            elif open_batch is None:
+                open_batch = [step_id]
+                batches.append(open_batch)
+            else:
+                open_batch.append(step_id)
+        return batches
 
-                    if status_callback:
-                        await status_callback(step_id, "running", None)
+    @staticmethod
+    def _write_manifest_sync(
+        manifest_path: Path, manifest: RunManifest, indent: Optional[int]
+    ) -> None:
+        """Serializes and writes a finished run's manifest."""
+        manifest_path.write_text(manifest.model_dump_json(indent=indent))
 
-                    try:
-                        rendered_step_dict = recursive_render(
-                            raw_step_dict, full_render_context
-                        )
-                        validated_step = ConnectorStep(**rendered_step_dict)
-                    except Exception as e:
-                        raise ValueError(
-                            f"Failed to render/validate step '{step_id}': {e}"
-                        ) from e
+    async def _run_single_step(
+        self,
+        context: RunContext,
+        dag: nx.DiGraph,
+        predecessors: Dict[str, Tuple[str, ...]],
+        step_id: str,
+        page_dump: Any,
+        recursive_render: Callable[[Any, Mapping[str, Any]], Any],
+        manifest: RunManifest,
+        no_cache: bool,
+        status_callback: Optional[Callable[[str, str, Any], Awaitable[None]]],
+        log: Any,
+    ) -> Tuple[StepResult, Any, Dict[str, Any]]:
+        """
+        Renders, caches and executes one step of a run.
 
-                    parent_hashes = {
-                        pred: context.steps[pred]["output_hash"]
-                        for pred in dag.predecessors(step_id)
-                    }
-                    cache_key = self._calculate_cache_key(validated_step, parent_hashes)
-                    cached_step = (
-                        None if no_cache else self._find_cached_step(cache_key)
-                    )
+        Returns the step's manifest entry, its unwrapped result and its named
+        outputs. Recording them on the run is left to the caller, so that steps
+        of the same generation can run concurrently. Any failure is reported
+        through the status callback before it is re-raised.
+        """
+        step_start_ns = time.monotonic_ns()
+        try:
+            raw_step_dict = dag.nodes[step_id]["step_data"].model_dump(by_alias=True)
+
+            # Step context overrides session variables, which override the
+            # run-level names. Built flat once per step: Jinja copies whatever
+            # mapping it is given into a dict on every render anyway, and
+            # passing it positionally keeps that to a single copy.
+            full_render_context = {
+                "page": page_dump,
+                "inputs": context.script_input,
+                "steps": context.steps,
+                **context.session.variables,
+                **(raw_step_dict.get("context") or {}),
+            }
 
-                    if cached_step:
-                        raw_result_wrapped = (
-                            json.loads(
-                                self.cache_manager.read_bytes(cached_step.output_hash)
-                            )
-                            if cached_step.output_hash
-                            else None
-                        )
-                        step_result_obj = cached_step
-                        step_result_obj.cache_hit = True
-                        log.info("engine.step.cache_hit", step_id=step_id)
-                    else:
-                        raw_result_wrapped = await self._execute_step(
-                            context, validated_step
-                        )
-                        output_hash = self.cache_manager.write_json(raw_result_wrapped)
-                        step_result_obj = StepResult(
-                            step_id=step_id,
-                            status="completed",
-                            summary="Completed successfully.",
-                            cache_key=cache_key,
-                            cache_hit=False,
-                            output_hash=output_hash,
+            if if_condition := raw_step_dict.get("if"):
+                try:
+                    condition_met = self.jinja_env.compile_expression(if_condition)(
+                        full_render_context
+                    )
+                except Exception as e:
+                    raise ValueError(
+                        f"Failed to evaluate 'if' condition for step '{step_id}': {e}"
+                    ) from e
+                if not condition_met:
+                    log.info(
+                        "engine.step.skipped", step_id=step_id, reason="if_condition"
+                    )
+                    if status_callback:
+                        await status_callback(
+                            step_id, "skipped", "Conditional returned false"
                         )
+                    skipped_result = StepResult(
+                        step_id=step_id,
+                        status="skipped",
+                        summary="Skipped: 'if' condition was false.",
+                        cache_key="",
+                        cache_hit=False,
+                    )
+                    return skipped_result, None, {}
 
-                    step_end_time = datetime.now(timezone.utc)
-                    duration_ms = int(
-                        (step_end_time - step_start_time).total_seconds() * 1000
+            if status_callback:
+                await status_callback(step_id, "running", None)
+
+            try:
+                if count_templates(raw_step_dict) >= RENDER_OFFLOAD_MIN_TEMPLATES:
+                    # Large blocks (e.g. nested UI definitions) are rendered
+                    # in a worker thread so the event loop stays responsive.
+                    rendered_step_dict = await asyncio.to_thread(
+                        recursive_render, raw_step_dict, full_render_context
+                    )
+                else:
+                    rendered_step_dict = recursive_render(
+                        raw_step_dict, full_render_context
                     )
+                validated_step = ConnectorStep(**rendered_step_dict)
+            except Exception as e:
+                raise ValueError(
+                    f"Failed to render/validate step '{step_id}': {e}"
+                ) from e
 
-                    raw_result = self._unwrap_engine_result(raw_result_wrapped)
+            parent_hashes = [
+                (pred, context.steps[pred]["output_hash"])
+                for pred in predecessors[step_id]
+            ]
+            cache_key = self._calculate_cache_key(validated_step, parent_hashes)
+            cached_step = None if no_cache else await self._find_cached_step(cache_key)
+
+            if cached_step:
+                raw_result_wrapped, result_size = None, 0
+                if cached_step.output_hash:
+                    # The blob is always needed: every step's result is returned
+                    # in final_results. Load it off the loop so sibling steps of
+                    # this generation keep running meanwhile.
+                    raw_result_wrapped, result_size = await asyncio.to_thread(
+                        self._load_cached_output, cached_step.output_hash
+                    )
+                step_result_obj = cached_step
+                step_result_obj.cache_hit = True
+                log.info("engine.step.cache_hit", step_id=step_id)
+            else:
+                raw_result_wrapped = await self._execute_step(context, validated_step)
+                output_hash, result_size = self.cache_manager.write_json(
+                    raw_result_wrapped
+                )
+                step_result_obj = StepResult(
+                    step_id=step_id,
+                    status="completed",
+                    summary="Completed successfully.",
+                    cache_key=cache_key,
+                    cache_hit=False,
+                    output_hash=output_hash,
+                )
 
-                    if isinstance(raw_result, dict) and "error" in raw_result:
-                        error_message = raw_result["error"]
-                        if status_callback:
-                            await status_callback(
-                                step_id,
-                                "error",
-                                {"error": error_message, "duration_ms": duration_ms},
-                            )
-                        raise RuntimeError(f"Step '{step_id}' failed: {error_message}")
+            duration_ms = (time.monotonic_ns() - step_start_ns) // 1_000_000
 
-                    if status_callback:
-                        try:
-                            result_bytes = json.dumps(
-                                safe_serialize(raw_result)
-                            ).encode("utf-8")
-                            result_size = len(result_bytes)
-                        except (TypeError, OverflowError):
-                            result_size = float("inf")
-
-                        if result_size < EMBED_THRESHOLD_BYTES:
-                            log.debug(
-                                "engine.output.embedding_inline",
-                                step_id=step_id,
-                                size_bytes=result_size,
-                            )
-                            sdui_payload = self._schematize_result(raw_result)
-                            block_output = BlockOutput(inline_data=sdui_payload)
-                        else:
-                            log.info(
-                                "engine.output.creating_data_ref",
-                                step_id=step_id,
-                                size_bytes=result_size,
-                            )
-                            renderer_hint, metadata = self._get_result_metadata(
-                                raw_result
-                            )
-                            access_url = f"http://localhost:8888/artifacts/{step_result_obj.output_hash}"
-                            data_ref = DataRef(
-                                artifact_id=step_result_obj.output_hash,
-                                renderer_hint=renderer_hint,
-                                metadata=metadata,
-                                access_url=access_url,
-                            )
-                            block_output = BlockOutput(data_ref=data_ref)
+            raw_result = self._unwrap_engine_result(raw_result_wrapped)
 
-                        await status_callback(
-                            step_id,
-                            "success",
-                            {"output": block_output, "duration_ms": duration_ms},
-                        )
+            if isinstance(raw_result, dict) and "error" in raw_result:
+                raise RuntimeError(f"Step '{step_id}' failed: {raw_result['error']}")
+
+            if status_callback:
+                # The size of the cached JSON blob decides inline vs. claim check.
+                if result_size < EMBED_THRESHOLD_BYTES:
+                    log.debug(
+                        "engine.output.embedding_inline",
+                        step_id=step_id,
+                        size_bytes=result_size,
+                    )
+                    sdui_payload = self._schematize_result(raw_result)
+                    block_output = BlockOutput(inline_data=sdui_payload)
+                else:
+                    log.info(
+                        "engine.output.creating_data_ref",
+                        step_id=step_id,
+                        size_bytes=result_size,
+                    )
+                    block_output = self._get_data_ref_output(
+                        step_result_obj.output_hash, raw_result
+                    )
 
-                    step_outputs = {}
-                    outputs_spec = raw_step_dict.get("outputs")
-                    if isinstance(outputs_spec, list):
-                        for output_name in outputs_spec:
-                            step_outputs[output_name] = raw_result
-                    elif isinstance(outputs_spec, dict):
-                        import jmespath
+                await status_callback(
+                    step_id,
+                    "success",
+                    {"output": block_output, "duration_ms": duration_ms},
+                )
 
-                        for output_name, jmespath_query in outputs_spec.items():
+            step_outputs = {}
+            outputs_spec = raw_step_dict.get("outputs")
+            if isinstance(outputs_spec, list):
+                for output_name in outputs_spec:
+                    step_outputs[output_name] = raw_result
+            elif isinstance(outputs_spec, dict):
+                for output_name, jmespath_query in outputs_spec.items():
+                    try:
+                        step_outputs[output_name] = compile_jmespath(
+                            jmespath_query
+                        ).search(raw_result)
+                    except Exception as e:
+                        log.warning(
+                            "engine.outputs.jmespath_failed",
+                            query=jmespath_query,
+                            error=str(e),
+                        )
+                        step_outputs[output_name] = None
+
+            if isinstance(raw_result, dict) and "artifacts" in raw_result:
+                artifacts_data = raw_result.get("artifacts")
+                if isinstance(artifacts_data, dict):
+                    for artifact_type, paths in artifacts_data.items():
+                        path_list = paths if isinstance(paths, list) else [paths]
+                        for file_path_str in path_list:
                             try:
-                                step_outputs[output_name] = jmespath.search(
-                                    jmespath_query, raw_result
-                                )
+                                local_path = file_path_str.removeprefix("file://")
+                                # One stat() covers both the existence check and the size.
+                                try:
+                                    file_stat = os.stat(local_path)
+                                except FileNotFoundError:
+                                    continue
+                                if stat.S_ISREG(file_stat.st_mode):
+                                    content_hash = self.cache_manager.write_stream(
+                                        Path(local_path)
+                                    )
+                                    manifest.artifacts[os.path.basename(local_path)] = (
+                                        Artifact(
+                                            content_hash=content_hash,
+                                            mime_type="application/octet-stream",  # A generic default
+                                            size_bytes=file_stat.st_size,
+                                        )
+                                    )
                             except Exception as e:
                                 log.warning(
-                                    "engine.outputs.jmespath_failed",
-                                    query=jmespath_query,
+                                    "engine.artifact.processing_failed",
+                                    path=file_path_str,
                                     error=str(e),
                                 )
-                                step_outputs[output_name] = None
-
-                    manifest.steps.append(step_result_obj)
-                    final_results[step_id] = raw_result
-                    context.steps[step_id] = {
-                        "result": raw_result,
-                        "outputs": step_outputs,
-                        "output_hash": step_result_obj.output_hash,
-                    }
-
-                    if isinstance(raw_result, dict) and "artifacts" in raw_result:
-                        artifacts_data = raw_result.get("artifacts")
-                        if isinstance(artifacts_data, dict):
-                            for artifact_type, paths in artifacts_data.items():
-                                path_list = (
-                                    paths if isinstance(paths, list) else [paths]
-                                )
-                                for file_path_str in path_list:
-                                    try:
-                                        file_path = Path(
-                                            file_path_str.replace("file://", "")
-                                        )
-                                        if file_path.exists():
-                                            file_bytes = file_path.read_bytes()
-                                            content_hash = self.cache_manager.write(
-                                                file_bytes
-                                            )
-                                            manifest.artifacts[file_path.name] = (
-                                                Artifact(
-                                                    content_hash=content_hash,
-                                                    mime_type="application/octet-stream",  # A generic default
-                                                    size_bytes=file_path.stat().st_size,
-                                                )
-                                            )
-                                    except Exception as e:
-                                        log.warning(
-                                            "engine.artifact.processing_failed",
-                                            path=file_path_str,
-                                            error=str(e),
-                                        )
 
-            manifest.status = "completed"
-            log.info("engine.run.success")
-            return final_results
-        except Exception as e:
-            if (
-                status_callback
-                and "step_id" in locals()
-                and "step_start_time" in locals()
-            ):
-                duration_ms = int(
-                    (datetime.now(timezone.utc) - step_start_time).total_seconds()
-                    * 1000
+            return step_result_obj, raw_result, step_outputs
+        except asyncio.CancelledError:
+            # Report the step as ended, not running. "skipped" is a status the
+            # block status events already carry.
+            if status_callback:
+                await status_callback(
+                    step_id, "skipped", "Cancelled before the step finished."
                 )
+            raise
+        except Exception as e:
+            if status_callback:
+                duration_ms = (time.monotonic_ns() - step_start_ns) // 1_000_000
                 await status_callback(
-                    locals()["step_id"],
-                    "error",
-                    {"error": str(e), "duration_ms": duration_ms},
+                    step_id, "error", {"error": str(e), "duration_ms": duration_ms}
                 )
+            raise
 
-            manifest.status = "failed"
-            log.error("engine.run.failed", error=str(e), exc_info=True)
-            manifest.steps.append(
-                StepResult(
-                    step_id="error",
-                    status="failed",
-                    summary=str(e),
-                    cache_key="",
-                    cache_hit=False,
-                )
-            )
-            final_results["error"] = f"{type(e).__name__}: {e}"
-            return final_results
-        finally:
-            manifest_path = run_dir / "manifest.json"
-            manifest_path.write_text(manifest.model_dump_json(indent=2))
-            log.info("engine.run.manifest_written", path=str(manifest_path))
+    def _get_data_ref_output(self, output_hash: str, raw_result: Any) -> BlockOutput:
+        """
+        Builds the claim-check BlockOutput for a large result. Identical outputs
+        share a content hash, so recently built references are reused as-is.
+        """
+        block_output = self._recent_refs.get(output_hash)
+        if block_output is not None:
+            self._recent_refs.move_to_end(output_hash)
+            return block_output
+
+        renderer_hint, metadata = self._get_result_metadata(raw_result)
+        data_ref = DataRef(
+            artifact_id=output_hash,
+            renderer_hint=renderer_hint,
+            metadata=metadata,
+            access_url=f"http://localhost:8888/artifacts/{output_hash}",
+        )
+        block_output = BlockOutput(data_ref=data_ref)
+        self._recent_refs[output_hash] = block_output
+        if len(self._recent_refs) > RECENT_REFS_MAX:
+            self._recent_refs.popitem(last=False)
+        return block_output
 
     def _schematize_result(self, raw_result: Any) -> SduiPayload:
         """Inspects a raw result and wraps it in a default SDUI payload."""
-        if (
-            isinstance(raw_result, list)
-            and raw_result
-            and isinstance(raw_result[0], dict)
-        ):
+        if _is_record_list(raw_result):
             return SduiPayload(ui_component="table", props={"data": raw_result})
         if isinstance(raw_result, (dict, list)):
             return SduiPayload(ui_component="json", props={"data": raw_result})
         if isinstance(raw_result, str):
             return SduiPayload(ui_component="text", props={"content": raw_result})
-        # Default fallback for other types
+        # Default fallback for other types. Only scalars reach this point, so
+        # safe_serialize never walks a large container here.
         return SduiPayload(
             ui_component="json", props={"data": safe_serialize(raw_result)}
         )
 
     def _get_result_metadata(self, raw_result: Any) -> Tuple[str, Dict]:
-        """Inspects a raw result and extracts metadata for the DataRef."""
-        if (
-            isinstance(raw_result, list)
-            and raw_result
-            and isinstance(raw_result[0], dict)
-        ):
+        """
+        Inspects a raw result and extracts metadata for the DataRef.
+        Only the length and the first record are inspected, never the payload.
+        """
+        if _is_record_list(raw_result):
             renderer_hint = "table"
             metadata = {
                 "record_count": len(raw_result),
-                "columns": list(raw_result[0].keys()),
+                "columns": list(raw_result[0]),
             }
             return renderer_hint, metadata
 
@@ -909,22 +1048,121 @@ class ScriptEngine:
         return "json", {}
 
 
+def _is_record_list(raw_result: Any) -> bool:
+    """True for a non-empty list whose first element is a dict (a table)."""
+    return (
+        isinstance(raw_result, list)
+        and bool(raw_result)
+        and isinstance(raw_result[0], dict)
+    )
+
+
+class _DotPath:
+    """A plain `a.b.c` JMESPath query, resolved with direct dict lookups."""
+
+    __slots__ = ("parts",)
+
+    def __init__(self, expression: str):
+        self.parts = tuple(expression.split("."))
+
+    def search(self, data: Any) -> Any:
+        for part in self.parts:
+            if not isinstance(data, dict):
+                return None
+            data = data.get(part)
+        return data
+
+
+@lru_cache(maxsize=1024)
+def compile_jmespath(expression: str):
+    """
+    Parses a JMESPath expression once and reuses the compiled form. Plain
+    dotted field paths, the common case for step outputs, skip the JMESPath
+    interpreter entirely.
+    """
+    if _DOT_PATH_RE.fullmatch(expression):
+        return _DotPath(expression)
+    return jmespath.compile(expression)
+
+
 def recursive_render_factory(jinja_env):
     """Factory to create a simple, non-mutating recursive rendering function."""
+    # Identical template strings recur across steps and runs, so parse each once.
+    compile_template = lru_cache(maxsize=1024)(jinja_env.from_string)
 
-    def recursive_render(data: Any, context: Dict):
+    def recursive_render(data: Any, context: Mapping[str, Any]):
+        # Containers without any template inside are returned as-is rather than
+        # copied, so only the templated paths of a step allocate new objects.
+        if isinstance(data, str):
+            if "{{" not in data:
+                return data
+            try:
+                return compile_template(data).render(context)
+            except TemplateError as e:
+                raise ValueError(
+                    f"Jinja rendering failed for template '{data}': {e}"
+                ) from e
         if isinstance(data, dict):
-            return {k: recursive_render(v, context) for k, v in data.items()}
+            rendered = None
+            for k, v in data.items():
+                new_v = recursive_render(v, context)
+                if new_v is not v:
+                    if rendered is None:
+                        rendered = dict(data)
+                    rendered[k] = new_v
+            return data if rendered is None else rendered
         if isinstance(data, list):
-            return [recursive_render(i, context) for i in data]
-        if isinstance(data, str):
-            if "{{" in data:
-                try:
-                    return jinja_env.from_string(data).render(**context)
-                except TemplateError as e:
-                    raise ValueError(
-                        f"Jinja rendering failed for template '{data}': {e}"
-                    ) from e
+            rendered = None
+            for i, item in enumerate(data):
+                new_item = recursive_render(item, context)
+                if new_item is not item:
+                    if rendered is None:
+                        rendered = list(data)
+                    rendered[i] = new_item
+            return data if rendered is None else rendered
         return data
 
     return recursive_render
+
+
+def _implicit_step_references(step: ConnectorStep) -> set[str]:
+    """
+    Collects the ids of the steps whose results a step reads: the block ids
+    of its `inputs`, and `steps.<id>` references in its templates and `if`.
+    """
+    referenced = {
+        input_str.split(".", 1)[0]
+        for input_str in step.inputs or []
+        if isinstance(input_str, str)
+    }
+    raw_step_dict = step.model_dump(by_alias=True)
+    if_condition = raw_step_dict.pop("if", None)
+    strings = [if_condition] if isinstance(if_condition, str) else []
+    _collect_template_strings(raw_step_dict, strings)
+    for text in strings:
+        for match in _STEP_REFERENCE_RE.finditer(text):
+            referenced.add(match.group(1) or match.group(2))
+    return referenced
+
+
+def _collect_template_strings(data: Any, found: list[str]) -> None:
+    """Appends every Jinja template string in a nested dict/list to `found`."""
+    if isinstance(data, dict):
+        for value in data.values():
+            _collect_template_strings(value, found)
+    elif isinstance(data, list):
+        for item in data:
+            _collect_template_strings(item, found)
+    elif isinstance(data, str) and ("{{" in data or "{%" in data):
+        found.append(data)
+
+
+def count_templates(data: Any) -> int:
+    """Counts the Jinja template strings in a nested dict/list structure."""
+    if isinstance(data, dict):
+        return sum(count_templates(v) for v in data.values())
+    if isinstance(data, list):
+        return sum(count_templates(i) for i in data)
+    if isinstance(data, str):
+        return 1 if "{{" in data else 0
+    return 0
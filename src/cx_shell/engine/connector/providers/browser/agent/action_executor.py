@@ -1,10 +1,21 @@
 import asyncio
+import json
+import random
 import re
 import time
+from collections import deque
 from collections.abc import Awaitable, Callable
+from functools import partialmethod
 
 # Import ElementHandle and other necessary Playwright components
-from playwright.async_api import ElementHandle, Locator, Page, expect
+from playwright.async_api import (
+    CDPSession,
+    ElementHandle,
+    JSHandle,
+    Locator,
+    Page,
+    expect,
+)
 from playwright.async_api import Error as PlaywrightError
 from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 import structlog
@@ -20,6 +31,173 @@ from .models import CommandInfo  # Assuming CommandInfo is sufficient here
 
 logger = structlog.get_logger(__name__)
 
+# click_location keyword -> (width, height, offset) -> (x, y) within the element.
+_CLICK_POSITIONS: dict[str, Callable[[float, float, float], tuple[float, float]]] = {
+    "top_left": lambda w, h, o: (o, o),
+    "top_right": lambda w, h, o: (w - o, o),
+    "bottom_left": lambda w, h, o: (o, h - o),
+    "bottom_right": lambda w, h, o: (w - o, h - o),
+    "left_center": lambda w, h, o: (o, h / 2),
+    "right_center": lambda w, h, o: (w - o, h / 2),
+    "top_center": lambda w, h, o: (w / 2, o),
+    "bottom_center": lambda w, h, o: (w / 2, h - o),
+}
+
+
+# Known scrollable container selectors, preferred (in order) over the generic
+# overflow walk by the scrollableAncestor helper.
+_KNOWN_SCROLL_SELECTORS: tuple[str, ...] = (
+    ".flightFliterScroll",
+    ".filter-options-scroll",
+    ".scrollable-container",
+    ".scrollable",
+    '[style*="overflow: auto"]',
+    '[style*="overflow-y: auto"]',
+    '[style*="overflow: scroll"]',
+    '[style*="overflow-y: scroll"]',
+)
+
+# Framework-generated element ids that are not stable across page loads.
+_GENERATED_ID_RE = re.compile(r"^(ember\d+|gwt-|ext-|jQuery\d+)", re.IGNORECASE)
+
+# Upper bound on waiting in-page for a JS scroll to settle.
+_SCROLL_SETTLE_MAX_MS = 700
+
+# Common suggestion/autocomplete list containers, and how long to wait for
+# one to become visible after typing into an autocomplete input.
+_SUGGESTION_SELECTORS: tuple[str, ...] = (
+    '[role="listbox"]',
+    ".autocomplete-suggestions",
+    ".dropdown-menu",
+    'ul[id*="typeahead"]',
+    'div[class*="suggestion"]',
+    'div[class*="results"]',
+)
+_SUGGESTION_WAIT_MS = 2000
+
+# Element helpers installed once per page as window.__cxActions (see
+# ActionExecutor.install_helpers), so calls only ship a short reference.
+# Each source is also used as-is where the helpers are not installed.
+_JS_HELPERS: dict[str, str] = {
+    "tagAndType": "el => [el.tagName.toLowerCase(), el.tagName === 'INPUT' ? el.type : '']",
+    "size": "el => { const r = el.getBoundingClientRect(); return [r.width, r.height]; }",
+    "scrollableAncestor": """el => {
+        if (!el || !el.parentElement) return null;
+        // Check if element is actually scrollable (scrollHeight > clientHeight)
+        const isScrollable = node => {
+            const overflowY = window.getComputedStyle(node).overflowY;
+            return (overflowY === 'auto' || overflowY === 'scroll')
+                && node.scrollHeight > node.clientHeight + 2; // Add small buffer
+        };
+        // Prioritize known scrollable container selectors
+        for (const selector of %s) {
+            const ancestor = el.parentElement.closest(selector);
+            if (ancestor && isScrollable(ancestor)) return ancestor;
+        }
+        // Fall back to the nearest ancestor whose computed overflow scrolls
+        let current = el.parentElement;
+        while (current && current !== document.body && current !== document.documentElement) {
+            if (isScrollable(current)) return current;
+            current = current.parentElement;
+        }
+        return null; // No scrollable ancestor found
+    }"""
+    % json.dumps(_KNOWN_SCROLL_SELECTORS),
+    "scrollIntoView": """(el, container) => new Promise(resolve => {
+        if (container && container.isConnected && container.contains(el)) {
+            // Bring the container on screen, then centre the element inside it
+            container.scrollIntoView({ block: 'nearest', inline: 'nearest' });
+            const c = container.getBoundingClientRect(), r = el.getBoundingClientRect();
+            container.scrollTop += r.top - c.top - (container.clientHeight - r.height) / 2;
+            if (r.left < c.left || r.right > c.left + container.clientWidth) {
+                container.scrollLeft += r.left - c.left - (container.clientWidth - r.width) / 2;
+            }
+        } else {
+            el.scrollIntoView({ behavior: 'auto', block: 'center', inline: 'nearest' });
+        }
+        // Resolve once the element's viewport position holds for two frames
+        let last = null, stable = 0, done = false;
+        const finish = settled => { done = true; clearTimeout(timer); resolve(settled); };
+        const timer = setTimeout(() => finish(false), %d);
+        const tick = () => {
+            if (done) return;
+            const r = el.getBoundingClientRect();
+            const position = r.top + ',' + r.left;
+            if (position === last) {
+                if (++stable >= 2) return finish(true);
+            } else {
+                last = position;
+                stable = 0;
+            }
+            requestAnimationFrame(tick);
+        };
+        requestAnimationFrame(tick);
+    })"""
+    % _SCROLL_SETTLE_MAX_MS,
+    "inViewport": """el => {
+        const r = el.getBoundingClientRect();
+        if (r.width <= 0 || r.height <= 0) return false;
+        if (r.left < 0 || r.top < 0
+            || r.right > window.innerWidth || r.bottom > window.innerHeight) return false;
+        // The box ignores clipping by overflow containers, so also require the
+        // element (or a descendant) to be what is actually drawn at its centre
+        const root = el.getRootNode();
+        const hit = (root.elementFromPoint ? root : document)
+            .elementFromPoint(r.left + r.width / 2, r.top + r.height / 2);
+        return !!hit && (hit === el || el.contains(hit));
+    }""",
+    "awaitSuggestions": """el => new Promise(resolve => {
+        // Check common attributes indicating autocomplete behavior
+        const autocomplete = el.hasAttribute('aria-autocomplete') ||
+            el.getAttribute('role') === 'combobox' ||
+            (el.form && el.form.outerHTML.includes('autocomplete')) ||
+            el.hasAttribute('list');
+        if (!autocomplete) return resolve({ autocomplete, suggestions: false });
+        const selector = %s;
+        const isVisible = node => {
+            const r = node.getBoundingClientRect();
+            return r.width > 0 && r.height > 0
+                && window.getComputedStyle(node).visibility !== 'hidden';
+        };
+        const found = () => Array.from(document.querySelectorAll(selector)).some(isVisible);
+        if (found()) return resolve({ autocomplete, suggestions: true });
+        const done = suggestions => {
+            observer.disconnect();
+            clearTimeout(timer);
+            resolve({ autocomplete, suggestions });
+        };
+        const observer = new MutationObserver(() => { if (found()) done(true); });
+        observer.observe(document.body, {
+            childList: true, subtree: true, attributes: true,
+            attributeFilter: ['class', 'style', 'hidden'],
+        });
+        const timer = setTimeout(() => done(false), %d);
+    })"""
+    % (json.dumps(",".join(_SUGGESTION_SELECTORS)), _SUGGESTION_WAIT_MS),
+}
+# Thrown by a by-reference helper call when the element's document has no
+# window.__cxActions, so only that case falls back to shipping the source.
+_HELPERS_MISSING = "cx-action-helpers-missing"
+_HELPER_CALL_JS = (
+    "(el, arg) => {{ const helpers = window.__cxActions;"
+    " if (!helpers) throw new Error('%s');"
+    " return helpers.{name}(el, arg); }}" % _HELPERS_MISSING
+)
+_JS_HELPERS_INIT_SCRIPT = (
+    "window.__cxActions = window.__cxActions || {"
+    + ", ".join(f"{name}: {source}" for name, source in _JS_HELPERS.items())
+    + "}\n//# sourceURL=cx/action-helpers.js\n"
+)
+
+
+async def _dispose_quietly(handle: JSHandle | None) -> None:
+    """Disposes a handle, ignoring errors (e.g. its context already gone)."""
+    if handle:
+        try:
+            await handle.dispose()
+        except Exception:
+            pass
+
 
 class ActionExecutor:
     """
@@ -31,9 +209,44 @@ class ActionExecutor:
 
     DEFAULT_MAX_RETRIES = 2  # Total attempts = DEFAULT_MAX_RETRIES + 1
     ACTION_TIMEOUT_RATIO = 0.9
-    POST_ACTION_DELAY_MS = 100
+    POST_ACTION_DELAY_MS = 0  # Settle delay after a successful action
+    # Per-command-type overrides of POST_ACTION_DELAY_MS. Playwright's
+    # auto-waiting on the next action covers most commands; typed input can
+    # still be racing autocomplete handlers when the next step starts.
+    POST_ACTION_DELAY_MS_BY_TYPE: dict[str, int] = {"type": 100, "fill": 100}
+    # Re-check checkbox state after check/uncheck; Playwright already
+    # verifies it, so this is only worth enabling for pages that revert it.
+    VERIFY_STATE_CHANGE = False
+    RETRY_BASE_S = 0.3  # Delay before the first retry
+    RETRY_FACTOR = 2.0  # Delay multiplier per further retry
+    RETRY_JITTER_S = 0.2  # Random extra delay added to each retry
     JS_SCROLL_TIMEOUT_MS = 7000  # Timeout for JS scroll attempt + verification
     QUICK_ACTION_TIMEOUT_MS = 7000  # Timeout for the quick first try
+    # Once a command type has ADAPTIVE_TIMEOUT_MIN_SAMPLES successful runs,
+    # its first try uses twice the P95 of the last ADAPTIVE_TIMEOUT_WINDOW
+    # durations, between MIN_QUICK_ACTION_TIMEOUT_MS and QUICK_ACTION_TIMEOUT_MS.
+    ADAPTIVE_TIMEOUT_WINDOW = 50
+    ADAPTIVE_TIMEOUT_MIN_SAMPLES = 5
+    MIN_QUICK_ACTION_TIMEOUT_MS = 1000
+
+    # Playwright error messages that mean the element needs scrolling into view.
+    _VIEWPORT_ERROR_RE = re.compile(
+        r"outside\s+of\s+the\s+viewport|element\s+is\s+not\s+visible|scroll\s+into\s+view",
+        re.IGNORECASE,
+    )
+
+    # Command type -> name of the method that performs it (see _get_action_method).
+    _ACTION_METHOD_NAMES = {
+        "click": "_perform_click",
+        "click_text": "_perform_click",
+        "type": "_perform_type",
+        "fill": "_perform_fill",
+        "select": "_perform_select",
+        "check": "_perform_check",
+        "uncheck": "_perform_uncheck",
+        "copy_text": "_perform_copy_text",
+        "verify_checked": "_perform_verify_checked",
+    }
 
     def __init__(self, page: Page, default_timeout: int):  # Added logger parameter
         """Initialize the executor."""
@@ -41,6 +254,81 @@ class ActionExecutor:
             raise ValueError("Page object is required for ActionExecutor.")
         self.page = page
         self.default_timeout = default_timeout  # Overall default timeout basis
+        # Lazily created CDP session for scroll gestures; False once the
+        # browser is known not to support CDP (Firefox, WebKit).
+        self._cdp_session: CDPSession | None | bool = None
+        self._helpers_installed = False  # Set by install_helpers()
+        # Recent successful action durations in seconds, per command type
+        self._action_durations: dict[str, deque[float]] = {}
+        # Scrollable container found for a target selector; dropped whenever
+        # the main frame navigates, since its handles die with the document.
+        self._scrollable_container_cache: dict[str, ElementHandle] = {}
+        page.on("framenavigated", self._on_frame_navigated)
+
+    def _on_frame_navigated(self, frame) -> None:
+        """Forgets cached container handles when the main document changes."""
+        if frame == self.page.main_frame:
+            self._scrollable_container_cache.clear()
+
+    async def install_helpers(self) -> None:
+        """
+        Installs the window.__cxActions element helpers in every current frame
+        and, via add_init_script, in every document the page loads later.
+        """
+        if self._helpers_installed:
+            return
+        await self.page.add_init_script(_JS_HELPERS_INIT_SCRIPT)
+        for frame in self.page.frames:
+            try:
+                await frame.evaluate(_JS_HELPERS_INIT_SCRIPT)
+            except PlaywrightError as e:  # e.g. a frame detaching mid-install
+                logger.debug("Could not install helpers in frame.", error=str(e))
+        self._helpers_installed = True
+        logger.debug("Action executor JS helpers installed.")
+
+    async def _evaluate_helper(
+        self,
+        target: Locator | ElementHandle,
+        name: str,
+        handle: bool = False,
+        **kwargs,
+    ):
+        """
+        Runs a _JS_HELPERS function on the target element, by reference once
+        installed, passing any ``arg`` kwarg as its second parameter. Falls
+        back to shipping the helper source only when the element's document
+        has no helpers (e.g. a frame that predates installation); errors from
+        the helper itself are raised, not retried.
+        """
+        evaluate = target.evaluate_handle if handle else target.evaluate
+        if self._helpers_installed:
+            try:
+                return await evaluate(_HELPER_CALL_JS.format(name=name), **kwargs)
+            except PlaywrightError as e:
+                if _HELPERS_MISSING not in e.message:
+                    raise
+        return await evaluate(_JS_HELPERS[name], **kwargs)
+
+    def _record_action_duration(self, command_type: str, duration_s: float) -> None:
+        """Remembers how long a successful action took, for adaptive timeouts."""
+        durations = self._action_durations.get(command_type)
+        if durations is None:
+            durations = self._action_durations[command_type] = deque(
+                maxlen=self.ADAPTIVE_TIMEOUT_WINDOW
+            )
+        durations.append(duration_s)
+
+    def _quick_action_timeout_ms(self, command_type: str) -> int:
+        """First-attempt timeout: 2x the recent P95 duration, once known."""
+        durations = self._action_durations.get(command_type)
+        if not durations or len(durations) < self.ADAPTIVE_TIMEOUT_MIN_SAMPLES:
+            return self.QUICK_ACTION_TIMEOUT_MS
+        ordered = sorted(durations)
+        p95_s = ordered[int(0.95 * (len(ordered) - 1))]
+        return min(
+            self.QUICK_ACTION_TIMEOUT_MS,
+            max(self.MIN_QUICK_ACTION_TIMEOUT_MS, int(2 * p95_s * 1000)),
+        )
 
     async def execute_action(
         self,
@@ -61,29 +349,43 @@ class ActionExecutor:
         last_error: Exception | None = None
         js_scroll_tried = False
 
+        # Predicted once per command and reused by every retry below.
         target_selector_str = self._get_selector_string_from_command(command_info)
+        # Bind the command context once; every event below carries it.
+        log = logger.bind(
+            step=step_index,
+            command=command_name,
+            command_type=command_type,
+            selector=target_selector_str,
+        )
 
         for attempt in range(retries + 1):
-            start_time_attempt = time.time()
-            logger.info(
-                f"--- Action Attempt {attempt + 1}/{retries + 1} for Command '{command_name}' ({command_type}) ---"
+            attempt_started = time.monotonic()
+            log.info(
+                "Action attempt started.",
+                attempt=attempt + 1,
+                attempts=retries + 1,
             )
             viewport_error_occurred_this_attempt = False  # Flag for this attempt
 
             try:
                 # Determine Timeout for This Attempt
                 if attempt == 0:
-                    current_action_timeout = self.QUICK_ACTION_TIMEOUT_MS
-                    logger.debug(
-                        f"  Performing action '{command_type}' (QUICK timeout {current_action_timeout}ms)..."
+                    current_action_timeout = self._quick_action_timeout_ms(command_type)
+                    log.debug(
+                        "Performing action.",
+                        timeout_ms=current_action_timeout,
+                        mode="quick",
                     )
                 else:
                     # Ensure minimum timeout for retries
                     current_action_timeout = max(
                         5000, int(self.default_timeout * self.ACTION_TIMEOUT_RATIO)
                     )
-                    logger.debug(
-                        f"  Performing action '{command_type}' (Retry timeout {current_action_timeout}ms)..."
+                    log.debug(
+                        "Performing action.",
+                        timeout_ms=current_action_timeout,
+                        mode="retry",
                     )
 
                 action_method = self._get_action_method(command_type)
@@ -93,40 +395,48 @@ class ActionExecutor:
                 )
 
                 if success:
-                    logger.info(
-                        f"  ✓ Action '{command_type}' successful on attempt {attempt + 1}."
+                    self._record_action_duration(
+                        command_type, time.monotonic() - attempt_started
                     )
-                    await asyncio.sleep(self.POST_ACTION_DELAY_MS / 1000)
+                    log.info(
+                        "Action succeeded.",
+                        attempt=attempt + 1,
+                    )
+                    post_action_delay_ms = self.POST_ACTION_DELAY_MS_BY_TYPE.get(
+                        command_type, self.POST_ACTION_DELAY_MS
+                    )
+                    if post_action_delay_ms:
+                        await asyncio.sleep(post_action_delay_ms / 1000)
                     return True
                 else:
                     # This case might occur if a method implementation returns False explicitly
                     last_error = ActionFailedError(
                         f"Action method for '{command_type}' returned False."
                     )
-                    logger.warning(
-                        f"    ! Action method returned False on attempt {attempt + 1}."
+                    log.warning(
+                        "Action method returned False.",
+                        attempt=attempt + 1,
                     )
 
             except (PlaywrightTimeoutError, PlaywrightError) as e:
                 last_error = e
-                error_msg = (
-                    str(e).lower().replace("\n", " ")
-                )  # Clean error message for logging
-                logger.warning(
-                    f"    ! Attempt {attempt + 1} failed: {type(e).__name__}: {error_msg}"
-                )
-                is_viewport_error = (
-                    "outside of the viewport" in error_msg
-                    or "element is not visible" in error_msg
-                    or "scroll into view" in error_msg
+                # Playwright errors carry their message already; str(e) would
+                # build another copy of what can be a long call log.
+                error_msg = getattr(e, "message", None) or str(e)
+                log.warning(
+                    "Action attempt failed.",
+                    attempt=attempt + 1,
+                    error_type=type(e).__name__,
+                    error=error_msg,
                 )
+                is_viewport_error = bool(self._VIEWPORT_ERROR_RE.search(error_msg))
 
                 if is_viewport_error:
                     viewport_error_occurred_this_attempt = True
                     if not js_scroll_tried:  # Try JS scroll only once
                         js_scroll_tried = True
-                        logger.info(
-                            "    ! Viewport/Visibility error detected. Attempting JS scroll fallback..."
+                        log.info(
+                            "Viewport/visibility error detected, attempting JS scroll fallback."
                         )
                         js_scroll_timeout = self.JS_SCROLL_TIMEOUT_MS
                         try:
@@ -134,34 +444,39 @@ class ActionExecutor:
                                 locator, js_scroll_timeout, target_selector_str
                             )
                             if scrolled_ok:
-                                logger.info("      ✓ JS scroll fallback succeeded.")
+                                log.info("JS scroll fallback succeeded.")
                             else:
-                                logger.warning(
-                                    "      ! JS scroll fallback failed or element still not visible."
+                                log.warning(
+                                    "JS scroll fallback failed or element still not visible."
                                 )
                         except Exception as js_err:
-                            logger.warning(
-                                f"      ! Error during JS scroll fallback execution: {js_err}",
-                                exc_info=True,
+                            log.warning(
+                                "Error during JS scroll fallback execution.",
+                                error=str(js_err),
                             )
                     elif attempt < retries:  # If JS already tried, just log it
-                        logger.warning(
-                            f"    ! Viewport error occurred again on attempt {attempt + 1} (JS scroll already tried)."
+                        log.warning(
+                            "Viewport error occurred again; JS scroll already tried.",
+                            attempt=attempt + 1,
                         )
                     else:  # Error on final attempt
-                        logger.error(
-                            "    ! Viewport/Visibility error on final attempt."
-                        )
+                        log.error("Viewport/visibility error on final attempt.")
 
             except (ElementNotInteractableError, ActionFailedError) as e:
                 last_error = e
-                logger.warning(
-                    f"    ! Attempt {attempt + 1} failed: {type(e).__name__}: {str(e)}"
+                log.warning(
+                    "Action attempt failed.",
+                    attempt=attempt + 1,
+                    error_type=type(e).__name__,
+                    error=str(e),
                 )
             except Exception as e:
                 last_error = e
-                logger.error(
-                    f"    ! Unexpected error on attempt {attempt + 1}: {type(e).__name__}: {str(e)}",
+                log.error(
+                    "Unexpected error during action attempt.",
+                    attempt=attempt + 1,
+                    error_type=type(e).__name__,
+                    error=str(e),
                     exc_info=True,
                 )
                 # Re-raise unexpected errors immediately if preferred, or let loop continue
@@ -171,19 +486,23 @@ class ActionExecutor:
             if attempt < retries:
                 # Perform dummy scroll if a viewport error happened THIS attempt
                 if viewport_error_occurred_this_attempt:
-                    logger.info(
-                        f"    ! Performing dummy page scroll (800px) before retry {attempt + 2}..."
+                    log.info(
+                        "Performing dummy page scroll before retry.",
+                        delta_px=800,
+                        next_attempt=attempt + 2,
                     )
                     try:
-                        await self.page.mouse.wheel(0, 800)  # Use 800px scroll delta
+                        await self._dummy_scroll(800)  # Use 800px scroll delta
                         await asyncio.sleep(0.3)  # Short pause after dummy scroll
                     except Exception as wheel_err:
-                        logger.warning(
-                            f"      ! Warning: Dummy scroll failed: {wheel_err}"
-                        )
-
-                wait_time = 0.5 + attempt * 0.6  # Exponential backoff delay
-                logger.info(f"    Retrying after {wait_time:.1f} seconds...")
+                        log.warning("Dummy scroll failed.", error=str(wheel_err))
+
+                # Exponential backoff with jitter so actions failing the same
+                # way don't retry in lockstep.
+                wait_time = self.RETRY_BASE_S * (
+                    self.RETRY_FACTOR**attempt
+                ) + random.uniform(0, self.RETRY_JITTER_S)
+                log.info("Retrying action.", wait_s=round(wait_time, 1))
                 await asyncio.sleep(wait_time)
 
         # Final failure message after all retries
@@ -192,28 +511,50 @@ class ActionExecutor:
             final_error_message += (
                 f" Last error: {type(last_error).__name__}: {str(last_error)}"
             )
-        logger.error(f"--- Action Execution FAILED: {final_error_message} ---")
+        log.error("Action execution failed.", error=final_error_message)
         raise ActionFailedError(final_error_message) from last_error
 
+    async def _dummy_scroll(self, delta_y: int) -> None:
+        """
+        Scrolls the page down by delta_y pixels. On Chromium this synthesizes a
+        real scroll gesture at the viewport center, which also scrolls nested
+        and virtualized containers that ignore a bare mouse wheel event.
+        """
+        viewport = self.page.viewport_size
+        if self._cdp_session is None and viewport:
+            try:
+                self._cdp_session = await self.page.context.new_cdp_session(self.page)
+            except PlaywrightError as cdp_err:
+                logger.debug(
+                    "CDP session unavailable for scrolling.", error=str(cdp_err)
+                )
+                self._cdp_session = False
+        if self._cdp_session and viewport:
+            try:
+                await self._cdp_session.send(
+                    "Input.synthesizeScrollGesture",
+                    {
+                        "x": viewport["width"] // 2,
+                        "y": viewport["height"] // 2,
+                        "yDistance": -delta_y,  # Negative scrolls down
+                        "speed": 3000,
+                    },
+                )
+                return
+            except PlaywrightError as cdp_err:
+                logger.debug(
+                    "CDP scroll gesture failed, using mouse wheel.", error=str(cdp_err)
+                )
+        await self.page.mouse.wheel(0, delta_y)
+
     def _get_action_method(self, command_type: str) -> Callable[..., Awaitable[bool]]:
         """Maps command type string to the internal method."""
-        method_map = {
-            "click": self._perform_click,
-            "click_text": self._perform_click,
-            "type": self._perform_type,
-            "fill": self._perform_fill,
-            "select": self._perform_select,
-            "check": self._perform_check,
-            "uncheck": self._perform_uncheck,
-            "copy_text": self._perform_copy_text,
-            "verify_checked": self._perform_verify_checked,
-        }
-        method = method_map.get(command_type)
-        if not method:
+        method_name = self._ACTION_METHOD_NAMES.get(command_type)
+        if not method_name:
             raise NotImplementedError(
                 f"Action method for command type '{command_type}' is not implemented."
             )
-        return method
+        return getattr(self, method_name)
 
     async def _perform_verify_checked(
         self, locator: Locator, command_info: CommandInfo, timeout: int, **kwargs
@@ -227,29 +568,30 @@ class ActionExecutor:
         verification_timeout = max(1000, int(timeout * 0.3))
 
         logger.debug(
-            f"  Verifying checkbox state is '{expected_state_str}' (timeout {verification_timeout}ms)."
+            "Verifying checkbox state.",
+            expected=expected_state_str,
+            timeout_ms=verification_timeout,
         )
 
         try:
             await expect(locator).to_be_checked(
                 timeout=verification_timeout, checked=should_be_checked
             )
-            logger.debug(
-                f"    ✓ Verification successful: Element is {'checked' if should_be_checked else 'unchecked'}."
-            )
+            logger.debug("Checkbox state verified.", expected=expected_state_str)
             return True
         except PlaywrightTimeoutError as e:
-            logger.error(
-                f"    ! Verification FAILED: Element was NOT {'checked' if should_be_checked else 'unchecked'}."
+            logger.warning(
+                "Checkbox state verification failed.", expected=expected_state_str
             )
             # Raise specific error for verification failures
             raise VerificationFailedError(
                 f"Expected element to be {'checked' if should_be_checked else 'unchecked'}, but it was not."
             ) from e
         except Exception as e:
-            logger.error(
-                f"    ! Error during verification: {type(e).__name__}: {e}",
-                exc_info=True,
+            logger.warning(
+                "Error during checkbox verification.",
+                error_type=type(e).__name__,
+                error=str(e),
             )
             raise ActionFailedError(f"Error during checkbox verification: {e}") from e
 
@@ -267,23 +609,19 @@ class ActionExecutor:
         tag = ""
         el_type = ""
         try:
-            # Check if it's a checkbox/radio first (optional, but keep logic)
-            tag = await locator.evaluate("el => el.tagName.toLowerCase()", timeout=500)
-            if tag == "input":
-                el_type = await locator.evaluate("el => el.type", timeout=500)
+            # Check if it's a checkbox/radio first (optional, but keep logic).
+            # Tag and input type come back together in one round-trip.
+            tag, el_type = await self._evaluate_helper(
+                locator, "tagAndType", timeout=500
+            )
         except Exception as tag_err:
             logger.debug(
-                f"    Note: Could not determine tag/type before click: {tag_err}"
+                "Could not determine tag/type before click.", error=str(tag_err)
             )
 
         if tag == "input" and el_type in ["checkbox", "radio"]:
-            logger.debug(
-                "    Note: Using locator.click() on a checkbox/radio based on command type."
-            )
-            # --- MODIFICATION START ---
+            logger.debug("Using locator.click() on a checkbox/radio.")
             await locator.click(timeout=timeout, force=force, no_wait_after=True)
-            await asyncio.sleep(0.2)  # Short pause after click
-            # --- MODIFICATION END ---
         else:
             # Handle standard click with optional position
             click_location = str(command_info.get("click_location", "center")).lower()
@@ -292,49 +630,44 @@ class ActionExecutor:
 
             if click_location != "center":
                 logger.debug(
-                    f"    Calculating position for click location: '{click_location}'"
+                    "Calculating click position.", click_location=click_location
                 )
                 try:
-                    bounding_box = await locator.bounding_box(timeout=1000)
-                    if bounding_box:
-                        width, height = bounding_box["width"], bounding_box["height"]
-                        pos_map: dict[str, dict[str, float]] = {
-                            "top_left": {"x": offset, "y": offset},
-                            "top_right": {"x": width - offset, "y": offset},
-                            "bottom_left": {"x": offset, "y": height - offset},
-                            "bottom_right": {"x": width - offset, "y": height - offset},
-                            "left_center": {"x": offset, "y": height / 2},
-                            "right_center": {"x": width - offset, "y": height / 2},
-                            "top_center": {"x": width / 2, "y": offset},
-                            "bottom_center": {"x": width / 2, "y": height - offset},
-                        }
-                        position = pos_map.get(click_location)
-                        if position is None:
+                    width, height = await self._evaluate_helper(
+                        locator, "size", timeout=1000
+                    )
+                    if width or height:
+                        position_fn = _CLICK_POSITIONS.get(click_location)
+                        if position_fn is None:
                             logger.warning(
-                                f"    Warning: Unsupported click_location keyword '{click_location}', defaulting to center."
+                                "Unsupported click_location, defaulting to center.",
+                                click_location=click_location,
                             )
                             click_location = "center"
+                        else:
+                            x, y = position_fn(width, height, offset)
+                            position = {"x": x, "y": y}
                     else:
                         logger.warning(
-                            "    Warning: Could not get bounding box. Defaulting to center."
+                            "Could not get bounding box, defaulting to center."
                         )
                         click_location = "center"
                 except Exception as bbox_err:
                     logger.warning(
-                        f"    Warning: Error getting bounding box ({bbox_err}). Defaulting to center.",
-                        # exc_info=True, # Reduce noise maybe
+                        "Error getting bounding box, defaulting to center.",
+                        error=str(bbox_err),
                     )
                     click_location = "center"
 
             logger.debug(
-                f"    Using locator.click(position={position}, force={force}, no_wait_after=True). Location='{click_location}'"
+                "Using locator.click().",
+                position=position,
+                force=force,
+                click_location=click_location,
             )
-            # --- MODIFICATION START ---
             await locator.click(
                 timeout=timeout, position=position, force=force, no_wait_after=True
             )
-            await asyncio.sleep(0.2)  # Short pause after click
-            # --- MODIFICATION END ---
 
         return True  # Return True if click action itself doesn't raise error (timeout handled by execute_action)
 
@@ -347,8 +680,17 @@ class ActionExecutor:
             f"    Typing text: '{text_to_type[:30]}{'...' if len(text_to_type) > 30 else ''}'"
         )
         try:
-            # Clear field first, allocate less time for clear
-            await locator.fill("", timeout=max(1000, int(timeout * 0.3)))
+            # Clear field first, allocate less time for clear. Reading the value
+            # is one cheap round-trip, so the clearing fill() (with its own
+            # actionability waits) is skipped for fields that are already empty.
+            try:
+                current_value = await locator.input_value(
+                    timeout=max(500, int(timeout * 0.1))
+                )
+            except Exception:
+                current_value = None  # e.g. contenteditable; clear it anyway
+            if current_value != "":
+                await locator.fill("", timeout=max(1000, int(timeout * 0.3)))
         except Exception as fill_err:
             # Log warning but continue with type attempt
             logger.warning(
@@ -397,22 +739,46 @@ class ActionExecutor:
                 "Select command requires at least one preferred option text/value in the 'text' field."
             )
 
-        logger.debug(f"   Attempting select action. Preferences: {preferences}")
+        logger.debug("Attempting select action.", preferences=preferences)
+
+        # Optional fast path for value-driven presets: select the first
+        # preference as an option value directly, skipping enumeration. It is
+        # opt-in because select_option() waits out its timeout when no option
+        # has that value, and because text matches normally win over values.
+        if command_info.get("select_fast_path"):
+            try:
+                selected = await locator.select_option(
+                    value=preferences[0], timeout=max(1000, int(timeout * 0.2))
+                )
+                if selected:
+                    logger.info("Selected option via fast path.", value=preferences[0])
+                    return True
+            except PlaywrightError as e:
+                logger.debug(
+                    "Select fast path missed, enumerating options.", error=str(e)
+                )
 
         # 2. Get Available Options from the <select> element
-        option_elements = locator.locator("option")
+        # All options are read in a single evaluate() round-trip rather than
+        # three calls per <option>; the option locator is only built lazily
+        # for the heuristic click fallback below.
         options_data = []
         try:
-            option_count = await option_elements.count()
-            logger.debug(f"      Found {option_count} <option> elements.")
+            raw_options = await locator.evaluate(
+                """sel => Array.from(sel.querySelectorAll('option'), o => ({
+                    text: (o.textContent || '').trim(),
+                    value: o.getAttribute('value') || '',
+                    disabled: o.disabled || !!o.closest('optgroup[disabled]'),
+                }))""",
+                timeout=max(1000, int(timeout * 0.3)),
+            )
+            logger.debug("Found <option> elements.", count=len(raw_options))
             valid_option_found = False  # Flag to track if we find any selectable option
 
-            for i in range(option_count):
-                option_locator = option_elements.nth(i)
-                is_disabled = await option_locator.is_disabled(timeout=500)
-                text = await option_locator.text_content(timeout=500) or ""
-                value = await option_locator.get_attribute("value", timeout=500) or ""
-                text = text.strip()  # Clean whitespace
+            for i, raw_option in enumerate(raw_options):
+                text = raw_option["text"]
+                value = raw_option["value"]
+                is_disabled = raw_option["disabled"]
 
                 # Basic check to ignore placeholder/disabled options
                 is_placeholder = (
@@ -427,7 +793,7 @@ class ActionExecutor:
 
                 options_data.append(
                     {
-                        "locator": option_locator,
+                        "index": i,
                         "text": text,
                         "value": value,
                         "is_disabled": is_disabled,
@@ -436,7 +802,11 @@ class ActionExecutor:
                     }
                 )
                 logger.debug(
-                    f"      Option {i}: Text='{text}', Value='{value}', Valid={is_valid_option}"
+                    "Select option.",
+                    index=i,
+                    text=text,
+                    value=value,
+                    valid=bool(is_valid_option),
                 )
 
             if not valid_option_found:
@@ -445,9 +815,7 @@ class ActionExecutor:
                 )
 
         except Exception as e:
-            logger.error(
-                f"      Error retrieving options from <select>: {e}", exc_info=True
-            )
+            logger.warning("Error retrieving options from <select>.", error=str(e))
             raise ActionFailedError(
                 f"Failed to get options from select element: {e}"
             ) from e
@@ -457,41 +825,38 @@ class ActionExecutor:
         target_option_data = None  # Store the option we decide to select
 
         if len(valid_options) == 1:
-            logger.info("   Only one valid option found. Selecting it by default.")
+            logger.info("Only one valid option found; selecting it by default.")
             target_option_data = valid_options[0]
         else:
             # 4. Multiple Options: Match Preferences (in order)
-            logger.debug(
-                "   Multiple valid options found. Matching against preferences..."
-            )
-            for pref in preferences:
-                logger.debug(f"      Checking preference: '{pref}'")
-                # Try matching by text first (case-insensitive, whitespace normalized)
-                normalized_pref = " ".join(pref.split()).lower()
-                for option in valid_options:
-                    normalized_text = " ".join(option["text"].split()).lower()
-                    if normalized_pref == normalized_text:
-                        logger.debug(
-                            f"         Found match by text: '{option['text']}'"
-                        )
-                        target_option_data = option
-                        break  # Found match for this preference
+            logger.debug("Multiple valid options found; matching preferences.")
+            # Index options once by normalized text (case-insensitive,
+            # whitespace normalized) and by exact value; values are often
+            # case-sensitive. setdefault keeps the first option on duplicates.
+            options_by_text: dict[str, dict] = {}
+            options_by_value: dict[str, dict] = {}
+            for option in valid_options:
+                options_by_text.setdefault(
+                    " ".join(option["text"].split()).lower(), option
+                )
+                options_by_value.setdefault(option["value"], option)
 
+            for pref in preferences:
+                logger.debug("Checking preference.", preference=pref)
+                # Try matching by text first, then by value
+                target_option_data = options_by_text.get(" ".join(pref.split()).lower())
                 if target_option_data:
+                    logger.debug(
+                        "Found match by text.", text=target_option_data["text"]
+                    )
                     break  # Stop checking preferences if match found
-
-                # If no text match for this pref, try matching by value
-                if not target_option_data:
-                    for option in valid_options:
-                        # Compare pref directly against value (values are often case-sensitive)
-                        if pref == option["value"]:
-                            logger.debug(
-                                f"         Found match by value: '{option['value']}' (Text: '{option['text']}')"
-                            )
-                            target_option_data = option
-                            break  # Found match for this preference
-
+                target_option_data = options_by_value.get(pref)
                 if target_option_data:
+                    logger.debug(
+                        "Found match by value.",
+                        value=target_option_data["value"],
+                        text=target_option_data["text"],
+                    )
                     break  # Stop checking preferences if match found
 
         # 5. Perform Selection or Raise Error
@@ -506,11 +871,11 @@ class ActionExecutor:
                 if target_option_data["value"]
                 else f"label='{target_option_data['text']}'"
             )
-            logger.info(f"   Selected option to target: {log_selection}")
+            logger.info("Selected option to target.", selection=log_selection)
             try:
                 await locator.select_option(option_to_select, timeout=timeout)
                 logger.info(
-                    f"      ✓ Successfully selected option via select_option({log_selection})."
+                    "Selected option via select_option().", selection=log_selection
                 )
                 # Optional: Add verification after selection if needed
                 # selected_value = await locator.input_value()
@@ -518,14 +883,17 @@ class ActionExecutor:
                 return True
             except Exception as e:
                 logger.warning(
-                    f"      select_option({log_selection}) failed: {e}. Falling back to heuristic click..."
+                    "select_option() failed, falling back to heuristic click.",
+                    selection=log_selection,
+                    error=str(e),
                 )
                 # Fallback heuristic (less reliable) - Click the specific option locator
                 try:
-                    await target_option_data["locator"].click(
-                        timeout=max(1000, int(timeout * 0.5))
+                    option_locator = locator.locator("option").nth(
+                        target_option_data["index"]
                     )
-                    logger.info("      ✓ Heuristic option click succeeded.")
+                    await option_locator.click(timeout=max(1000, int(timeout * 0.5)))
+                    logger.info("Heuristic option click succeeded.")
                     # Verification after click is harder, maybe check parent select's value
                     await asyncio.sleep(0.2)  # Pause after click
                     # selected_value = await locator.input_value() # Check if value updated
@@ -534,9 +902,8 @@ class ActionExecutor:
                     #      return False # Consider click failed if value didn't update
                     return True
                 except Exception as click_err:
-                    logger.error(
-                        f"      Heuristic option click also failed: {click_err}",
-                        exc_info=True,
+                    logger.warning(
+                        "Heuristic option click also failed.", error=str(click_err)
                     )
                     raise ActionFailedError(
                         f"Both select_option and heuristic click failed for {log_selection}"
@@ -544,57 +911,44 @@ class ActionExecutor:
         else:
             # 6. No Match Found
             logger.error(
-                f"   No available option matched the provided preferences: {preferences}"
+                "No available option matched the preferences.", preferences=preferences
             )
             raise ActionFailedError(
                 f"Could not find any of the preferred options {preferences} in the select dropdown."
             )
 
-    async def _perform_check(
-        self, locator: Locator, command_info: CommandInfo, timeout: int, **kwargs
+    async def _perform_toggle(
+        self,
+        locator: Locator,
+        command_info: CommandInfo,
+        timeout: int,
+        want_checked: bool = True,
+        **kwargs,
     ) -> bool:
-        """Performs a check action and verifies the result."""
-        logger.debug("    Performing check action.")
-        await locator.check(timeout=timeout)
-        # --- Verification ---
+        """Performs a check or uncheck action and optionally verifies the result."""
+        logger.debug("Performing checkbox toggle.", want_checked=want_checked)
+        toggle = locator.check if want_checked else locator.uncheck
+        await toggle(timeout=timeout)
+        # check()/uncheck() already fail unless the element ends up in the
+        # requested state; the extra verification is only for pages that
+        # flip the state back afterwards.
+        if not self.VERIFY_STATE_CHANGE:
+            return True
+        state = "checked" if want_checked else "unchecked"
         try:
             await expect(locator).to_be_checked(
-                timeout=1000
+                timeout=1000, checked=want_checked
             )  # Short timeout for verification
-            logger.debug("      ✓ Checkbox state verified as checked.")
-            await asyncio.sleep(0.1)
+            logger.debug("Checkbox state verified.", state=state)
         except PlaywrightTimeoutError:
-            logger.error(
-                "    ! Checkbox state verification failed (not checked after action)."
-            )
+            logger.warning("Checkbox state verification failed.", expected=state)
             raise ActionFailedError(
-                "Checkbox failed verification: Was not checked after action."
+                f"Checkbox failed verification: Was not {state} after action."
             )
-        # --- END Verification ---
         return True
 
-    async def _perform_uncheck(
-        self, locator: Locator, command_info: CommandInfo, timeout: int, **kwargs
-    ) -> bool:
-        """Performs an uncheck action and verifies the result."""
-        logger.debug("    Performing uncheck action.")
-        await locator.uncheck(timeout=timeout)
-        # --- Verification ---
-        try:
-            await expect(locator).to_be_checked(
-                timeout=1000, checked=False
-            )  # Verify it's unchecked
-            logger.debug("      ✓ Checkbox state verified as unchecked.")
-            await asyncio.sleep(0.1)
-        except PlaywrightTimeoutError:
-            logger.error(
-                "    ! Checkbox state verification failed (still checked after action)."
-            )
-            raise ActionFailedError(
-                "Checkbox failed verification: Was still checked after action."
-            )
-        # --- END Verification ---
-        return True
+    _perform_check = partialmethod(_perform_toggle, want_checked=True)
+    _perform_uncheck = partialmethod(_perform_toggle, want_checked=False)
 
     async def _perform_copy_text(
         self, locator: Locator, command_info: CommandInfo, timeout: int, **kwargs
@@ -607,187 +961,133 @@ class ActionExecutor:
             # Store full text in 'data', update 'message' as per original code
             command_info["data"] = text
             command_info["message"] = text  # Store raw copied text as message
-            logger.info(
-                f"    Copied text: '{str(text)[:50]}{'...' if text and len(text) > 50 else ''}'"
-            )
+            logger.info("Copied text.", text=str(text)[:50], length=len(text or ""))
             return True
         except Exception as e:
-            logger.error(f"    Failed to get text content: {e}", exc_info=True)
+            logger.warning("Failed to get text content.", error=str(e))
             command_info["message"] = f"Failed to copy text: {e}"
             return False  # Indicate failure
 
     async def _find_scrollable_ancestor(self, locator: Locator) -> ElementHandle | None:
-        """Finds the nearest scrollable ancestor element using JS evaluation."""
+        """
+        Finds the nearest scrollable ancestor element in one JS evaluation:
+        known container selectors first, then the generic overflow walk, which
+        also catches containers styled from stylesheets.
+        """
         logger.debug("    Searching for scrollable ancestor...")
-        handle: ElementHandle | None = None
+        handle: JSHandle | None = None
         try:
-            # Prioritize known scrollable container selectors
-            known_scroll_selectors = [
-                ".flightFliterScroll",
-                ".filter-options-scroll",
-                ".scrollable-container",
-                ".scrollable",
-                '[style*="overflow: auto"]',
-                '[style*="overflow-y: auto"]',
-                '[style*="overflow: scroll"]',
-                '[style*="overflow-y: scroll"]',
-            ]
-            for selector in known_scroll_selectors:
-                try:
-                    # Use Playwright's :xpath pseudo-class for ancestor search
-                    xpath_selector = f"xpath=./ancestor::{selector.replace('.', '*[contains(@class, "') + '")]' if '.' in selector else selector}"
-                    logger.debug(
-                        f"      Checking known scroll selector via xpath: {selector}"
-                    )
-                    ancestor = locator.locator(xpath_selector)
-
-                    # Check count efficiently before getting handle
-                    count = await ancestor.count()
-                    if count > 0:
-                        container_handle = await ancestor.first.element_handle(
-                            timeout=500
-                        )
-                        if container_handle:
-                            is_scrollable = await container_handle.evaluate(
-                                "el => { const style = window.getComputedStyle(el); const overflowY = style.overflowY; return (overflowY === 'auto' || overflowY === 'scroll') && el.scrollHeight > el.clientHeight + 2; }"
-                            )  # Add small buffer
-                            if is_scrollable:
-                                logger.debug(
-                                    f"      Found ancestor matching known selector '{selector}' and verified scrollable."
-                                )
-                                return container_handle  # Found it
-                            else:
-                                logger.debug(
-                                    f"      Ancestor matching '{selector}' found but not scrollable."
-                                )
-                                await (
-                                    container_handle.dispose()
-                                )  # Dispose unused handle
-                        else:
-                            logger.debug(
-                                f"      Could not get handle for ancestor matching '{selector}'."
-                            )
-
-                except PlaywrightTimeoutError:
-                    logger.debug(
-                        f"      Timeout checking known scroll selector '{selector}'."
-                    )  # Expected if selector not present
-                except Exception as e:
-                    logger.warning(
-                        f"      Error checking known scroll selector '{selector}': {e}",
-                        exc_info=False,
-                    )  # Log other errors as warning
-
-            # Fallback to generic JS traversal if no known selectors worked
-            logger.debug(
-                "    Known scroll selectors not found/matched, trying generic JS traversal..."
-            )
-            handle = await locator.evaluate_handle(
-                """el => {
-                if (!el) return null;
-                let current = el.parentElement;
-                while (current && current !== document.body && current !== document.documentElement) {
-                    const style = window.getComputedStyle(current);
-                    const overflowY = style.overflowY;
-                    const isScrollable = overflowY === 'auto' || overflowY === 'scroll';
-                    // Check if element is actually scrollable (scrollHeight > clientHeight)
-                    if (isScrollable && current.scrollHeight > current.clientHeight + 2) { // Add small buffer
-                        return current;
-                    }
-                    current = current.parentElement;
-                }
-                return null; // No scrollable ancestor found
-            }""",
-                timeout=1500,
+            handle = await self._evaluate_helper(
+                locator, "scrollableAncestor", handle=True, timeout=1500
             )  # Increased timeout slightly
 
-            # Check if the handle is valid (not null)
-            if handle and await handle.evaluate("h => h !== null"):
-                logger.debug(
-                    "    Found potential scrollable ancestor JSHandle via traversal."
-                )
-                return handle
-            else:
-                logger.debug("    No scrollable ancestor found via JS traversal.")
-                if handle:
-                    await handle.dispose()  # Dispose if null handle was returned
-                return None
+            # A null result comes back as a non-element JSHandle
+            container_handle = handle.as_element()
+            if container_handle:
+                logger.debug("    Found scrollable ancestor.")
+                return container_handle
+            logger.debug("    No scrollable ancestor found.")
+            await _dispose_quietly(handle)  # Dispose the null handle
+            return None
         except Exception as e:
             logger.warning(
-                f"    Error finding scrollable ancestor: {type(e).__name__} - {e}",
-                exc_info=False,
+                "Error finding scrollable ancestor.",
+                error_type=type(e).__name__,
+                error=str(e),
             )
-            if handle:
-                try:
-                    await handle.dispose()
-                except Exception:
-                    pass  # Ignore dispose error
+            await _dispose_quietly(handle)
             return None
 
+    async def _cached_scrollable_ancestor(
+        self, locator: Locator, target_selector_str: str | None
+    ) -> tuple[ElementHandle | None, bool]:
+        """
+        Returns (container, cached). Reuses the container last found for the
+        same target selector while it is still attached, scrollable and holds
+        the element the locator now resolves to; otherwise searches again and
+        caches the result.
+        """
+        if not target_selector_str:
+            return await self._find_scrollable_ancestor(locator), False
+        cached = self._scrollable_container_cache.pop(target_selector_str, None)
+        if cached:
+            try:
+                if await locator.evaluate(
+                    "(el, c) => c.isConnected && c.contains(el)"
+                    " && c.scrollHeight > c.clientHeight + 2",
+                    cached,
+                    timeout=1500,
+                ):
+                    logger.debug("    Reusing cached scrollable ancestor.")
+                    self._scrollable_container_cache[target_selector_str] = cached
+                    return cached, True
+            except PlaywrightError:
+                pass
+            await _dispose_quietly(cached)
+        container_handle = await self._find_scrollable_ancestor(locator)
+        if container_handle:
+            self._scrollable_container_cache[target_selector_str] = container_handle
+            return container_handle, True
+        return None, False
+
     async def _scroll_element_in_container_js(
         self, target_locator: Locator, container_handle: ElementHandle
     ) -> bool:
-        """Uses JS target.scrollIntoView() relative to its parent, executed via page.evaluate."""
-        logger.debug(
-            "      Attempting JS scroll via page.evaluate using scrollIntoView..."
-        )
-        target_handle: ElementHandle | None = None
+        """
+        Scrolls the container so the target sits centred within it (bringing
+        the container itself on screen first) and waits in-page until the
+        scroll has settled. Falls back to a plain scrollIntoView in the page
+        when the container no longer holds the target.
+        """
+        logger.debug("      Attempting JS scroll within container...")
         try:
-            target_handle = await target_locator.element_handle(
-                timeout=max(1000, int(self.JS_SCROLL_TIMEOUT_MS * 0.5))
+            settled = await self._evaluate_helper(
+                target_locator,
+                "scrollIntoView",
+                arg=container_handle,
+                timeout=max(1000, int(self.JS_SCROLL_TIMEOUT_MS * 0.5)),
             )
-            if not target_handle:
-                logger.warning(
-                    "      Failed to get target element handle for JS scroll."
-                )
-                return False
-
-            # Evaluate scrollIntoView in the page context, passing handles
-            await self.page.evaluate(
-                """([targetEl, containerEl]) => {
-                if (targetEl && typeof targetEl.scrollIntoView === 'function') {
-                    console.log('[JS Scroll] Calling target.scrollIntoView({ block: "center" })');
-                    targetEl.scrollIntoView({ behavior: 'auto', block: 'center', inline: 'nearest' });
-                } else if (targetEl) {
-                     console.warn('[JS Scroll] Target element does not have scrollIntoView method.');
-                     // Fallback: scroll container based on target position? (More complex)
-                     // Example: containerEl.scrollTop = targetEl.offsetTop - containerEl.clientHeight / 2;
-                 } else {
-                    console.warn('[JS Scroll] Target element invalid.');
-                }
-            }""",
-                [target_handle, container_handle],
-            )
-
-            await asyncio.sleep(0.7)  # Wait for potential scroll animation/rendering
-            logger.debug("      JS scrollIntoView evaluation executed.")
+            logger.debug("      JS container scroll executed.", settled=settled)
             return True
         except Exception as js_err:
             logger.warning(
-                f"      JS scroll within container failed: {type(js_err).__name__}: {js_err}",
-                exc_info=False,
+                "JS scroll within container failed.",
+                error_type=type(js_err).__name__,
+                error=str(js_err),
             )
             return False
-        finally:
-            if target_handle:
-                try:
-                    await target_handle.dispose()
-                except Exception:
-                    pass  # Ignore dispose errors
+
+    async def _is_in_viewport(self, locator: Locator, timeout: int) -> bool:
+        """
+        Checks whether the element lies within the viewport and is the one
+        drawn at its own centre, i.e. not clipped away by a scroll container.
+        """
+        try:
+            return bool(
+                await self._evaluate_helper(locator, "inViewport", timeout=timeout)
+            )
+        except Exception:
+            return False
 
     async def _ensure_visible_js_scroll_fallback(
         self, locator: Locator, timeout: int, target_selector_str: str | None = None
     ) -> bool:
         """Attempts JS scrollIntoView (container or direct) and verifies visibility."""
-        start_time = time.time()
+        start_time = time.monotonic()
         container_handle: ElementHandle | None = None
+        container_cached = False
         js_scrolled = False
         try:
-            container_handle = await self._find_scrollable_ancestor(locator)
+            # One cheap in-page check: if the element is already on screen and
+            # unclipped there is nothing to scroll and no ancestor to find.
+            if await self._is_in_viewport(locator, max(500, int(timeout * 0.1))):
+                logger.debug("    Element already within viewport, skipping JS scroll.")
+                return True
+            container_handle, container_cached = await self._cached_scrollable_ancestor(
+                locator, target_selector_str
+            )
             if container_handle:
-                logger.debug(
-                    "    Found scrollable container, trying JS scroll via page.evaluate."
-                )
+                logger.debug("    Found scrollable container, scrolling within it.")
                 js_scrolled = await self._scroll_element_in_container_js(
                     locator, container_handle
                 )
@@ -800,11 +1100,10 @@ class ActionExecutor:
                     await locator.wait_for(
                         state="attached", timeout=max(1000, int(timeout * 0.2))
                     )
-                    await locator.evaluate(
-                        "el => el.scrollIntoView({ behavior: 'auto', block: 'center', inline: 'nearest' })",
-                        timeout=int(timeout * 0.6),
+                    # Resolves once the scroll has settled
+                    await self._evaluate_helper(
+                        locator, "scrollIntoView", timeout=int(timeout * 0.6)
                     )
-                    await asyncio.sleep(0.5)  # Pause after scroll
                     js_scrolled = True
                 except Exception as main_js_err:
                     logger.warning(
@@ -817,7 +1116,7 @@ class ActionExecutor:
             if js_scrolled:
                 logger.debug("    JS scroll executed. Verifying visibility...")
                 try:
-                    elapsed_ms = (time.time() - start_time) * 1000
+                    elapsed_ms = (time.monotonic() - start_time) * 1000
                     verify_timeout = max(
                         1500, timeout - int(elapsed_ms)
                     )  # Min 1.5s verification time
@@ -834,62 +1133,32 @@ class ActionExecutor:
                 return False
         except Exception as js_fallback_err:
             logger.warning(
-                f"    Error during JS scroll fallback logic: {js_fallback_err}",
-                exc_info=True,
+                "Error during JS scroll fallback logic.", error=str(js_fallback_err)
             )
             return False
         finally:
-            if container_handle:
-                try:
-                    await container_handle.dispose()
-                except Exception:
-                    pass
+            if not container_cached:
+                await _dispose_quietly(container_handle)
 
     async def _handle_dynamic_content_after_type(self, locator: Locator):
         """Checks for and potentially waits for autocomplete/suggestion lists after typing."""
         try:
-            # Check common attributes indicating autocomplete behavior
-            has_autocomplete_attrs = await locator.evaluate(
-                """el =>
-                el.hasAttribute('aria-autocomplete') ||
-                el.getAttribute('role') === 'combobox' ||
-                (el.form && el.form.outerHTML.includes('autocomplete')) ||
-                el.hasAttribute('list')
-            """,
-                timeout=500,
-            )  # Quick check
-
-            if has_autocomplete_attrs:
-                logger.debug(
-                    "    Input has autocomplete attributes, checking for suggestions..."
-                )
-                common_selectors = [
-                    '[role="listbox"]',
-                    ".autocomplete-suggestions",
-                    ".dropdown-menu",
-                    'ul[id*="typeahead"]',
-                    'div[class*="suggestion"]',
-                    'div[class*="results"]',
-                    # Add other common suggestion container selectors here
-                ]
-                suggestion_locator = self.page.locator(",".join(common_selectors))
-                try:
-                    # Wait briefly for suggestions to appear
-                    await suggestion_locator.first.wait_for(
-                        state="visible", timeout=2000
-                    )
-                    logger.debug(
-                        "    Detected potential dynamic suggestion list after type."
-                    )
-                    await asyncio.sleep(0.3)  # Short pause if suggestions appear
-                except PlaywrightTimeoutError:
-                    logger.debug("    No suggestion list detected quickly.")
-                    pass  # It's okay if no suggestions appear
+            # One in-page call checks the autocomplete attributes and, if set,
+            # watches the DOM for a visible suggestion list (up to 2s).
+            result = await self._evaluate_helper(
+                locator, "awaitSuggestions", timeout=500
+            )
+            if not result["autocomplete"]:
+                return
+            if result["suggestions"]:
+                logger.debug("Detected dynamic suggestion list after type.")
+                await asyncio.sleep(0.3)  # Short pause if suggestions appear
+            else:
+                logger.debug("No suggestion list detected quickly.")
         except Exception as e:
             # Log as warning, don't fail the main action
             logger.warning(
-                f"    Note: Error checking for dynamic content after type: {str(e)}",
-                exc_info=False,
+                "Error checking for dynamic content after type.", error=str(e)
             )
 
     def _get_selector_string_from_command(
@@ -909,9 +1178,7 @@ class ActionExecutor:
             attrs = element_info.get("attributes", {})
             if isinstance(attrs, dict) and attrs.get("id"):
                 pred_id = attrs.get("id")
-                if pred_id and not re.match(
-                    r"^(ember\d+|gwt-|ext-|jQuery\d+)", pred_id, re.IGNORECASE
-                ):
+                if pred_id and not _GENERATED_ID_RE.match(pred_id):
                     return f"#{pred_id}"
         except Exception:
             pass  # Ignore errors during prediction
@@ -1,6 +1,10 @@
+import asyncio
+import time
+import weakref
+from functools import lru_cache
 from typing import Literal
 
-from playwright.async_api import Page
+from playwright.async_api import BrowserContext, Page
 import structlog
 
 from .action_executor import ActionExecutor
@@ -12,6 +16,30 @@ from ......utils import get_assets_root
 
 logger = structlog.get_logger(__name__)
 
+# Browser contexts that already carry the annotation init script.
+_ANNOTATED_CONTEXTS: weakref.WeakSet[BrowserContext] = weakref.WeakSet()
+
+
+@lru_cache(maxsize=1)
+def _load_annotation_script() -> str:
+    """Loads the content of annotations.js."""
+    try:
+        # Use the robust helper to find the assets directory correctly.
+        assets_root = get_assets_root()
+        script_path = assets_root / "system-lib/browser/annotations.js"
+        if not script_path.exists():
+            raise FileNotFoundError(f"Annotation script not found at {script_path}")
+        with open(script_path, encoding="utf-8") as f:
+            script_content = f.read()
+        # A stable script name, so every document the context opens compiles
+        # identical source under the same URL and V8 can reuse its cache.
+        script_content += "\n//# sourceURL=cx/annotations.js\n"
+        logger.info("Annotation script loaded.")
+        return script_content
+    except Exception as e:
+        logger.error("Failed to load annotation script!", error=str(e))
+        raise RuntimeError("Could not load annotations.js for agent.") from e
+
 
 class AgentSession:
     """
@@ -20,31 +48,22 @@ class AgentSession:
     Observability is now handled via structured logging.
     """
 
+    # Minimum gap between failure screenshots, so a retry storm yields one
+    SCREENSHOT_MIN_INTERVAL_S = 2.0
+
     def __init__(self):
         self.page: Page | None = None
         self.locator_resolver: LocatorResolver | None = None
         self.action_executor: ActionExecutor | None = None
         self.wait_handler: WaitHandler | None = None
-        self.annotation_script_content: str | None = None
-        self._load_annotation_script()
+        # Shared by all sessions; read from disk once per process
+        self.annotation_script_content: str | None = _load_annotation_script()
         # The screenshot_on_failure setting is now a simple attribute
         self.screenshot_on_failure = True
-
-    def _load_annotation_script(self):
-        """Loads the content of annotations.js."""
-        try:
-            # Correctly resolve the path relative to this file
-            # Use the robust helper to find the assets directory correctly.
-            assets_root = get_assets_root()
-            script_path = assets_root / "system-lib/browser/annotations.js"
-            if not script_path.exists():
-                raise FileNotFoundError(f"Annotation script not found at {script_path}")
-            with open(script_path, encoding="utf-8") as f:
-                self.annotation_script_content = f.read()
-            logger.info("Annotation script loaded into AgentSession.")
-        except Exception as e:
-            logger.error("Failed to load annotation script!", error=str(e))
-            raise RuntimeError("Could not load annotations.js for agent.") from e
+        # Failure screenshots run in the background; held here until done
+        self._pending_screenshots: set[asyncio.Task] = set()
+        self._last_shot_ts = 0.0
+        self._last_shot_step = -1
 
     async def initialize(self, page: Page, default_timeout: int = 30000):
         """Receives the active Page and initializes all helpers."""
@@ -59,8 +78,15 @@ class AgentSession:
         """Injects necessary JavaScript into the page."""
         if not self.page or not self.annotation_script_content:
             raise RuntimeError("Cannot inject JS, page or script not available.")
-        await self.page.add_init_script(self.annotation_script_content)
-        logger.debug("Annotation script injected via add_init_script.")
+        # Inject at the context level, once: every page the context opens
+        # inherits the script instead of having it re-sent per page.
+        context = self.page.context
+        if context not in _ANNOTATED_CONTEXTS:
+            await context.add_init_script(self.annotation_script_content)
+            _ANNOTATED_CONTEXTS.add(context)
+            logger.debug("Annotation script injected via context add_init_script.")
+        if self.action_executor:
+            await self.action_executor.install_helpers()
 
     async def take_screenshot(
         self, reason: Literal["on_failure"], step_index: int
@@ -69,13 +95,37 @@ class AgentSession:
         if not self.page or self.page.is_closed():
             return None
         try:
-            screenshot_bytes = await self.page.screenshot(timeout=5000)
+            screenshot_bytes = await self.page.screenshot(
+                timeout=5000, animations="disabled", caret="initial"
+            )
             logger.info("Screenshot taken.", reason=reason, step=step_index)
             return screenshot_bytes
         except Exception as e:
             logger.warning("Failed to take screenshot.", reason=reason, error=str(e))
             return None
 
+    def _screenshot_on_failure(self, step_index: int):
+        """Starts a failure screenshot without holding up the error."""
+        if not self.screenshot_on_failure:
+            return
+        now = time.monotonic()
+        if (
+            step_index == self._last_shot_step
+            or now - self._last_shot_ts < self.SCREENSHOT_MIN_INTERVAL_S
+        ):
+            logger.debug("Skipping failure screenshot in burst.", step=step_index)
+            return
+        self._last_shot_ts = now
+        self._last_shot_step = step_index
+        task = asyncio.create_task(self.take_screenshot("on_failure", step_index))
+        self._pending_screenshots.add(task)
+        task.add_done_callback(self._pending_screenshots.discard)
+
+    async def wait_for_pending_screenshots(self):
+        """Waits for background failure screenshots to finish."""
+        if self._pending_screenshots:
+            await asyncio.gather(*self._pending_screenshots, return_exceptions=True)
+
     async def execute_action(self, command_info: CommandInfo, step_index: int):
         """
         A centralized method to perform any browser action. It handles
@@ -126,11 +176,12 @@ class AgentSession:
                     locator, command_info, step_index
                 )
 
+            # A success ends any failure burst for screenshot deduplication
+            self._last_shot_step = -1
             # Successful actions can return a confirmation
             return {"status": "success"}
 
         except Exception as e:
-            if self.screenshot_on_failure:
-                await self.take_screenshot("on_failure", step_index)
+            self._screenshot_on_failure(step_index)
             # Re-raise the exception to be handled by the ScriptEngine
             raise e
@@ -1,6 +1,13 @@
+import asyncio
+import hashlib
 import json
+import logging
 import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any
+from urllib.parse import urlsplit
 
 from playwright.async_api import Locator, Page
 from playwright.async_api import TimeoutError as PlaywrightTimeoutError
@@ -19,18 +26,286 @@ logger = structlog.get_logger(__name__)
 
 
 # --- CSS Escaping Helper (Add this within LocatorResolver or import) ---
+# Backslashes and both quote characters, escaped in a single pass
+_CSS_ESCAPE_TABLE = str.maketrans({"\\": "\\\\", '"': '\\"', "'": "\\'"})
+
+
 def escape_css_selector_value(value: str) -> str:
     """Escapes characters problematic in CSS selector values, especially within quotes."""
     if not isinstance(value, str):
         return str(value)  # Should already be string, but handle just in case
-    # Escape backslashes first, then quotes
-    escaped = value.replace("\\", "\\\\").replace('"', '\\"').replace("'", "\\'")
     # You might need to escape other characters depending on usage, but quotes are common
-    return escaped
+    return _escape_css_string(value)
+
+
+@lru_cache(maxsize=1024)
+def _escape_css_string(value: str) -> str:
+    """Cached escaping; tag names, roles and test ids repeat across calls."""
+    return value.translate(_CSS_ESCAPE_TABLE)
+
+
+# Markers of Playwright-only selector syntax that document.querySelectorAll rejects
+_PLAYWRIGHT_SELECTOR_RE = re.compile(
+    r">>|^(?:xpath|text|css|id|data-testid|internal)[=:]|^//|^\.\.|:(?:has-text|text|visible|nth-match|left-of|right-of|above|below|near)\b"
+)
+
+
+def _is_plain_css(selector: str) -> bool:
+    """Whether a selector can be evaluated by the browser's own CSS engine."""
+    return not _PLAYWRIGHT_SELECTOR_RE.search(selector)
+
+
+@lru_cache(maxsize=2048)
+def _normalize_whitespace(text: str) -> str:
+    """Collapses runs of whitespace to single spaces and strips the ends."""
+    return " ".join(text.split())
+
+
+@lru_cache(maxsize=2048)
+def _build_target_selector_str(
+    role: str | None,
+    acc_name: str | None,
+    test_id: str | None,
+    name_attr: str | None,
+    text_content: str | None,
+    tag_name: str,
+    max_text_length: int,
+) -> tuple[str, str] | None:
+    """
+    Builds a target selector from historical element fields, returning
+    (selector, source) or None. Pure, so repeated lookups are cached.
+    """
+    # Leave a wildcard tag out of compound selectors
+    tag_prefix = "" if tag_name == "*" else tag_name
+
+    # Priority 1: Role and Name (if available and specific)
+    if role and acc_name:
+        name_clean = _normalize_whitespace(acc_name)
+        if 0 < len(name_clean) < max_text_length:
+            # Simple attribute selector for role + basic name check
+            # Note: Playwright's get_by_role is harder to represent as a simple string here
+            escaped_name = escape_css_selector_value(name_clean)
+            selector = (
+                f"{tag_prefix}[role='{role}']:has-text('{escaped_name}')"  # Approximate
+            )
+            return selector, "Role/Name approx"
+
+    # Priority 2: Text Content (if available and specific)
+    if text_content:
+        text_clean = _normalize_whitespace(text_content)
+        if 0 < len(text_clean) < max_text_length:
+            escaped_text = escape_css_selector_value(text_clean)
+            return f"{tag_prefix}:has-text('{escaped_text}')", "Tag/Text"
+
+    # Priority 3: Specific Attributes (e.g., testid, name)
+    if test_id:
+        return f'[data-testid="{escape_css_selector_value(test_id)}"]', "Test ID"
+    if name_attr:
+        return (
+            f'{tag_prefix}[name="{escape_css_selector_value(name_attr)}"]',
+            "Name Attr",
+        )
+
+    # Fallback: Just use the tag name if provided
+    if tag_name != "*":
+        return tag_name, "Tag only"
+    return None
+
+
+@lru_cache(maxsize=1024)
+def _ci_name_pattern(name: str) -> re.Pattern:
+    """Case-insensitive literal pattern for a name, compiled once per name."""
+    return re.compile(re.escape(name), re.IGNORECASE)
+
+
+async def _first_resolved(awaitables) -> Any:
+    """
+    Runs awaitables concurrently and returns the first truthy result in
+    list order, so the outcome matches running them one after another.
+    Pending ones are cancelled; exceptions surface in the same order.
+    """
+    tasks = [asyncio.ensure_future(awaitable) for awaitable in awaitables]
+    try:
+        for task in tasks:
+            result = await task
+            if result:
+                return result
+        return None
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
 
 
 # --- End Helper ---
 
+# Native CSS for roles whose elements carry their accessible name as text.
+# Matching these by text skips get_by_role's accessibility-tree walk.
+_ROLE_TO_CSS = {
+    "button": "button, [role=button]",
+    "link": "a[href], [role=link]",
+}
+
+# Tags the value-attribute and autocomplete-item strategies apply to
+_VALUE_ATTRIBUTE_TAGS = frozenset({"input", "select", "textarea", "option", "button"})
+_AUTOCOMPLETE_ITEM_TAGS = frozenset(
+    {"li", "div", "a", "span", "td", "th", "button", "option"}
+)
+
+# Implicit ARIA role of common tags, for commands without an explicit role
+_TAG_TO_ROLE = {
+    "button": "button",
+    "a": "link",
+    "input": "textbox",
+    "select": "combobox",
+    "textarea": "textbox",
+}
+
+
+@dataclass(slots=True)
+class _ElementFeatures:
+    """The element_info fields that several strategies read, extracted once."""
+
+    attrs: dict
+    acc: dict
+    data_attrs: dict
+    role: str | None
+    acc_name: str | None
+    test_id: str | None
+
+
+# Counts [containers, distinct targets inside any container] for a plain-CSS
+# container/target pair; null when either uses syntax the browser rejects.
+_CONTAINER_TARGET_COUNT_JS = """
+([containerSelector, targetSelector]) => {
+    try {
+        const containers = document.querySelectorAll(containerSelector);
+        const targets = new Set();
+        for (const container of containers) {
+            for (const el of container.querySelectorAll(targetSelector)) targets.add(el);
+        }
+        return [containers.length, targets.size];
+    } catch (e) {
+        return null;
+    }
+}
+"""
+
+# Counts matches for several simple compound CSS selectors in one evaluation,
+# summed over the document and every open shadow root. Exact only for
+# selectors without combinators: Playwright lets descendant combinators cross
+# shadow boundaries, which per-root querySelectorAll cannot. -1 marks a
+# selector the browser cannot parse.
+_BATCH_COUNT_JS = """
+(selectors) => {
+    const roots = [document];
+    for (let i = 0; i < roots.length; i++) {
+        for (const el of roots[i].querySelectorAll('*')) {
+            if (el.shadowRoot) roots.push(el.shadowRoot);
+        }
+    }
+    return selectors.map(sel => {
+        try {
+            let total = 0;
+            for (const root of roots) total += root.querySelectorAll(sel).length;
+            return total;
+        } catch (e) {
+            return -1;
+        }
+    });
+}
+"""
+
+# Whitespace-normalized text of each matched element, for telling exact text
+# matches apart from contains matches without a second query
+_NORMALIZED_TEXTS_JS = (
+    "els => els.map(e => (e.textContent || '').replace(/\\s+/g, ' ').trim())"
+)
+
+# Verification properties of one element: tag, normalized text, a best-effort
+# accessible name, and attributes with data-* collected as data_attributes
+_ELEMENT_PROPERTIES_JS = """el => {
+    if (!el) return null;
+    const attrs = {};
+    const dataAttrs = {};
+    for (const attr of el.attributes) {
+        if (attr.name.startsWith('data-')) {
+            // Basic camelCase conversion for dataset keys
+            const key = attr.name.substring(5).replace(/-([a-z])/g, (g) => g[1].toUpperCase());
+            // Ensure value is stringified if it's not already (e.g., boolean/number data attrs)
+            dataAttrs[key] = String(attr.value);
+        } else {
+            // Ensure value is stringified
+            attrs[attr.name] = String(attr.value);
+        }
+    }
+    attrs['data_attributes'] = dataAttrs; // Add processed data attributes
+
+    // Attempt to get accessible name (more robustly)
+    let accName = el.getAttribute('aria-label') || '';
+    if (!accName) {
+        const labelledBy = el.getAttribute('aria-labelledby');
+        if (labelledBy) {
+            accName = labelledBy.split(' ')
+                            .map(id => document.getElementById(id)?.textContent?.trim())
+                            .filter(Boolean)
+                            .join(' ') || '';
+        }
+    }
+    if (!accName && el.labels && el.labels.length > 0) {
+        accName = Array.from(el.labels).map(lbl => lbl.textContent?.trim()).filter(Boolean).join(' ') || '';
+    }
+    if (!accName) { accName = el.title || ''; }
+    if (!accName) { accName = el.textContent || ''; } // Fallback to textContent
+
+    return {
+        tag: el.tagName.toLowerCase(),
+        // Ensure text content is handled correctly
+        txt: (el.textContent || '').trim().replace(/\\s+/g, ' '),
+        // Ensure accessible name is handled correctly
+        acc: (accName || '').trim().replace(/\\s+/g, ' '),
+        attrs: attrs
+    };
+}
+"""
+
+# The same properties for every element a locator matches, in one evaluation
+_ALL_ELEMENT_PROPERTIES_JS = f"els => els.map({_ELEMENT_PROPERTIES_JS})"
+
+# For each autocomplete container selector, the indices (among its first
+# maxContainers matches) of visible containers holding a `tag` element whose
+# whitespace-normalized text contains `text`, case-insensitively, as
+# Playwright's :has-text does. null marks a selector the browser rejects.
+_AUTOCOMPLETE_PROBE_JS = """
+([selectors, tag, text, maxContainers]) => {
+    const needle = text.toLowerCase();
+    const isVisible = (el) => {
+        const rect = el.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0
+            && getComputedStyle(el).visibility !== 'hidden';
+    };
+    const hasItem = (container) => {
+        for (const item of container.querySelectorAll(tag)) {
+            const itemText = (item.textContent || '').replace(/\\s+/g, ' ').trim();
+            if (itemText.toLowerCase().includes(needle)) return true;
+        }
+        return false;
+    };
+    return selectors.map(sel => {
+        try {
+            const containers = Array.from(document.querySelectorAll(sel)).slice(0, maxContainers);
+            const hits = [];
+            containers.forEach((container, i) => {
+                if (isVisible(container) && hasItem(container)) hits.push(i);
+            });
+            return hits;
+        } catch (e) {
+            return null;
+        }
+    });
+}
+"""
+
 
 class LocatorResolver:
     """
@@ -39,6 +314,80 @@ class LocatorResolver:
     """
 
     MAX_TEXT_MATCH_LENGTH = 150
+    # Resolved locators remembered per (page location, command signature)
+    LOCATOR_CACHE_SIZE = 100
+    # Context-filter selector strings kept per command before starting over
+    COMPILED_FILTER_CACHE_SIZE = 128
+    # command_info keys that identify "the same command" for the locator cache
+    _CACHE_SIGNATURE_KEYS = (
+        "command_type",
+        "element_info",
+        "context_filter",
+        "context_text",
+    )
+    # Order the standard strategies are tried in, after any context filter
+    STANDARD_STRATEGY_ORDER = (
+        "_try_role_and_name",
+        "_try_label",
+        "_try_placeholder",
+        "_try_name_attribute",
+        "_try_value_attribute",
+        "_try_data_attributes",  # Specific data-* attributes of the target element
+        "_try_text_content",
+        "_try_autocomplete_item",
+        "_try_tag_and_text",
+        "_try_test_id",
+        "_try_relative_locator",
+        "_try_attribute_selector",  # Specific attributes like data-ng-click
+        "_try_stored_css_verified",
+        "_try_stored_xpath_verified",
+        "_try_id_attribute",
+        "_try_simple_tag",  # Most generic, run last
+    )
+    # Opt-in order that tries cheap, stable attribute selectors before the
+    # role/label/text strategies, which walk the accessibility tree or DOM text
+    ATTRIBUTE_FIRST_STRATEGY_ORDER = (
+        "_try_test_id",
+        "_try_id_attribute",
+        "_try_stored_css_verified",
+        "_try_name_attribute",
+        "_try_data_attributes",
+        "_try_attribute_selector",
+        "_try_role_and_name",
+        "_try_label",
+        "_try_placeholder",
+        "_try_value_attribute",
+        "_try_text_content",
+        "_try_autocomplete_item",
+        "_try_tag_and_text",
+        "_try_relative_locator",
+        "_try_stored_xpath_verified",
+        "_try_simple_tag",
+    )
+    # Use ATTRIBUTE_FIRST_STRATEGY_ORDER instead of STANDARD_STRATEGY_ORDER
+    PREFER_ATTRIBUTE_STRATEGIES = False
+    # Independent, read-only strategies; adjacent ones in the ladder run
+    # concurrently, with the earliest successful one still winning
+    RACED_STRATEGIES = frozenset(
+        {
+            "_try_role_and_name",
+            "_try_label",
+            "_try_placeholder",
+            "_try_name_attribute",
+            "_try_value_attribute",
+            "_try_data_attributes",
+            "_try_tag_and_text",
+            "_try_test_id",
+            "_try_id_attribute",
+            "_try_attribute_selector",
+            "_try_stored_css_verified",
+            "_try_stored_xpath_verified",
+        }
+    )
+    # Commands checked only for visible/enabled, not historical properties
+    _VERIFICATION_COMMAND_TYPES = frozenset(
+        {"verify_element_text_policy", "verify_checked", "verify_element_visible"}
+    )
 
     def __init__(self, page: Page):
         """Initialize the resolver with page and event bus."""
@@ -47,6 +396,97 @@ class LocatorResolver:
 
         self.page = page
         self._strategies_tried: list[str] = []
+        # Features of the element_info last seen, keyed by identity
+        self._features_cache: tuple[dict, _ElementFeatures] | None = None
+        # id(command_info) -> (command_info, container selector, target
+        # selector). Holding the dict itself keeps its id from being reused.
+        self._compiled_filter_cache: dict[int, tuple[CommandInfo, str | None, str]] = {}
+        # Candidate properties per locator selector, for one resolution
+        self._element_properties_cache: dict[str, list[dict[str, Any]]] = {}
+        # LRU of (location, signature digest) -> (strategy name, locator)
+        self._locator_cache: OrderedDict[tuple[str, str], tuple[str, Locator]] = (
+            OrderedDict()
+        )
+
+    @staticmethod
+    def _truncate_for_log(value: Any, limit: int = 100) -> Any:
+        """Shortens long dict/list/str values for debug logging."""
+        if not isinstance(value, (dict, list, str)):
+            return value
+        text = str(value)
+        return f"{text[:limit]}..." if len(text) > limit else value
+
+    def _element_features(self, element_info: dict) -> _ElementFeatures:
+        """Extracts the shared element_info fields, once per element_info."""
+        cached = self._features_cache
+        if cached and cached[0] is element_info:
+            return cached[1]
+        attrs = element_info.get("attributes")
+        attrs = attrs if isinstance(attrs, dict) else {}
+        acc = element_info.get("accessibility")
+        acc = acc if isinstance(acc, dict) else {}
+        data_attrs = attrs.get("data_attributes")
+        data_attrs = data_attrs if isinstance(data_attrs, dict) else {}
+        features = _ElementFeatures(
+            attrs=attrs,
+            acc=acc,
+            data_attrs=data_attrs,
+            role=acc.get("role") or attrs.get("role"),
+            acc_name=acc.get("name") or acc.get("aria_label"),
+            test_id=data_attrs.get("testid") or data_attrs.get("pw"),
+        )
+        self._features_cache = (element_info, features)
+        return features
+
+    def _locator_cache_key(self, command_info: CommandInfo) -> tuple[str, str]:
+        """Builds the cache key: page host + path, and a digest of the command."""
+        url = urlsplit(self.page.url)
+        signature = json.dumps(
+            {k: command_info.get(k) for k in self._CACHE_SIGNATURE_KEYS},
+            default=str,
+            sort_keys=True,
+        )
+        digest = hashlib.blake2b(signature.encode(), digest_size=16).hexdigest()
+        return url.netloc + url.path, digest
+
+    async def _try_cached_locator(
+        self,
+        cache_key: tuple[str, str],
+        command_info: CommandInfo,
+        element_info: dict,
+        step_index: int,
+    ) -> Locator | None:
+        """
+        Re-checks the locator that resolved this command last time on this
+        page. Returns it if it still matches exactly one verified element;
+        otherwise evicts the entry and returns None.
+        """
+        cached = self._locator_cache.get(cache_key)
+        if not cached:
+            return None
+        strategy_name, locator = cached
+        try:
+            if await locator.count() == 1 and await self._verify_element_match(
+                locator.first,
+                command_info,
+                element_info,
+                verify_properties=command_info.get("command_type")
+                not in self._VERIFICATION_COMMAND_TYPES,
+            ):
+                self._locator_cache.move_to_end(cache_key)
+                logger.info(
+                    "Locator resolution successful",
+                    step=step_index,
+                    strategy=strategy_name,
+                    cached=True,
+                    locator=str(locator),
+                )
+                return locator
+        except Exception as e:
+            logger.debug("Cached locator check failed.", error=str(e))
+        logger.debug("Cached locator is stale, evicting.", strategy=strategy_name)
+        del self._locator_cache[cache_key]
+        return None
 
     async def find_locator(self, command_info: CommandInfo, step_index: int) -> Locator:
         """
@@ -55,37 +495,46 @@ class LocatorResolver:
         verifies candidates, and attempts disambiguation if needed.
         """
         self._strategies_tried = []  # Reset for each call
+        self._element_properties_cache = {}
         cmd_name = command_info.get(
             "name", command_info.get("command_type", "UnknownCmd")
         )
         logger.debug("Locator resolution started.", step=step_index, target=cmd_name)
 
-        try:
-            # Log truncated command info for context (existing logging code)
-            log_info = command_info.copy()
-            if "element_info" in log_info and isinstance(
-                log_info["element_info"], dict
-            ):
-                log_info["element_info"] = {
-                    k: (
-                        f"{str(v)[:100]}..."
-                        if isinstance(v, (dict, list, str)) and len(str(v)) > 100
-                        else v
-                    )
-                    for k, v in log_info["element_info"].items()
-                }
-            logger.debug(
-                f"  Input Command Info (Truncated): {json.dumps(log_info, indent=2, default=str)}"
-            )
-        except Exception as log_err:
-            logger.warning(
-                f"  Warning: Could not serialize command_info for logging: {log_err}"
-            )
+        if logging.getLogger(__name__).isEnabledFor(logging.DEBUG):
+            try:
+                # Log truncated command info for context (existing logging code)
+                log_info = command_info.copy()
+                if "element_info" in log_info and isinstance(
+                    log_info["element_info"], dict
+                ):
+                    log_info["element_info"] = {
+                        k: self._truncate_for_log(v)
+                        for k, v in log_info["element_info"].items()
+                    }
+                # The renderer formats the dict only if the event is emitted
+                logger.debug(
+                    "Input command info (truncated).",
+                    step=step_index,
+                    command_info=log_info,
+                )
+            except Exception as log_err:
+                logger.warning(
+                    f"  Warning: Could not serialize command_info for logging: {log_err}"
+                )
 
         element_info = command_info.get("element_info", {})
         if not isinstance(element_info, dict):
             element_info = {}  # Ensure it's a dict
 
+        # --- Warm path: reuse what resolved this command last time ---
+        cache_key = self._locator_cache_key(command_info)
+        cached_locator = await self._try_cached_locator(
+            cache_key, command_info, element_info, step_index
+        )
+        if cached_locator:
+            return cached_locator
+
         # --- Determine if context filters are present ---
         context_filter = command_info.get("context_filter")
         context_text = command_info.get("context_text")
@@ -94,191 +543,338 @@ class LocatorResolver:
             bool(context_text) and not has_advanced_filter
         )  # Only run simple if advanced isn't present
 
-        # --- Define the order of strategies with conditions ---
-        strategy_methods = [
-            # Tuple: (method_function, condition_to_run)
-            (
-                self._try_contextual_filter_advanced,
-                has_advanced_filter,
-            ),  # Run first if advanced filter exists
-            (
-                self._try_contextual_filter,
-                has_simple_context,
-            ),  # Run second if ONLY simple context exists
-            (self._try_role_and_name, True),  # Standard strategies run always
-            (self._try_label, True),
-            (self._try_placeholder, True),
-            (self._try_name_attribute, True),
-            (self._try_value_attribute, True),
-            (
-                self._try_data_attributes,
-                True,
-            ),  # Specific data-* attributes of the target element
-            (self._try_text_content, True),
-            (self._try_autocomplete_item, True),
-            (self._try_tag_and_text, True),
-            (self._try_test_id, True),
-            (self._try_relative_locator, True),
-            (
-                self._try_attribute_selector,
-                True,
-            ),  # Specific attributes like data-ng-click
-            (self._try_stored_css_verified, True),
-            (self._try_stored_xpath_verified, True),
-            (self._try_id_attribute, True),
-            (self._try_simple_tag, True),  # Most generic, run last
-        ]
-
-        # --- Iterate through strategies based on conditions ---
-        for strategy_method, should_run in strategy_methods:
-            strategy_name = strategy_method.__name__.replace("_try_", "")
+        # --- Strategy order: a context filter first, then the standard ladder ---
+        runnable: list[str] = []
+        if has_advanced_filter:  # Run first if advanced filter exists
+            runnable.append("_try_contextual_filter_advanced")
+        elif has_simple_context:  # Run if ONLY simple context exists
+            runnable.append("_try_contextual_filter")
+        # Standard strategies run always
+        runnable.extend(
+            self.ATTRIBUTE_FIRST_STRATEGY_ORDER
+            if self.PREFER_ATTRIBUTE_STRATEGIES
+            else self.STANDARD_STRATEGY_ORDER
+        )
 
-            # Skip strategy if its condition is not met
-            if not should_run:
-                # logger.debug(f"  Skipping Strategy: {strategy_name} (Condition not met)") # Optional: reduce log noise
+        # --- Drop attribute strategies whose selector matches nothing ---
+        probes = self._attribute_probe_selectors(element_info, command_info)
+        if len(probes) > 1:
+            try:
+                counts = await self._batch_counts(list(probes.values()))
+                empty = {name for name, count in zip(probes, counts) if count == 0}
+                if empty:
+                    logger.debug(
+                        "Skipping strategies with no matches.", strategies=sorted(empty)
+                    )
+                    runnable = [name for name in runnable if name not in empty]
+            except Exception as e:
+                logger.debug("Batched selector probe failed.", error=str(e))
+
+        # --- Drop strategies whose own guard would reject this element ---
+        inapplicable = self._inapplicable_strategies(element_info, command_info)
+        if inapplicable:
+            runnable = [name for name in runnable if name not in inapplicable]
+
+        # --- Iterate through the remaining strategies in order ---
+        i = 0
+        while i < len(runnable):
+            # Adjacent independent strategies overlap their round-trips
+            run_end = i
+            while (
+                run_end < len(runnable) and runnable[run_end] in self.RACED_STRATEGIES
+            ):
+                run_end += 1
+            if run_end - i > 1:
+                raced = await self._race_strategies(
+                    [getattr(self, name) for name in runnable[i:run_end]],
+                    element_info,
+                    command_info,
+                    step_index,
+                )
+                if raced:
+                    return self._accept_locator(cache_key, *raced, step_index)
+                i = run_end
                 continue
+            method_name = runnable[i]
+            final_locator = await self._run_strategy(
+                getattr(self, method_name), element_info, command_info, step_index
+            )
+            if final_locator:
+                return self._accept_locator(
+                    cache_key,
+                    method_name.replace("_try_", ""),
+                    final_locator,
+                    step_index,
+                )
+            i += 1
 
-            # Skip stored selectors if data is missing (existing logic)
-            if strategy_name in ["stored_css_verified", "stored_xpath_verified"]:
-                locators_data = element_info.get("locators", {})
-                selector_key = "css_selector" if "css" in strategy_name else "xpath"
-                selector = (
-                    locators_data.get(selector_key)
-                    if isinstance(locators_data, dict)
-                    else None
-                )
-                if not selector:
-                    # logger.debug(f"  Skipping Strategy: {strategy_name} (No {selector_key} found)") # Optional: reduce log noise
-                    continue
+        # --- If loop finishes without returning a locator ---
+        error_message = f"Could not resolve locator for command '{cmd_name}' after trying strategies: {', '.join(self._strategies_tried)}"
+        logger.error(f"--- Locator Resolution FAILED: {error_message} ---")
+        raise LocatorResolutionError(error_message)
 
-            # --- Execute the strategy and verify/disambiguate ---
-            self._strategies_tried.append(strategy_name)
-            logger.info(f"\n  Trying Strategy: {strategy_name}...")
-            try:
-                # Attempt to get a locator using the current strategy
-                # Pass element_info and command_info consistently
-                locator = await strategy_method(element_info, command_info)
+    async def _run_strategy(
+        self,
+        strategy_method,
+        element_info: dict,
+        command_info: CommandInfo,
+        step_index: int,
+    ) -> Locator | None:
+        """
+        Runs one strategy and verifies/disambiguates its candidate. Returns the
+        final locator, or None to move on to the next strategy. Raises
+        LocatorResolutionError if the page context was destroyed.
+        """
+        strategy_name = strategy_method.__name__.replace("_try_", "")
+
+        # Skip stored selectors if data is missing (existing logic)
+        if strategy_name in ["stored_css_verified", "stored_xpath_verified"]:
+            locators_data = element_info.get("locators", {})
+            selector_key = "css_selector" if "css" in strategy_name else "xpath"
+            selector = (
+                locators_data.get(selector_key)
+                if isinstance(locators_data, dict)
+                else None
+            )
+            if not selector:
+                # logger.debug(f"  Skipping Strategy: {strategy_name} (No {selector_key} found)") # Optional: reduce log noise
+                return None
+
+        # --- Execute the strategy and verify/disambiguate ---
+        self._strategies_tried.append(strategy_name)
+        logger.info(f"\n  Trying Strategy: {strategy_name}...")
+        try:
+            # Attempt to get a locator using the current strategy
+            # Pass element_info and command_info consistently
+            locator = await strategy_method(element_info, command_info)
+
+            # Verification and Disambiguation Logic (remains the same)
+            if locator:
+                logger.debug(
+                    f"    Strategy {strategy_name} returned a potential locator."
+                )
+                final_locator: Locator | None = None
+                try:
+                    count = await locator.count()
 
-                # Verification and Disambiguation Logic (remains the same)
-                if locator:
                     logger.debug(
-                        f"    Strategy {strategy_name} returned a potential locator."
+                        "Locator strategy attempt",
+                        step=step_index,
+                        strategy=strategy_name,
+                        result="found_multiple"
+                        if count > 1
+                        else ("found_one" if count == 1 else "no_match"),
+                        count=count,
                     )
-                    final_locator: Locator | None = None
-                    try:
-                        count = await locator.count()
 
-                        logger.debug(
-                            "Locator strategy attempt",
-                            step=step_index,
-                            strategy=strategy_name,
-                            result="found_multiple"
-                            if count > 1
-                            else ("found_one" if count == 1 else "no_match"),
-                            count=count,
+                    # --- << START REPLACEMENT for 'if count == 1:' block >> ---
+                    if count == 1:
+                        # --- Check if it's a verification command ---
+                        is_verification_command = (
+                            command_info.get("command_type")
+                            in self._VERIFICATION_COMMAND_TYPES
                         )
 
-                        # --- << START REPLACEMENT for 'if count == 1:' block >> ---
-                        if count == 1:
-                            # --- Check if it's a verification command ---
-                            command_type = command_info.get("command_type")
-                            is_verification_command = (
-                                command_type
-                                in [
-                                    "verify_element_text_policy",
-                                    "verify_checked",  # Add other verification types if needed
-                                    "verify_element_visible",  # Example
-                                ]
-                            )
-
-                            # --- Use less strict verification for verification commands ---
-                            # For verification commands, we mainly care if the basic checks (visible/enabled) pass.
-                            # We don't need a strict property match against historical data at this stage.
-                            verify_props_in_find = not is_verification_command
+                        # --- Use less strict verification for verification commands ---
+                        # For verification commands, we mainly care if the basic checks (visible/enabled) pass.
+                        # We don't need a strict property match against historical data at this stage.
+                        verify_props_in_find = not is_verification_command
 
+                        logger.debug(
+                            f"      Single candidate found. Performing verification (verify_properties={verify_props_in_find})..."
+                        )
+                        passed_verification = await self._verify_element_match(
+                            locator.first,
+                            command_info,
+                            element_info,
+                            verify_properties=verify_props_in_find,  # Use determined flag
+                        )
+                        if passed_verification:
                             logger.debug(
-                                f"      Single candidate found. Performing verification (verify_properties={verify_props_in_find})..."
+                                f"      Single candidate passed {'basic' if is_verification_command else 'full'} verification."
                             )
-                            passed_verification = await self._verify_element_match(
-                                locator.first,
-                                command_info,
-                                element_info,
-                                verify_properties=verify_props_in_find,  # Use determined flag
-                            )
-                            if passed_verification:
-                                logger.debug(
-                                    f"      Single candidate passed {'basic' if is_verification_command else 'full'} verification."
-                                )
-                                final_locator = locator  # Assign the found locator
-                            else:
-                                logger.debug(
-                                    f"      Single candidate failed {'basic' if is_verification_command else 'full'} verification."
-                                )
-                        # --- << END REPLACEMENT for 'if count == 1:' block >> ---
-                        elif count > 1:
-                            best_match_locator = await self._find_best_verified_match(
-                                locator,
-                                command_info,
-                                element_info,
-                                initial_locator_ambiguous=True,
+                            final_locator = locator  # Assign the found locator
+                        else:
+                            logger.debug(
+                                f"      Single candidate failed {'basic' if is_verification_command else 'full'} verification."
                             )
-                            if best_match_locator:
-                                logger.debug("      Disambiguation successful.")
-                                final_locator = best_match_locator
-                            else:
-                                logger.debug("      Disambiguation failed.")
+                    # --- << END REPLACEMENT for 'if count == 1:' block >> ---
+                    elif count > 1:
+                        best_match_locator = await self._find_best_verified_match(
+                            locator,
+                            command_info,
+                            element_info,
+                            initial_locator_ambiguous=True,
+                        )
+                        if best_match_locator:
+                            logger.debug("      Disambiguation successful.")
+                            final_locator = best_match_locator
+                        else:
+                            logger.debug("      Disambiguation failed.")
 
-                        # Final check: ensure the chosen locator is still attached
-                        if final_locator:
-                            try:
+                    # Final check: ensure the chosen locator is still attached.
+                    # A single match was just counted and verified, so only a
+                    # disambiguated nth candidate can have gone stale.
+                    if final_locator:
+                        try:
+                            if count > 1:
                                 await final_locator.first.wait_for(
                                     state="attached", timeout=500
                                 )
                                 logger.debug("    Final locator attach check passed.")
-                                logger.info(
-                                    "Locator resolution successful",
-                                    step=step_index,
-                                    strategy=strategy_name,
-                                    score=1.0,  # Placeholder for now
-                                    locator=str(final_locator),
-                                )
-                                return final_locator  # SUCCESS: Return the verified/disambiguated locator
-                            except PlaywrightTimeoutError:
-                                logger.warning(
-                                    "    Final locator failed verification: Timed out on attach check."
-                                )
-                            except Exception as attach_err:
-                                logger.warning(
-                                    f"    Final locator verification attach check error: {attach_err}",
-                                    exc_info=False,
-                                )
-                            # If final check fails, fall through to try next strategy
+                            return final_locator  # SUCCESS: Return the verified/disambiguated locator
+                        except PlaywrightTimeoutError:
+                            logger.warning(
+                                "    Final locator failed verification: Timed out on attach check."
+                            )
+                        except Exception as attach_err:
+                            logger.warning(
+                                f"    Final locator verification attach check error: {attach_err}",
+                                exc_info=False,
+                            )
+                        # If final check fails, fall through to the next strategy
 
-                    except Exception as verify_err:
-                        logger.warning(
-                            f"    Error during verification/disambiguation for strategy {strategy_name}: {type(verify_err).__name__}: {str(verify_err)}",
-                            exc_info=False,
-                        )
-                # If locator is None, or count=0, or verification failed, loop continues...
+                except Exception as verify_err:
+                    logger.warning(
+                        f"    Error during verification/disambiguation for strategy {strategy_name}: {type(verify_err).__name__}: {str(verify_err)}",
+                        exc_info=False,
+                    )
+            # If locator is None, or count=0, or verification failed, try the next strategy
 
-            except Exception as strategy_err:
-                # Log errors encountered within the strategy method itself
-                logger.warning(
-                    f"    Strategy {strategy_name} encountered error: {type(strategy_err).__name__}: {str(strategy_err)}",
-                    exc_info=False,
+        except Exception as strategy_err:
+            # Log errors encountered within the strategy method itself
+            logger.warning(
+                f"    Strategy {strategy_name} encountered error: {type(strategy_err).__name__}: {str(strategy_err)}",
+                exc_info=False,
+            )
+            if "context was destroyed" in str(strategy_err):
+                logger.error(
+                    f"      Context destroyed during {strategy_name}, stopping locator resolution."
                 )
-                if "context was destroyed" in str(strategy_err):
-                    logger.error(
-                        f"      Context destroyed during {strategy_name}, stopping locator resolution."
-                    )
-                    raise LocatorResolutionError(
-                        "Context destroyed during locator resolution"
-                    ) from strategy_err
+                raise LocatorResolutionError(
+                    "Context destroyed during locator resolution"
+                ) from strategy_err
+        return None
 
-        # --- If loop finishes without returning a locator ---
-        error_message = f"Could not resolve locator for command '{cmd_name}' after trying strategies: {', '.join(self._strategies_tried)}"
-        logger.error(f"--- Locator Resolution FAILED: {error_message} ---")
-        raise LocatorResolutionError(error_message)
+    async def _race_strategies(
+        self,
+        strategy_methods: list,
+        element_info: dict,
+        command_info: CommandInfo,
+        step_index: int,
+    ) -> tuple[str, Locator] | None:
+        """
+        Runs independent strategies concurrently, so their round-trips
+        overlap, but still honours their order: the first strategy in the
+        list that resolves wins, and the ones still running are cancelled.
+        """
+
+        async def run(method) -> tuple[str, Locator] | None:
+            final_locator = await self._run_strategy(
+                method, element_info, command_info, step_index
+            )
+            if final_locator:
+                return method.__name__.replace("_try_", ""), final_locator
+            return None
+
+        return await _first_resolved([run(method) for method in strategy_methods])
+
+    async def _batch_counts(self, selectors: list[str]) -> list[int]:
+        """Returns the match count of each CSS selector (-1 if invalid)."""
+        return await self.page.evaluate(_BATCH_COUNT_JS, selectors)
+
+    def _attribute_probe_selectors(
+        self, element_info: dict, command_info: CommandInfo
+    ) -> dict[str, str]:
+        """
+        Returns, per attribute strategy, the simple compound selector it will
+        query, so all of them can be counted in one round-trip before the
+        ladder. Must stay in step with the selectors the strategies build.
+        The stored CSS selector is left out: it may use combinators that
+        cross shadow roots, which _BATCH_COUNT_JS would undercount as zero.
+        """
+        probes: dict[str, str] = {}
+        features = self._element_features(element_info)
+        attrs = features.attrs
+        if features.test_id:
+            # get_by_test_id matches the data-testid attribute exactly
+            probes["_try_test_id"] = (
+                f'[data-testid="{escape_css_selector_value(str(features.test_id))}"]'
+            )
+        if attrs.get("id"):
+            probes["_try_id_attribute"] = f"#{attrs['id']}"
+        name_attr_val = attrs.get("name")
+        if name_attr_val:
+            tag_name = command_info.get("element_type", "*") or "*"
+            escaped_name_val = name_attr_val.replace('"', '\\"')
+            probes["_try_name_attribute"] = f'{tag_name}[name="{escaped_name_val}"]'
+        return probes
+
+    def _inapplicable_strategies(
+        self, element_info: dict, command_info: CommandInfo
+    ) -> set[str]:
+        """
+        Returns the strategies whose opening checks would return None for
+        this element, so the ladder need not enter them at all. Mirrors
+        those checks, which stay in place as guards.
+        """
+        features = self._element_features(element_info)
+        attrs = features.attrs
+        data_attrs = features.data_attrs
+        locators_data = element_info.get("locators", {})
+        tag = (command_info.get("element_type") or "").lower()
+
+        skipped: set[str] = set()
+        if not (isinstance(locators_data, dict) and locators_data.get("label_text")):
+            skipped.add("_try_label")
+        if not attrs.get("placeholder"):
+            skipped.add("_try_placeholder")
+        if not attrs.get("name"):
+            skipped.add("_try_name_attribute")
+        if tag not in _VALUE_ATTRIBUTE_TAGS or not attrs.get("value"):
+            skipped.add("_try_value_attribute")
+        if not features.test_id:
+            skipped.add("_try_test_id")
+        if not attrs.get("id"):
+            skipped.add("_try_id_attribute")
+        if tag not in _AUTOCOMPLETE_ITEM_TAGS or not (
+            features.acc.get("name") or element_info.get("text")
+        ):
+            skipped.add("_try_autocomplete_item")
+        ng_click = data_attrs.get("ngClick")
+        if tag != "a" or not ng_click or "Room" not in ng_click:
+            skipped.add("_try_relative_locator")
+        return skipped
+
+    def _accept_locator(
+        self,
+        cache_key: tuple[str, str],
+        strategy_name: str,
+        locator: Locator,
+        step_index: int,
+    ) -> Locator:
+        """
+        Logs and caches the strategy result find_locator returns. Kept out of
+        _run_strategy so raced strategies that lose never report success.
+        """
+        logger.info(
+            "Locator resolution successful",
+            step=step_index,
+            strategy=strategy_name,
+            score=1.0,  # Placeholder for now
+            locator=str(locator),
+        )
+        self._remember_locator(cache_key, strategy_name, locator)
+        return locator
+
+    def _remember_locator(
+        self, cache_key: tuple[str, str], strategy_name: str, locator: Locator
+    ) -> None:
+        """Stores a resolved locator in the LRU locator cache."""
+        self._locator_cache[cache_key] = (strategy_name, locator)
+        self._locator_cache.move_to_end(cache_key)
+        if len(self._locator_cache) > self.LOCATOR_CACHE_SIZE:
+            self._locator_cache.popitem(last=False)
 
     # --- ADDED: Advanced Contextual Filter Strategy ---
     async def _try_contextual_filter_advanced(
@@ -295,106 +891,52 @@ class LocatorResolver:
             logger.debug("    Skipping advanced filter: No context_filter dict found.")
             return None
 
-        logger.debug(f"    Applying advanced contextual filter: {context_filter}")
-
-        # --- 2. Determine Container Selector ---
-        container_selector_str: str | None = None
-
-        # Prioritize direct css_selector from filter for the container
-        if (
-            isinstance(context_filter.get("css_selector"), str)
-            and context_filter["css_selector"]
-        ):
-            container_selector_str = context_filter["css_selector"]
-            logger.debug(
-                f"      Using direct container css_selector from context_filter: '{container_selector_str}'"
-            )
-        else:
-            # Build Container Selector from other context_filter fields (tag_name, text, attributes)
-            container_tag = context_filter.get("tag_name", "*")
-            if not isinstance(container_tag, str) or not container_tag:
-                container_tag = "*"
-            container_selector_parts = [container_tag]
-
-            text_filters = context_filter.get("text")
-            if isinstance(text_filters, str) and text_filters:
-                text_filters = [text_filters]
-            if isinstance(text_filters, list):
-                for text_val in text_filters:
-                    if isinstance(text_val, str) and text_val:
-                        escaped_text = escape_css_selector_value(text_val)
-                        container_selector_parts.append(f":has-text('{escaped_text}')")
-                    else:
-                        logger.warning(
-                            f"      Ignoring invalid text filter item: {text_val}"
-                        )
-
-            attr_filters = context_filter.get("attributes")
-            if isinstance(attr_filters, dict):
-                for attr_name, attr_value in attr_filters.items():
-                    if (
-                        isinstance(attr_name, str)
-                        and attr_name
-                        and attr_value is not None
-                    ):
-                        escaped_value = escape_css_selector_value(str(attr_value))
-                        container_selector_parts.append(
-                            f'[{attr_name}="{escaped_value}"]'
-                        )
-                    else:
-                        logger.warning(
-                            f"      Ignoring invalid attribute filter item: {attr_name}={attr_value}"
-                        )
-
-            if (
-                len(container_selector_parts) > 1
-            ):  # Only join if there are filters beyond tag_name
-                container_selector_str = "".join(container_selector_parts)
-                logger.debug(
-                    f"      Constructed container selector: '{container_selector_str}'"
-                )
-            else:
-                logger.warning(
-                    "      Could not construct a meaningful container selector from filter criteria (tag/text/attrs)."
-                )
-                return None  # Cannot proceed without a container selector
-
-        # --- Double check selector was determined ---
-        if not container_selector_str:
-            logger.error(
-                "      Internal Error: Container selector string is empty after processing context_filter."
-            )
-            return None
+        logger.debug(
+            "Applying advanced contextual filter.", context_filter=context_filter
+        )
 
-        # --- 1. Determine Target Selector (within the container) ---
-        # <<< MODIFICATION START: Check for target_selector_override first >>>
-        target_selector_override = context_filter.get("target_selector_override")
-        if target_selector_override and isinstance(target_selector_override, str):
-            target_selector_str = target_selector_override
-            logger.debug(
-                f"      Using target selector override: '{target_selector_str}'"
-            )
+        # --- Container and target selectors, built once per command ---
+        compiled = self._compiled_filter_cache.get(id(command_info))
+        if compiled and compiled[0] is command_info and compiled[1]:
+            _, container_selector_str, target_selector_str = compiled
         else:
-            # Fallback to guessing if override is not provided
-            logger.debug(
-                "      No target_selector_override found, guessing target selector..."
+            selectors = await self._compile_contextual_filter(
+                context_filter, element_info, command_info
             )
-            target_selector_str = await self._get_target_selector_str(
-                element_info, command_info
+            if not selectors:
+                return None
+            container_selector_str, target_selector_str = selectors
+            self._cache_compiled_filter(
+                command_info, container_selector_str, target_selector_str
             )
-        # <<< MODIFICATION END >>>
 
-        if not target_selector_str:
-            logger.warning(
-                "      Could not determine a selector for the target element (neither override nor guess worked)."
-            )
-            return None
-        logger.debug(f"      Final target selector determined: '{target_selector_str}'")
+        # Selectors the planner supplied verbatim need no re-verification
+        container_was_explicit = bool(context_filter.get("css_selector"))
+        target_was_explicit = bool(context_filter.get("target_selector_override"))
 
         # --- 3. Build and Verify Final Locator ---
         try:
             container_locator = self.page.locator(container_selector_str)
-            container_count = await container_locator.count()
+            final_locator = container_locator.locator(
+                target_selector_str
+            )  # Target within the container(s)
+
+            # Both counts in one evaluation when the selectors are plain CSS
+            # and it finds the target; otherwise count through Playwright,
+            # which also understands its own pseudo-classes and shadow roots.
+            counts = None
+            if _is_plain_css(container_selector_str) and _is_plain_css(
+                target_selector_str
+            ):
+                counts = await self.page.evaluate(
+                    _CONTAINER_TARGET_COUNT_JS,
+                    [container_selector_str, target_selector_str],
+                )
+            if counts and counts[1] > 0:
+                container_count, count = counts
+            else:
+                container_count = await container_locator.count()
+                count = None
             logger.debug(
                 f"      Container locator '{container_selector_str}' found {container_count} element(s)."
             )
@@ -406,16 +948,18 @@ class LocatorResolver:
                     f"      Multiple containers ({container_count}) found for filter. Targeting within the first one found."
                 )
 
-            final_locator = container_locator.locator(
-                target_selector_str
-            )  # Target within the container(s)
-
-            count = await final_locator.count()
+            if count is None:
+                count = await final_locator.count()
             logger.debug(
                 f"      Found {count} final candidate(s) using advanced context filter."
             )
 
             if count == 1:
+                if container_was_explicit and target_was_explicit:
+                    logger.info(
+                        "      ✓ Unique target found using explicit container and target selectors."
+                    )
+                    return final_locator
                 # Minimal verification recommended even if unique
                 passed_verification = await self._verify_element_match(
                     final_locator.first,
@@ -454,14 +998,131 @@ class LocatorResolver:
                 logger.warning(
                     "      No element found matching the target selector within the specified container."
                 )
-                return None
+                return None
+
+        except Exception as e:
+            logger.error(
+                f"      Error applying advanced context filter (Container: '{container_selector_str}', Target: '{target_selector_str}'): {e}",
+                exc_info=True,
+            )
+            return None
+
+    async def _compile_contextual_filter(
+        self, context_filter: dict, element_info: dict, command_info: CommandInfo
+    ) -> tuple[str, str] | None:
+        """
+        Builds the (container, target) selector strings for an advanced
+        context filter, or returns None if either cannot be determined.
+        """
+        # --- 2. Determine Container Selector ---
+        container_selector_str: str | None = None
+
+        # Prioritize direct css_selector from filter for the container
+        if (
+            isinstance(context_filter.get("css_selector"), str)
+            and context_filter["css_selector"]
+        ):
+            container_selector_str = context_filter["css_selector"]
+            logger.debug(
+                f"      Using direct container css_selector from context_filter: '{container_selector_str}'"
+            )
+        else:
+            # Build Container Selector from other context_filter fields (tag_name, text, attributes)
+            container_tag = context_filter.get("tag_name", "*")
+            if not isinstance(container_tag, str) or not container_tag:
+                container_tag = "*"
+            # A bare "*" adds nothing to a selector that has filters
+            container_selector_parts = [container_tag] if container_tag != "*" else []
+            tag_parts = len(container_selector_parts)
+
+            text_filters = context_filter.get("text")
+            if isinstance(text_filters, str) and text_filters:
+                text_filters = [text_filters]
+            if isinstance(text_filters, list):
+                for text_val in text_filters:
+                    if isinstance(text_val, str) and text_val:
+                        escaped_text = escape_css_selector_value(text_val)
+                        container_selector_parts.append(f":has-text('{escaped_text}')")
+                    else:
+                        logger.warning(
+                            f"      Ignoring invalid text filter item: {text_val}"
+                        )
+
+            attr_filters = context_filter.get("attributes")
+            if isinstance(attr_filters, dict):
+                for attr_name, attr_value in attr_filters.items():
+                    if (
+                        isinstance(attr_name, str)
+                        and attr_name
+                        and attr_value is not None
+                    ):
+                        escaped_value = escape_css_selector_value(str(attr_value))
+                        container_selector_parts.append(
+                            f'[{attr_name}="{escaped_value}"]'
+                        )
+                    else:
+                        logger.warning(
+                            f"      Ignoring invalid attribute filter item: {attr_name}={attr_value}"
+                        )
+
+            if (
+                len(container_selector_parts) > tag_parts
+            ):  # Only join if there are filters beyond tag_name
+                container_selector_str = "".join(container_selector_parts)
+                logger.debug(
+                    f"      Constructed container selector: '{container_selector_str}'"
+                )
+            else:
+                logger.warning(
+                    "      Could not construct a meaningful container selector from filter criteria (tag/text/attrs)."
+                )
+                return None  # Cannot proceed without a container selector
 
-        except Exception as e:
+        # --- Double check selector was determined ---
+        if not container_selector_str:
             logger.error(
-                f"      Error applying advanced context filter (Container: '{container_selector_str}', Target: '{target_selector_str}'): {e}",
-                exc_info=True,
+                "      Internal Error: Container selector string is empty after processing context_filter."
+            )
+            return None
+
+        # --- 1. Determine Target Selector (within the container) ---
+        # <<< MODIFICATION START: Check for target_selector_override first >>>
+        target_selector_override = context_filter.get("target_selector_override")
+        if target_selector_override and isinstance(target_selector_override, str):
+            target_selector_str = target_selector_override
+            logger.debug(
+                f"      Using target selector override: '{target_selector_str}'"
+            )
+        else:
+            # Fallback to guessing if override is not provided
+            logger.debug(
+                "      No target_selector_override found, guessing target selector..."
+            )
+            target_selector_str = await self._get_target_selector_str(
+                element_info, command_info
+            )
+        # <<< MODIFICATION END >>>
+
+        if not target_selector_str:
+            logger.warning(
+                "      Could not determine a selector for the target element (neither override nor guess worked)."
             )
             return None
+        logger.debug(f"      Final target selector determined: '{target_selector_str}'")
+
+        return container_selector_str, target_selector_str
+
+    def _cache_compiled_filter(
+        self, command_info: CommandInfo, container: str | None, target: str
+    ) -> None:
+        """Remembers the selectors compiled for a command's context filter."""
+        if len(self._compiled_filter_cache) >= self.COMPILED_FILTER_CACHE_SIZE:
+            self._compiled_filter_cache.clear()
+        self._compiled_filter_cache[id(command_info)] = (
+            command_info,
+            container,
+            target,
+        )
 
     async def _get_target_selector_str(
         self, element_info: dict, command_info: CommandInfo
@@ -473,61 +1134,32 @@ class LocatorResolver:
         """
         logger.debug("        Determining target selector string from element_info...")
 
-        # Priority 1: Role and Name (if available and specific)
-        acc = element_info.get("accessibility", {})
-        attrs = element_info.get("attributes", {})
-        role = acc.get("role") or attrs.get("role")
-        acc_name = acc.get("name") or acc.get("aria_label")
-        tag_name = element_info.get(
-            "type", "*"
-        )  # Get tag from element_info if possible
-
-        if role and acc_name:
-            name_clean = " ".join(acc_name.split())
-            if 0 < len(name_clean) < self.MAX_TEXT_MATCH_LENGTH:
-                # Simple attribute selector for role + basic name check
-                # Note: Playwright's get_by_role is harder to represent as a simple string here
-                escaped_name = escape_css_selector_value(name_clean)
-                selector = f"{tag_name}[role='{role}']:has-text('{escaped_name}')"  # Approximate
-                logger.debug(
-                    f"          Target selector (Role/Name approx): {selector}"
-                )
-                return selector
-
-        # Priority 2: Text Content (if available and specific)
-        text_content = element_info.get("text")
-        if text_content:
-            text_clean = " ".join(text_content.split())
-            if 0 < len(text_clean) < self.MAX_TEXT_MATCH_LENGTH:
-                escaped_text = escape_css_selector_value(text_clean)
-                selector = f"{tag_name}:has-text('{escaped_text}')"
-                logger.debug(f"          Target selector (Tag/Text): {selector}")
-                return selector
-
-        # Priority 3: Specific Attributes (e.g., testid, name) - check if they exist in element_info
+        features = self._element_features(element_info)
+        attrs = features.attrs
+        test_id = name_attr = None
         if isinstance(attrs, dict):
             data_attrs = attrs.get("data_attributes", {})
             test_id = data_attrs.get("testid") if isinstance(data_attrs, dict) else None
-            if test_id:
-                selector = f'[data-testid="{escape_css_selector_value(str(test_id))}"]'
-                logger.debug(f"          Target selector (Test ID): {selector}")
-                return selector
-
             name_attr = attrs.get("name")
-            if name_attr:
-                selector = (
-                    f'{tag_name}[name="{escape_css_selector_value(str(name_attr))}"]'
-                )
-                logger.debug(f"          Target selector (Name Attr): {selector}")
-                return selector
-
-        # Fallback: Just use the tag name if provided
-        if tag_name != "*":
-            logger.debug(f"          Target selector (Tag only): {tag_name}")
-            return tag_name
+        text_content = element_info.get("text")
 
-        logger.warning("        Could not determine a reliable target selector string.")
-        return None
+        built = _build_target_selector_str(
+            features.role or None,
+            features.acc_name or None,
+            str(test_id) if test_id else None,
+            str(name_attr) if name_attr else None,
+            text_content if isinstance(text_content, str) else None,
+            element_info.get("type", "*"),  # Get tag from element_info if possible
+            self.MAX_TEXT_MATCH_LENGTH,
+        )
+        if built is None:
+            logger.warning(
+                "        Could not determine a reliable target selector string."
+            )
+            return None
+        selector, source = built
+        logger.debug(f"          Target selector ({source}): {selector}")
+        return selector
 
     # --- Keep the original _try_contextual_filter for simple context_text ---
     async def _try_contextual_filter(
@@ -546,33 +1178,35 @@ class LocatorResolver:
             f"    Applying simple contextual filter using text: '{context_text}'"
         )
 
-        # 1. Determine base selector for TARGET (reuse helper)
-        target_selector_str = await self._get_target_selector_str(
-            element_info, command_info
-        )
-        if not target_selector_str:
-            logger.warning(
-                "      Could not determine base selector for target (simple context)."
+        # 1. Determine base selector for TARGET (reuse helper), once per command
+        compiled = self._compiled_filter_cache.get(id(command_info))
+        if compiled and compiled[0] is command_info:
+            target_selector_str = compiled[2]
+        else:
+            target_selector_str = await self._get_target_selector_str(
+                element_info, command_info
             )
-            return None
+            if not target_selector_str:
+                logger.warning(
+                    "      Could not determine base selector for target (simple context)."
+                )
+                return None
+            self._cache_compiled_filter(command_info, None, target_selector_str)
         logger.debug(
             f"      Base target selector (simple context): '{target_selector_str}'"
         )
 
         # 2. Determine CONTAINER selector (simpler version using only :has-text)
         escaped_context = escape_css_selector_value(context_text)
-        container_selectors_to_try = [
-            f"div:has-text('{escaped_context}')",  # Common containers
-            f"li:has-text('{escaped_context}')",
-            f"tr:has-text('{escaped_context}')",  # Table rows
-            f"*:has-text('{escaped_context}')",  # Any element as last resort
-        ]
+        # Common containers in one probe, then any element as last resort
+        container_selectors_to_try = (
+            f":is(div, li, tr):has-text('{escaped_context}')",
+            f"*:has-text('{escaped_context}')",
+        )
 
         container_locator: Locator | None = None
-        found_container_selector = None
-        for cs in container_selectors_to_try:
-            try:
-                # logger.debug(f"      Trying simple container selector: {cs}") # Can be noisy
+        try:
+            for cs in container_selectors_to_try:
                 temp_container_locator = self.page.locator(cs)
                 count = await temp_container_locator.count()
                 if count > 0:
@@ -581,11 +1215,9 @@ class LocatorResolver:
                             f"      Multiple simple containers ({count}) found using '{cs}'. Using first."
                         )
                     container_locator = temp_container_locator.first
-                    found_container_selector = cs
-                    # logger.debug(f"      Found simple container using: {cs}")
                     break
-            except Exception:
-                pass  # Ignore errors trying selectors
+        except Exception:
+            pass  # Ignore errors trying selectors
 
         if not container_locator:
             logger.warning(
@@ -637,26 +1269,36 @@ class LocatorResolver:
 
     # --- Strategy Implementations ---
 
+    def _match_candidates(self, *texts: Any, ignore_case: bool = False) -> list[str]:
+        """
+        Normalizes candidate texts in priority order, dropping empty or
+        over-long ones and repeats. With ignore_case, repeats differing only
+        by case are dropped too; only for matchers that ignore case, such as
+        the role strategy's name patterns, not get_by_text's exact pass.
+        """
+        candidates: dict[str, str] = {}
+        for text in texts:
+            if not isinstance(text, str):
+                continue
+            cleaned = _normalize_whitespace(text)
+            if 0 < len(cleaned) < self.MAX_TEXT_MATCH_LENGTH:
+                key = cleaned.casefold() if ignore_case else cleaned
+                candidates.setdefault(key, cleaned)
+        return list(candidates.values())
+
     async def _try_role_and_name(
         self, element_info: dict, command_info: CommandInfo
     ) -> Locator | None:
         """Tries Playwright's get_by_role with accessible name."""
-        acc = element_info.get("accessibility", {})
-        attrs = element_info.get("attributes", {})
-        role = acc.get("role") or attrs.get("role")
+        features = self._element_features(element_info)
+        attrs = features.attrs
+        role = features.role
         tag_name = command_info.get("element_type", "")  # Default to empty string
 
         # Infer role if not explicitly set
         if not role and tag_name:  # Check if tag_name is not empty
             tag_name_lower = tag_name.lower()
-            role_map = {
-                "button": "button",
-                "a": "link",
-                "input": "textbox",
-                "select": "combobox",
-                "textarea": "textbox",
-            }
-            role = role_map.get(tag_name_lower)
+            role = _TAG_TO_ROLE.get(tag_name_lower)
             if tag_name_lower == "input":
                 input_type = attrs.get("type")
                 if input_type in ["button", "submit", "reset", "image"]:
@@ -672,102 +1314,97 @@ class LocatorResolver:
             logger.debug("    No valid role found/inferred for get_by_role.")
             return None
 
-        # Prepare names to try (AccName, TextContent, Title)
-        names_to_try: list[str] = []
-        acc_name = acc.get("name") or acc.get("aria_label")
-        full_text = element_info.get("text")  # This is the historical text content
-
-        # Priority 1: Accessible Name (or aria-label)
-        if acc_name:
-            cleaned_name = " ".join(acc_name.split())
-            if 0 < len(cleaned_name) < self.MAX_TEXT_MATCH_LENGTH:
-                names_to_try.append(cleaned_name)
-                logger.debug(f"    Adding name from accessibility: '{cleaned_name}'")
-
-        # Priority 2: Historical Text Content (if different from Acc Name)
-        if full_text:
-            cleaned_full_text = " ".join(full_text.split())
-            if 0 < len(cleaned_full_text) < self.MAX_TEXT_MATCH_LENGTH:
-                # Add only if different from acc_name to avoid redundant checks
-                if not names_to_try or cleaned_full_text != names_to_try[0]:
-                    # *** CORRECTED LINE ***
-                    names_to_try.append(cleaned_full_text)
-                    logger.debug(
-                        f"    Adding name from historical text content: '{cleaned_full_text}'"
-                    )
-
-        # Fallback to title if no other name found
-        if not names_to_try:
-            title_name = attrs.get("title")
-            if title_name:
-                cleaned_title = " ".join(title_name.split())
-                if 0 < len(cleaned_title) < self.MAX_TEXT_MATCH_LENGTH:
-                    names_to_try.append(cleaned_title)
-                    logger.debug(
-                        f"    Adding name from title attribute: '{cleaned_title}'"
-                    )
+        # Names to try: accessible name (or aria-label), then historical
+        # text content, falling back to the title if neither is usable
+        names_to_try = self._match_candidates(
+            features.acc_name, element_info.get("text"), ignore_case=True
+        ) or self._match_candidates(attrs.get("title"))
+        logger.debug(f"    Names to try for get_by_role: {names_to_try}")
 
         if not names_to_try:
             logger.debug("    No suitable name found for get_by_role.")
             return None
 
-        for name in names_to_try:
-            logger.debug(f"    Attempting get_by_role('{role}', name='{name}')")
-            try:
-                if self.page.is_closed():
-                    logger.warning(
-                        "    Page closed during locator resolution, stopping strategy."
-                    )
-                    return None  # Stop if page closes
+        # Each name is an independent query; the earliest verified one wins
+        return await _first_resolved(
+            [
+                self._attempt_role_name(role, name, element_info, command_info)
+                for name in names_to_try
+            ]
+        )
 
-                # Use regex for case-insensitive matching
-                name_pattern = re.compile(re.escape(name), re.IGNORECASE)
-                locator = self.page.get_by_role(role, name=name_pattern)
-                count = 0  # Initialize count
-                try:
-                    count = await locator.count()
-                except Exception as count_err:
-                    logger.warning(
-                        f"      Error getting count for role/name: {count_err}",
-                        exc_info=False,
+    async def _attempt_role_name(
+        self, role: str, name: str, element_info: dict, command_info: CommandInfo
+    ) -> Locator | None:
+        """One get_by_role attempt for a single candidate name."""
+        logger.debug(f"    Attempting get_by_role('{role}', name='{name}')")
+        try:
+            if self.page.is_closed():
+                logger.warning(
+                    "    Page closed during locator resolution, stopping strategy."
+                )
+                return None  # Stop if page closes
+
+            # Use regex for case-insensitive matching
+            name_pattern = _ci_name_pattern(name)
+
+            # Cheap path first: native CSS plus a text filter. Accepted
+            # only for a single verified match; aria-label-only names,
+            # hidden duplicates and the like fall through to get_by_role.
+            role_css = _ROLE_TO_CSS.get(role)
+            if role_css:
+                css_locator = self.page.locator(role_css).filter(has_text=name_pattern)
+                if await css_locator.count() == 1 and (
+                    await self._verify_element_match(
+                        css_locator.first, command_info, element_info
                     )
-                    continue  # Skip this name if count fails
-
-                logger.debug(f"      Found {count} candidate(s).")
+                ):
+                    logger.debug("      Matched via native CSS for role.")
+                    return css_locator
 
-                if count == 1:
-                    if await self._verify_element_match(
-                        locator.first, command_info, element_info
-                    ):
-                        return locator
-                    else:
-                        logger.debug("      Single candidate failed verification.")
-                elif count > 1:
-                    best_match = await self._find_best_verified_match(
-                        locator,
-                        command_info,
-                        element_info,
-                        initial_locator_ambiguous=True,
-                    )
-                    if best_match:
-                        return (
-                            best_match  # Return the best verified match among multiples
-                        )
-            except Exception as e:
+            locator = self.page.get_by_role(role, name=name_pattern)
+            count = 0  # Initialize count
+            try:
+                count = await locator.count()
+            except Exception as count_err:
                 logger.warning(
-                    f"      get_by_role attempt failed for role='{role}', name='{name}': {type(e).__name__} - {e}",
+                    f"      Error getting count for role/name: {count_err}",
                     exc_info=False,
                 )
-                if "context was destroyed" in str(e):
-                    logger.error(
-                        "      Context destroyed during get_by_role, stopping strategy."
-                    )
-                    # If context is destroyed, likely no further strategies will work
-                    raise LocatorResolutionError(
-                        "Context destroyed during locator resolution"
-                    ) from e
+                return None  # Skip this name if count fails
+
+            logger.debug(f"      Found {count} candidate(s).")
 
-        return None  # Strategy failed for all names tried
+            if count == 1:
+                if await self._verify_element_match(
+                    locator.first, command_info, element_info
+                ):
+                    return locator
+                else:
+                    logger.debug("      Single candidate failed verification.")
+            elif count > 1:
+                best_match = await self._find_best_verified_match(
+                    locator,
+                    command_info,
+                    element_info,
+                    initial_locator_ambiguous=True,
+                )
+                if best_match:
+                    return best_match  # Return the best verified match among multiples
+        except Exception as e:
+            logger.warning(
+                f"      get_by_role attempt failed for role='{role}', name='{name}': {type(e).__name__} - {e}",
+                exc_info=False,
+            )
+            if "context was destroyed" in str(e):
+                logger.error(
+                    "      Context destroyed during get_by_role, stopping strategy."
+                )
+                # If context is destroyed, likely no further strategies will work
+                raise LocatorResolutionError(
+                    "Context destroyed during locator resolution"
+                ) from e
+        return None
 
     async def _try_label(
         self, element_info: dict, command_info: CommandInfo
@@ -782,7 +1419,7 @@ class LocatorResolver:
             logger.debug("    No label_text found in command info.")
             return None
         try:
-            label_text_clean = " ".join(label_text.split())
+            label_text_clean = _normalize_whitespace(label_text)
             logger.debug(f"    Attempting get_by_label('{label_text_clean}')")
             locator = self.page.get_by_label(label_text_clean)
             count = await locator.count()
@@ -809,7 +1446,7 @@ class LocatorResolver:
             logger.debug("    No placeholder found in command info.")
             return None
         try:
-            placeholder_clean = " ".join(placeholder.split())
+            placeholder_clean = _normalize_whitespace(placeholder)
             logger.debug(f"    Attempting get_by_placeholder('{placeholder_clean}')")
             locator = self.page.get_by_placeholder(placeholder_clean)
             count = await locator.count()
@@ -886,8 +1523,7 @@ class LocatorResolver:
         # Only apply to relevant tags and if value exists and tag_name is not empty
         if (
             not tag_name
-            or tag_name.lower()
-            not in ["input", "select", "textarea", "option", "button"]  # Added button
+            or tag_name.lower() not in _VALUE_ATTRIBUTE_TAGS
             or not value_attr
         ):
             logger.debug(
@@ -939,40 +1575,14 @@ class LocatorResolver:
         self, element_info: dict, command_info: CommandInfo
     ) -> Locator | None:
         """Tries locating using get_by_text with command text, accessible name, or visible text."""
-        texts_to_try: list[str] = []
-
-        # --- PRIORITY 1: Text directly provided in the command (for interactive click_text) ---
-        cmd_text = command_info.get("text")
-        if cmd_text:
-            cleaned_cmd_text = " ".join(cmd_text.split())
-            if 0 < len(cleaned_cmd_text) < self.MAX_TEXT_MATCH_LENGTH:
-                # Add command text first
-                texts_to_try.append(cleaned_cmd_text)
-                logger.debug(f"    Adding text from command_info: '{cleaned_cmd_text}'")
-
-        # --- PRIORITY 2: Historical accessible name ---
-        acc_name = element_info.get("accessibility", {}).get("name")
-        if acc_name:
-            cleaned_name = " ".join(acc_name.split())
-            if 0 < len(cleaned_name) < self.MAX_TEXT_MATCH_LENGTH:
-                # Add only if different from command text
-                if cleaned_name not in texts_to_try:
-                    texts_to_try.append(cleaned_name)
-                    logger.debug(
-                        f"    Adding text from historical acc_name: '{cleaned_name}'"
-                    )
-
-        # --- PRIORITY 3: Historical element text content ---
-        full_text = element_info.get("text")  # Historical element text
-        if full_text:
-            cleaned_full_text = " ".join(full_text.split())
-            if 0 < len(cleaned_full_text) < self.MAX_TEXT_MATCH_LENGTH:
-                # Add only if different from command text and acc_name
-                if cleaned_full_text not in texts_to_try:
-                    texts_to_try.append(cleaned_full_text)
-                    logger.debug(
-                        f"    Adding text from historical text content: '{cleaned_full_text}'"
-                    )
+        # Command text first (interactive click_text), then the historical
+        # accessible name and element text
+        texts_to_try = self._match_candidates(
+            command_info.get("text"),
+            element_info.get("accessibility", {}).get("name"),
+            element_info.get("text"),
+        )
+        logger.debug(f"    Texts to try for get_by_text: {texts_to_try}")
 
         if not texts_to_try:
             logger.debug(
@@ -980,23 +1590,56 @@ class LocatorResolver:
             )
             return None
 
-        # --- Loop through texts and attempt location/verification ---
-        for text in texts_to_try:
-            logger.debug(f"    Attempting get_by_text('{text[:50]}...')")
+        # --- Attempt each text concurrently; the earliest verified one wins ---
+        final_locator = await _first_resolved(
+            [
+                self._attempt_text(text, element_info, command_info)
+                for text in texts_to_try
+            ]
+        )
+        if final_locator:
+            return final_locator
+
+        # If no text produced a verified match
+        logger.debug(
+            "    No verified match found using get_by_text strategy for any tried text."
+        )
+        return None
+
+    async def _attempt_text(
+        self, text: str, element_info: dict, command_info: CommandInfo
+    ) -> Locator | None:
+        """One get_by_text query for a single text; exact matches are preferred."""
+        logger.debug(f"    Attempting get_by_text('{text[:50]}...')")
+        try:
+            # The contains query also covers every exact match; read the
+            # candidates' texts once to pick those out
+            locator_contains = self.page.get_by_text(text, exact=False)
             try:
-                # Try exact match first
+                candidate_texts = await locator_contains.evaluate_all(
+                    _NORMALIZED_TEXTS_JS
+                )
+            except Exception as count_err:
+                logger.warning(
+                    f"      Error reading text matches: {count_err}",
+                    exc_info=False,
+                )
+                return None  # Skip this text if the query fails
+
+            count_contains = len(candidate_texts)
+            count_exact = candidate_texts.count(text)
+            logger.debug(
+                f"      Found {count_contains} via contains match, {count_exact} of them exact."
+            )
+
+            # Exact matches first
+            if count_exact:
                 locator_exact = self.page.get_by_text(text, exact=True)
-                count_exact = 0  # Initialize count
-                try:
+                if count_exact == 1:
+                    # The in-page texts only approximate Playwright's exact
+                    # matcher (input values, shadow roots, zero-width spaces),
+                    # so confirm a lone match before trusting it
                     count_exact = await locator_exact.count()
-                except Exception as count_err:
-                    logger.warning(
-                        f"      Error getting count for exact text match: {count_err}",
-                        exc_info=False,
-                    )
-                    continue  # Skip this text if count fails
-
-                logger.debug(f"      Found {count_exact} via exact match.")
                 if count_exact == 1:
                     if await self._verify_element_match(
                         locator_exact.first, command_info, element_info
@@ -1005,10 +1648,7 @@ class LocatorResolver:
                             f"      ✓ Exact match verified for '{text[:50]}...'."
                         )
                         return locator_exact  # Return the locator itself
-                    else:
-                        logger.debug(
-                            "      Single exact candidate failed verification."
-                        )
+                    logger.debug("      Single exact candidate failed verification.")
                 elif count_exact > 1:
                     logger.debug(
                         "      Multiple exact matches found, attempting disambiguation..."
@@ -1024,81 +1664,52 @@ class LocatorResolver:
                             f"      ✓ Disambiguated exact match verified for '{text[:50]}...'."
                         )
                         return best_match  # Return the specific Nth locator
-                    else:
-                        logger.debug("      Disambiguation failed for exact matches.")
-
-                # If exact match failed or wasn't unique and verified, try contains match
-                # Only try contains if exact match yielded nothing OR failed verification/disambiguation
-                if count_exact == 0 or (
-                    count_exact > 0 and not best_match
-                ):  # Added condition here
-                    logger.debug("      Trying contains match...")
-                    locator_contains = self.page.get_by_text(text, exact=False)
-                    count_contains = 0  # Initialize count
-                    try:
-                        count_contains = await locator_contains.count()
-                    except Exception as count_err:
-                        logger.warning(
-                            f"      Error getting count for contains text match: {count_err}",
-                            exc_info=False,
-                        )
-                        continue  # Skip this text if count fails
-
-                    logger.debug(f"      Found {count_contains} via contains match.")
-                    if count_contains == 1:
-                        if await self._verify_element_match(
-                            locator_contains.first, command_info, element_info
-                        ):
-                            logger.info(
-                                f"      ✓ Contains match verified for '{text[:50]}...'."
-                            )
-                            return locator_contains  # Return the locator itself
-                        else:
-                            logger.debug(
-                                "      Single contains candidate failed verification."
-                            )
-                    elif count_contains > 1:
-                        logger.debug(
-                            "      Multiple contains matches found, attempting disambiguation..."
-                        )
-                        best_match_contains = await self._find_best_verified_match(
-                            locator_contains,
-                            command_info,
-                            element_info,
-                            initial_locator_ambiguous=True,
-                        )
-                        if best_match_contains:
-                            logger.info(
-                                f"      ✓ Disambiguated contains match verified for '{text[:50]}...'."
-                            )
-                            return (
-                                best_match_contains  # Return the specific Nth locator
-                            )
-                        else:
-                            logger.debug(
-                                "      Disambiguation failed for contains matches."
-                            )
+                    logger.debug("      Disambiguation failed for exact matches.")
 
-            except Exception as e:
-                # Catch errors specific to get_by_text or its verification steps
-                logger.warning(
-                    f"      get_by_text attempt failed for '{text[:50]}...': {type(e).__name__}: {e}",
-                    exc_info=False,  # Reduce noise unless debugging specific get_by_text errors
+            # Then the contains matches, unless they are the ones just tried
+            if count_contains == count_exact:
+                return None
+            if count_contains == 1:
+                if await self._verify_element_match(
+                    locator_contains.first, command_info, element_info
+                ):
+                    logger.info(
+                        f"      ✓ Contains match verified for '{text[:50]}...'."
+                    )
+                    return locator_contains  # Return the locator itself
+                logger.debug("      Single contains candidate failed verification.")
+            else:
+                logger.debug(
+                    "      Multiple contains matches found, attempting disambiguation..."
+                )
+                best_match_contains = await self._find_best_verified_match(
+                    locator_contains,
+                    command_info,
+                    element_info,
+                    initial_locator_ambiguous=True,
                 )
-                # Check for specific errors that might indicate page context issues
-                if "context was destroyed" in str(e):
-                    logger.error(
-                        "      Context destroyed during get_by_text, stopping strategy."
+                if best_match_contains:
+                    logger.info(
+                        f"      ✓ Disambiguated contains match verified for '{text[:50]}...'."
                     )
-                    # If context is destroyed, likely no further strategies will work
-                    raise LocatorResolutionError(
-                        "Context destroyed during locator resolution"
-                    ) from e
+                    return best_match_contains  # Return the specific Nth locator
+                logger.debug("      Disambiguation failed for contains matches.")
 
-        # If the loop finishes without finding a verified match for any text
-        logger.debug(
-            "    No verified match found using get_by_text strategy for any tried text."
-        )
+        except Exception as e:
+            # Catch errors specific to get_by_text or its verification steps
+            logger.warning(
+                f"      get_by_text attempt failed for '{text[:50]}...': {type(e).__name__}: {e}",
+                exc_info=False,  # Reduce noise unless debugging specific get_by_text errors
+            )
+            # Check for specific errors that might indicate page context issues
+            if "context was destroyed" in str(e):
+                logger.error(
+                    "      Context destroyed during get_by_text, stopping strategy."
+                )
+                # If context is destroyed, likely no further strategies will work
+                raise LocatorResolutionError(
+                    "Context destroyed during locator resolution"
+                ) from e
         return None
 
     async def _try_autocomplete_item(
@@ -1107,16 +1718,9 @@ class LocatorResolver:
         """Specifically targets items within likely autocomplete containers."""
         target_tag = command_info.get("element_type", "")  # Default to empty string
         # Broaden target tags slightly
-        if not target_tag or target_tag.lower() not in [
-            "li",
-            "div",
-            "a",
-            "span",
-            "td",
-            "th",
-            "button",
-            "option",
-        ]:  # Check tag_name is not empty
+        if (
+            not target_tag or target_tag.lower() not in _AUTOCOMPLETE_ITEM_TAGS
+        ):  # Check tag_name is not empty
             logger.debug(
                 f"    Skipping autocomplete: Target tag '{target_tag}' not typical or missing."
             )
@@ -1130,7 +1734,7 @@ class LocatorResolver:
         if not text:
             logger.debug("    Skipping autocomplete: No text found.")
             return None
-        text_clean = " ".join(text.split())
+        text_clean = _normalize_whitespace(text)
         if not (0 < len(text_clean) < self.MAX_TEXT_MATCH_LENGTH):
             logger.debug(
                 f"    Skipping autocomplete: Text invalid or too long ('{text_clean[:30]}...')."
@@ -1147,41 +1751,38 @@ class LocatorResolver:
             "div[class*='results']",
             "div[class*='dropdown-menu']",
         ]
-        # Escape text for CSS :has-text selector
-        escaped_text = text_clean.replace("'", "\\\\'")
+        # A text filter instead of a :has-text selector string: no quoting,
+        # and the compiled pattern is reused for the same text
+        item_pattern = _ci_name_pattern(text_clean)
 
         try:
-            for container_selector in container_selectors:
+            # One evaluation finds the visible containers (first few per
+            # selector) that hold a matching item, instead of counting and
+            # waiting on each container in turn
+            probe = await self.page.evaluate(
+                _AUTOCOMPLETE_PROBE_JS,
+                [container_selectors, target_tag_lower, text_clean, 3],
+            )
+            for container_selector, hits in zip(container_selectors, probe):
                 logger.debug(
-                    f"    Checking within container selector: '{container_selector}'"
+                    f"    Checked container selector '{container_selector}': candidate containers {hits}"
                 )
-                container_locator = self.page.locator(container_selector)
-                container_count = await container_locator.count()
-                logger.debug(f"      Found {container_count} potential container(s).")
-                if container_count == 0:
+                if not hits:
                     continue
 
-                # Check only the first few containers for performance
-                for i in range(min(container_count, 3)):
-                    specific_container = container_locator.nth(i)
-                    try:
-                        # Check visibility briefly
-                        await specific_container.wait_for(state="visible", timeout=1000)
-                        logger.debug(f"      Container {i} is visible.")
-                    except PlaywrightTimeoutError:
-                        logger.debug(f"      Container {i} not visible quickly.")
-                        continue  # Skip non-visible container
-
+                container_locator = self.page.locator(container_selector)
+                for i in hits:
                     # Search for the item within this specific visible container
-                    item_selector = f"{target_tag_lower}:has-text('{escaped_text}')"  # Use lowercased tag
-                    item_locator_in_container = specific_container.locator(
-                        item_selector
+                    item_locator_in_container = (
+                        container_locator.nth(i)
+                        .locator(target_tag_lower)
+                        .filter(has_text=item_pattern)
                     )
                     item_count = await item_locator_in_container.count()
 
                     if item_count > 0:
                         logger.debug(
-                            f"      Found {item_count} candidate item(s) for '{item_selector}' within container {i}."
+                            f"      Found {item_count} candidate '{target_tag_lower}' item(s) within container {i}."
                         )
                         # Verify candidates within this container
                         best_match = await self._find_best_verified_match(
@@ -1208,7 +1809,7 @@ class LocatorResolver:
     async def _try_tag_and_text(
         self, element_info: dict, command_info: CommandInfo
     ) -> Locator | None:
-        """Tries a simple 'tag:has-text("text")' selector."""
+        """Tries the element's tag filtered by its text."""
         tag_name = command_info.get("element_type", "")  # Default to empty string
         text = element_info.get("accessibility", {}).get("name") or element_info.get(
             "text"
@@ -1220,15 +1821,16 @@ class LocatorResolver:
 
         tag_name_lower = tag_name.lower()  # Safe to call lower now
 
-        text_clean = " ".join(text.split())
+        text_clean = _normalize_whitespace(text)
         if 0 < len(text_clean) < self.MAX_TEXT_MATCH_LENGTH:
             try:
-                escaped_text = text_clean.replace("'", "\\\\'")
-                selector = (
-                    f"{tag_name_lower}:has-text('{escaped_text}')"  # Use lowercased tag
+                logger.debug(
+                    f"    Attempting generic tag+text: '{tag_name_lower}' with text '{text_clean[:50]}'"
+                )
+                # Filtering by text avoids quoting it into a selector string
+                locator = self.page.locator(tag_name_lower).filter(
+                    has_text=_ci_name_pattern(text_clean)
                 )
-                logger.debug(f"    Attempting generic tag+text: '{selector}'")
-                locator = self.page.locator(selector)
                 count = await locator.count()
                 logger.debug(f"      Found {count} candidate(s).")
                 if count == 1:
@@ -1646,65 +2248,13 @@ class LocatorResolver:
             "acc_name": None,
             "attrs": {},
         }
-        # Use evaluate to get multiple properties efficiently
-        # *** MODIFIED JS CODE TO EXPECT SINGLE ELEMENT 'el' ***
-        js_code = """el => {
-            if (!el) return null;
-            const attrs = {};
-            const dataAttrs = {};
-            for (const attr of el.attributes) {
-                if (attr.name.startsWith('data-')) {
-                    // Basic camelCase conversion for dataset keys
-                    const key = attr.name.substring(5).replace(/-([a-z])/g, (g) => g[1].toUpperCase());
-                    // Ensure value is stringified if it's not already (e.g., boolean/number data attrs)
-                    dataAttrs[key] = String(attr.value);
-                } else {
-                    // Ensure value is stringified
-                    attrs[attr.name] = String(attr.value);
-                }
-            }
-            attrs['data_attributes'] = dataAttrs; // Add processed data attributes
-
-            // Attempt to get accessible name (more robustly)
-            let accName = el.getAttribute('aria-label') || '';
-            if (!accName) {
-                const labelledBy = el.getAttribute('aria-labelledby');
-                if (labelledBy) {
-                    accName = labelledBy.split(' ')
-                                    .map(id => document.getElementById(id)?.textContent?.trim())
-                                    .filter(Boolean)
-                                    .join(' ') || '';
-                }
-            }
-            if (!accName && el.labels && el.labels.length > 0) {
-                accName = Array.from(el.labels).map(lbl => lbl.textContent?.trim()).filter(Boolean).join(' ') || '';
-            }
-            if (!accName) { accName = el.title || ''; }
-            if (!accName) { accName = el.textContent || ''; } // Fallback to textContent
-
-            return {
-                tag: el.tagName.toLowerCase(),
-                // Ensure text content is handled correctly
-                txt: (el.textContent || '').trim().replace(/\\s+/g, ' '),
-                // Ensure accessible name is handled correctly
-                acc: (accName || '').trim().replace(/\\s+/g, ' '),
-                attrs: attrs
-            };
-        } // Removed the .map() and [0] access
-        """
         try:
             # Evaluate on the first matching element
             el_props = await locator.first.evaluate(
-                js_code, timeout=1500
+                _ELEMENT_PROPERTIES_JS, timeout=1500
             )  # Evaluate on first element
             if el_props:
-                props["tag_name"] = el_props.get("tag")
-                props["text"] = el_props.get("txt", "")
-                props["acc_name"] = el_props.get("acc")
-                props["attrs"] = el_props.get("attrs", {})
-                # Add class string for easier comparison later if needed
-                # Ensure 'class' attribute value is a string
-                props["attrs"]["class_str"] = str(props["attrs"].get("class", ""))
+                props = self._element_properties_from_js(el_props)
             else:
                 logger.warning(
                     "      _get_current_element_properties: evaluate returned null."
@@ -1767,6 +2317,41 @@ class LocatorResolver:
 
         return props
 
+    @staticmethod
+    def _element_properties_from_js(el_props: dict) -> dict[str, Any]:
+        """Shapes one _ELEMENT_PROPERTIES_JS result for verification."""
+        attrs = el_props.get("attrs", {})
+        # Add class string for easier comparison later if needed
+        # Ensure 'class' attribute value is a string
+        attrs["class_str"] = str(attrs.get("class", ""))
+        return {
+            "tag_name": el_props.get("tag"),
+            "text": el_props.get("txt", ""),
+            "acc_name": el_props.get("acc"),
+            "attrs": attrs,
+        }
+
+    async def _get_all_element_properties(
+        self, locator: Locator
+    ) -> list[dict[str, Any]] | None:
+        """
+        Gets verification properties for every element the locator matches
+        in one round-trip, or None if that fails. Results are reused for the
+        same selector until the next resolution starts.
+        """
+        cache_key = str(locator)
+        cached = self._element_properties_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        try:
+            all_props = await locator.evaluate_all(_ALL_ELEMENT_PROPERTIES_JS)
+        except Exception as e:
+            logger.debug("Bulk property read failed.", error=str(e))
+            return None
+        props_list = [self._element_properties_from_js(p) for p in all_props]
+        self._element_properties_cache[cache_key] = props_list
+        return props_list
+
     async def _verify_element_match(
         self,
         locator: Locator,
@@ -1776,11 +2361,13 @@ class LocatorResolver:
         similarity_threshold: float = 0.6,
         # NEW: Parameter to control return type
         return_score: bool = False,
+        current_props: dict[str, Any] | None = None,
     ) -> bool | tuple[float, bool]:  # Return type depends on return_score
         """
         Verifies if the found locator likely corresponds to the original element.
         Handles readonly inputs as potentially interactable for clicks.
         Can optionally return the score and basic check status instead of just True/False.
+        current_props, if given, are the element's already-fetched properties.
         """
         logger.debug("      Verifying candidate element...")
         passed_basic_checks = False  # Track if visibility/enabled checks pass
@@ -1896,7 +2483,8 @@ class LocatorResolver:
 
             # --- Property Comparison Logic ---
             logger.debug("        Comparing properties...")
-            current_props = await self._get_current_element_properties(locator)
+            if current_props is None:
+                current_props = await self._get_current_element_properties(locator)
 
             # --- MODIFICATION START: Safely get historical data ---
             hist_attrs = element_info.get("attributes")  # Get potentially None
@@ -1905,7 +2493,7 @@ class LocatorResolver:
 
             hist_type = command_info.get("element_type")
             hist_type_lower = hist_type.lower() if isinstance(hist_type, str) else None
-            hist_text = " ".join((element_info.get("text") or "").split())
+            hist_text = _normalize_whitespace(element_info.get("text") or "")
 
             match_score = 0.0
             total_checks = 0.0
@@ -1942,7 +2530,7 @@ class LocatorResolver:
                 hist_acc_name and curr_acc_name
             ):  # Checks if hist_acc_name was successfully retrieved
                 total_checks += WEIGHT_ACCNAME
-                hist_acc_name_clean = " ".join(hist_acc_name.split())
+                hist_acc_name_clean = _normalize_whitespace(hist_acc_name)
                 if hist_acc_name_clean.lower() == curr_acc_name.lower():
                     match_score += WEIGHT_ACCNAME
                     logger.debug(f"          AccName: OK ('{hist_acc_name_clean}')")
@@ -2366,7 +2954,9 @@ class LocatorResolver:
         Iterates through multiple candidates, verifies using properties and context (if ambiguous),
         and returns the best match above a threshold.
         """
-        count = await locator.count()
+        # One read of every candidate's properties; it also gives the count
+        all_props = await self._get_all_element_properties(locator)
+        count = len(all_props) if all_props is not None else await locator.count()
         logger.debug(
             f"      Verifying {count} candidates found by strategy (Ambiguous: {initial_locator_ambiguous})..."
         )
@@ -2397,6 +2987,7 @@ class LocatorResolver:
                 verify_properties=True,  # Always verify properties here
                 similarity_threshold=property_threshold,  # Use appropriate threshold
                 return_score=True,  # MUST get score back
+                current_props=all_props[i] if all_props is not None else None,
             )
 
             if not passed_basic_checks:
@@ -2464,10 +3055,15 @@ class LocatorResolver:
                     # Compare Data Attributes Overlap (Contextual check)
                     if hist_data_attrs:
                         try:
-                            curr_data_attrs = (
-                                await candidate_locator.evaluate("el => el.dataset")
-                                or {}
-                            )
+                            if all_props is not None:
+                                curr_data_attrs = all_props[i]["attrs"].get(
+                                    "data_attributes", {}
+                                )
+                            else:
+                                curr_data_attrs = (
+                                    await candidate_locator.evaluate("el => el.dataset")
+                                    or {}
+                                )
                             if isinstance(curr_data_attrs, dict):
                                 context_checks_total_weight += WEIGHT_DATA_ATTRS
                                 common_keys = set(hist_data_attrs.keys()) & set(
@@ -2700,13 +3296,13 @@ class LocatorResolver:
         element_text = element_info.get("text")
 
         if acc_name:  # Prioritize accessible name
-            cleaned_name = " ".join(str(acc_name).split())
+            cleaned_name = _normalize_whitespace(str(acc_name))
             if 0 < len(cleaned_name) < self.MAX_TEXT_MATCH_LENGTH:
                 text_to_use = cleaned_name
                 logger.debug("      Selected text from 'accessibility.name/aria_label'")
 
         if not text_to_use and element_text:  # Fallback to text content
-            cleaned_text = " ".join(str(element_text).split())
+            cleaned_text = _normalize_whitespace(str(element_text))
             if 0 < len(cleaned_text) < self.MAX_TEXT_MATCH_LENGTH:
                 text_to_use = cleaned_text
                 logger.debug("      Selected text from 'element_info.text'")
@@ -347,6 +347,7 @@ class CommandInfo(TypedDict, total=False):
     data: Any | None
     context_text: str | None
     context_filter: dict[str, Any] | None
+    select_fast_path: bool | None  # Try the first 'select' preference as a value first
 
 
 # --- Other Helper Classes ---
@@ -77,7 +77,7 @@ class WaitHandler:
             f"stability: {check_stability_after}) ---"
         )
         logger.info(log_msg)
-        start_time = time.time()
+        start_time = time.monotonic()
         initial_url = self.page.url
 
         try:
@@ -123,7 +123,7 @@ class WaitHandler:
 
             # --- Wait for Selector ---
             if wait_for_selector:
-                elapsed_ms = (time.time() - start_time) * 1000
+                elapsed_ms = (time.monotonic() - start_time) * 1000
                 remaining_timeout = max(2000, wait_timeout - int(elapsed_ms))
                 logger.debug(
                     f"  - Waiting for selector '{wait_for_selector}' (timeout {remaining_timeout}ms)..."
@@ -142,7 +142,7 @@ class WaitHandler:
 
             # --- Check Stability ---
             if check_stability_after:
-                elapsed_ms = (time.time() - start_time) * 1000
+                elapsed_ms = (time.monotonic() - start_time) * 1000
                 stability_timeout = min(
                     self.STABILITY_CHECK_DURATION_MS,
                     max(500, wait_timeout - int(elapsed_ms)),
@@ -158,17 +158,17 @@ class WaitHandler:
 
             await asyncio.sleep(0.3)
 
-            elapsed = (time.time() - start_time) * 1000
+            elapsed = (time.monotonic() - start_time) * 1000
             logger.info(f"--- Navigation Wait Successful ({elapsed:.0f}ms) ---")
             return True
 
         except PlaywrightTimeoutError as e:
-            elapsed = (time.time() - start_time) * 1000
+            elapsed = (time.monotonic() - start_time) * 1000
             error_message = f"Navigation timed out after {elapsed:.0f}ms. Details: {str(e).replace('\n', ' ')}"
             logger.error(f"--- Navigation Wait FAILED: {error_message} ---")
             raise NavigationTimeoutError(error_message) from e
         except Exception as e:
-            elapsed = (time.time() - start_time) * 1000
+            elapsed = (time.monotonic() - start_time) * 1000
             error_message = f"Error during navigation wait after {elapsed:.0f}ms: {type(e).__name__}: {str(e)}"
             logger.error(
                 f"--- Navigation Wait FAILED: {error_message} ---", exc_info=True
@@ -190,7 +190,7 @@ class WaitHandler:
 
         wait_timeout = timeout if timeout is not None else self.default_update_timeout
         logger.info(f"--- Waiting for Dynamic Update (timeout: {wait_timeout}ms) ---")
-        start_time = time.time()
+        start_time = time.monotonic()
         remaining_timeout = wait_timeout
 
         try:
@@ -218,7 +218,7 @@ class WaitHandler:
                     logger.debug(
                         f"    ✓ Selector reached state '{expected_selector_state}'."
                     )
-                    elapsed = (time.time() - start_time) * 1000
+                    elapsed = (time.monotonic() - start_time) * 1000
                     remaining_timeout = max(500, wait_timeout - int(elapsed))
                 except PlaywrightTimeoutError as e:
                     raise WaitTimeoutError(
@@ -236,7 +236,7 @@ class WaitHandler:
                         "networkidle", timeout=network_timeout
                     )
                     logger.debug("    ✓ Network appears idle.")
-                    elapsed = (time.time() - start_time) * 1000
+                    elapsed = (time.monotonic() - start_time) * 1000
                     remaining_timeout = max(500, wait_timeout - int(elapsed))
                 except PlaywrightTimeoutError:
                     logger.warning("    ! Network idle timeout (may be acceptable).")
@@ -255,19 +255,19 @@ class WaitHandler:
                     )
                     # Not raising an error here, just warning
 
-            elapsed = (time.time() - start_time) * 1000
+            elapsed = (time.monotonic() - start_time) * 1000
             logger.info(f"--- Dynamic Update Wait Successful ({elapsed:.0f}ms) ---")
             return True
 
         except (PlaywrightTimeoutError, WaitTimeoutError) as e:
-            elapsed = (time.time() - start_time) * 1000
+            elapsed = (time.monotonic() - start_time) * 1000
             error_message = f"Dynamic update wait timed out after {elapsed:.0f}ms. Details: {str(e).replace('\n', ' ')}"
             logger.error(f"--- Dynamic Update Wait FAILED: {error_message} ---")
             if isinstance(e, WaitTimeoutError):
                 raise e
             raise WaitTimeoutError(error_message) from e
         except Exception as e:
-            elapsed = (time.time() - start_time) * 1000
+            elapsed = (time.monotonic() - start_time) * 1000
             error_message = f"Error during dynamic update wait after {elapsed:.0f}ms: {type(e).__name__}: {str(e)}"
             logger.error(
                 f"--- Dynamic Update Wait FAILED: {error_message} ---", exc_info=True
@@ -276,7 +276,7 @@ class WaitHandler:
 
     async def _wait_for_stable_dom(self, duration_ms: int) -> bool:
         """Helper to check if DOM innerHTML length remains constant for a duration."""
-        start_stability_time = time.time()
+        start_stability_time = time.monotonic()
         last_html_len = -1
         try:
             last_html_len = await self.page.evaluate(
@@ -290,7 +290,7 @@ class WaitHandler:
             )
             return True
 
-        while (time.time() - start_stability_time) * 1000 < duration_ms:
+        while (time.monotonic() - start_stability_time) * 1000 < duration_ms:
             await asyncio.sleep(self.STABILITY_CHECK_INTERVAL_MS / 1000)
             try:
                 current_html_len = await self.page.evaluate(
@@ -300,7 +300,7 @@ class WaitHandler:
                     logger.debug(
                         f"      - DOM changed (length {last_html_len} -> {current_html_len}). Resetting stability timer."
                     )
-                    start_stability_time = time.time()  # Reset timer
+                    start_stability_time = time.monotonic()  # Reset timer
                     last_html_len = current_html_len
             except Exception as e:
                 logger.warning(
@@ -90,6 +90,7 @@ class DeclarativeBrowserStrategy(BaseConnectorStrategy):
         Safely closes the browser and cleans up all associated resources.
         """
         logger.info("Ending browser session...")
+        await self.agent_session.wait_for_pending_screenshots()
         if self.browser_manager:
             await self.browser_manager.close()
         logger.info("Browser session ended and resources cleaned up.")
@@ -1,39 +1,33 @@
+import json
 from datetime import date, datetime, timezone
 from decimal import Decimal
+from functools import singledispatch
 from typing import Any, Dict
 from uuid import UUID
 
+try:
+    import orjson
+except ImportError:  # orjson ships with the optional `speedups` extra
+    orjson = None
 
+
+def json_loads(data: bytes | str) -> Any:
+    """Parses JSON bytes or text, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+@singledispatch
 def safe_serialize(data: Any) -> Any:
     """
     Recursively traverses a data structure and converts common, non-standard
     JSON types into a JSON-serializable format.
-    """
-    if isinstance(data, list):
-        return [safe_serialize(item) for item in data]
-
-    if isinstance(data, dict):
-        return {key: safe_serialize(value) for key, value in data.items()}
-
-    # --- THIS IS THE FIX ---
-    # Handle datetime objects first, as they are a subclass of date.
-    if isinstance(data, datetime):
-        if data.tzinfo is None:
-            # If the datetime is naive, assume it's UTC.
-            data = data.replace(tzinfo=timezone.utc)
-        return data.isoformat().replace("+00:00", "Z")
-
-    # Now handle date objects, which do not have tzinfo.
-    if isinstance(data, date):
-        return data.isoformat()
-    # --- END FIX ---
-
-    if isinstance(data, UUID):
-        return str(data)
-
-    if isinstance(data, Decimal):
-        return float(data)
 
+    Dispatch is on the value's type, so each node costs one cached type lookup
+    instead of a chain of isinstance checks. This base implementation handles
+    every type without a registered handler.
+    """
     # Safely handle RecordID-like objects
     if (
         hasattr(data, "id")
@@ -45,6 +39,49 @@ def safe_serialize(data: Any) -> Any:
     return data
 
 
+@safe_serialize.register
+def _(data: list) -> list:
+    return [safe_serialize(item) for item in data]
+
+
+@safe_serialize.register
+def _(data: dict) -> dict:
+    return {key: safe_serialize(value) for key, value in data.items()}
+
+
+@safe_serialize.register(str)
+@safe_serialize.register(int)
+@safe_serialize.register(float)
+@safe_serialize.register(type(None))
+def _(data: Any) -> Any:
+    # JSON-native scalars (bool is covered by int) are returned unchanged.
+    return data
+
+
+# datetime is a subclass of date; dispatch picks this more specific handler first.
+@safe_serialize.register
+def _(data: datetime) -> str:
+    if data.tzinfo is None:
+        # If the datetime is naive, assume it's UTC.
+        data = data.replace(tzinfo=timezone.utc)
+    return data.isoformat().replace("+00:00", "Z")
+
+
+@safe_serialize.register
+def _(data: date) -> str:
+    return data.isoformat()
+
+
+@safe_serialize.register
+def _(data: UUID) -> str:
+    return str(data)
+
+
+@safe_serialize.register
+def _(data: Decimal) -> float:
+    return float(data)
+
+
 def get_nested_value(data: Dict, key_path: str, default: Any = None) -> Any:
     """
     Safely retrieves a value from a nested dictionary using dot notation.
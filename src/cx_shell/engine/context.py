@@ -74,6 +74,16 @@ class RunContext(BaseModel):
         default_factory=dict,
         description="A dictionary holding the results of previously executed steps in the current session.",
     )
+    resolved_connections: Dict[str, Any] = Field(
+        default_factory=dict,
+        exclude=True,
+        description="Per-run memo of (connection, secrets) pairs keyed by connection source.",
+    )
+    resolved_strategies: Dict[str, Any] = Field(
+        default_factory=dict,
+        exclude=True,
+        description="Per-run memo of connector strategies keyed by connection source.",
+    )
 
     class Config:
         arbitrary_types_allowed = True
@@ -1,5 +1,7 @@
 import hashlib
+import shutil
 from pathlib import Path
+from typing import Tuple
 import json
 
 import structlog
@@ -7,9 +9,26 @@ import structlog
 from ..utils import CX_HOME
 from ..engine.connector.utils import safe_serialize
 
+try:
+    import blake3
+except ImportError:  # blake3 ships with the optional `speedups` extra
+    blake3 = None
+
 logger = structlog.get_logger(__name__)
 CACHE_DIR = CX_HOME / "cache"
 
+# New objects are hashed with BLAKE3 when available. Objects written under
+# either algorithm remain readable, as the prefix is part of the identifier.
+HASH_ALGORITHM = "blake3" if blake3 is not None else "sha256"
+SUPPORTED_HASH_ALGORITHMS = frozenset({"blake3", "sha256"})
+
+
+def new_hasher():
+    """Returns a fresh hash object for the configured HASH_ALGORITHM."""
+    if blake3 is not None:
+        return blake3.blake3(max_threads=blake3.blake3.AUTO)
+    return hashlib.sha256()
+
 
 class CacheManager:
     """
@@ -32,20 +51,14 @@ class CacheManager:
             content: The raw bytes of the artifact to be stored.
 
         Returns:
-            The content hash identifier (e.g., "sha256:a1b2c3d4...").
+            The content hash identifier (e.g., "blake3:a1b2c3d4...").
         """
-        hasher = hashlib.sha256()
+        hasher = new_hasher()
         hasher.update(content)
         content_hash = hasher.hexdigest()
 
-        hash_id = f"sha256:{content_hash}"
-
-        # Create a subdirectory based on the first two characters of the hash
-        # to prevent having too many files in one directory.
-        cache_subdir = self.cache_root / content_hash[:2]
-        cache_subdir.mkdir(exist_ok=True)
-
-        file_path = cache_subdir / content_hash[2:]
+        hash_id = f"{HASH_ALGORITHM}:{content_hash}"
+        file_path = self._object_path(content_hash)
 
         # This operation is idempotent. If the file exists, we don't need to write it again.
         if not file_path.exists():
@@ -58,21 +71,62 @@ class CacheManager:
 
         return hash_id
 
-    def write_json(self, data: any) -> str:
+    def write_stream(self, source_path: Path) -> str:
+        """
+        Writes a file on disk to the cache without reading it fully into memory.
+
+        The file is hashed in chunks and, if the object is new, copied into the
+        cache with `shutil.copyfile`. The source file is left untouched.
+
+        Args:
+            source_path: The path of the file to be stored.
+
+        Returns:
+            The content hash identifier (e.g., "blake3:a1b2c3d4...").
+        """
+        with open(source_path, "rb") as f:
+            content_hash = hashlib.file_digest(f, new_hasher).hexdigest()
+
+        hash_id = f"{HASH_ALGORITHM}:{content_hash}"
+        file_path = self._object_path(content_hash)
+
+        if not file_path.exists():
+            shutil.copyfile(source_path, file_path)
+            logger.debug(
+                "cache.write.new_object", content_hash=hash_id, path=str(file_path)
+            )
+        else:
+            logger.debug("cache.write.object_exists", content_hash=hash_id)
+
+        return hash_id
+
+    def _object_path(self, content_hash: str) -> Path:
+        """Returns the storage path for a hex digest, creating its shard directory."""
+        # Create a subdirectory based on the first two characters of the hash
+        # to prevent having too many files in one directory.
+        cache_subdir = self.cache_root / content_hash[:2]
+        cache_subdir.mkdir(exist_ok=True)
+        return cache_subdir / content_hash[2:]
+
+    def write_json(self, data: any) -> Tuple[str, int]:
         """
         A convenience method to serialize a Python object to JSON
         and write it to the cache.
+
+        Returns:
+            A tuple of the content hash identifier and the size in bytes of
+            the serialized JSON, so callers need not serialize it again.
         """
         # Use safe_serialize to handle complex types like datetime
-        json_string = json.dumps(safe_serialize(data), sort_keys=True)
-        return self.write(json_string.encode("utf-8"))
+        json_bytes = json.dumps(safe_serialize(data), sort_keys=True).encode("utf-8")
+        return self.write(json_bytes), len(json_bytes)
 
     def get_path(self, content_hash_id: str) -> Path:
         """
         Resolves a content hash ID to its physical path on disk.
 
         Args:
-            content_hash_id: The hash identifier (e.g., "sha256:a1b2c3d4...").
+            content_hash_id: The hash identifier (e.g., "blake3:a1b2c3d4...").
 
         Returns:
             A Path object pointing to the cached file.
@@ -85,7 +139,7 @@ class CacheManager:
             raise ValueError(f"Invalid content hash ID format: {content_hash_id}")
 
         algo, hash_val = content_hash_id.split(":", 1)
-        if algo != "sha256":
+        if algo not in SUPPORTED_HASH_ALGORITHMS:
             raise ValueError(f"Unsupported hash algorithm: {algo}")
 
         path = self.cache_root / hash_val[:2] / hash_val[2:]
@@ -0,0 +1,121 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from playwright.async_api import Error as PlaywrightError
+
+from cx_shell.engine.connector.providers.browser.agent.action_executor import (
+    ActionExecutor,
+)
+
+
+def _executor() -> ActionExecutor:
+    return ActionExecutor(MagicMock(), default_timeout=5000)
+
+
+@pytest.mark.asyncio
+async def test_is_in_viewport_uses_the_in_page_hit_test():
+    """
+    Unit Test: Verifies the viewport shortcut trusts the in-page check (which
+    also hit-tests the element's centre) and treats errors as "not visible".
+    """
+    executor = _executor()
+    locator = MagicMock()
+    locator.evaluate = AsyncMock(return_value=False)
+    assert await executor._is_in_viewport(locator, 500) is False
+
+    locator.evaluate = AsyncMock(return_value=True)
+    assert await executor._is_in_viewport(locator, 500) is True
+    assert "elementFromPoint" in locator.evaluate.await_args.args[0]
+
+    locator.evaluate = AsyncMock(side_effect=RuntimeError("detached"))
+    assert await executor._is_in_viewport(locator, 500) is False
+
+
+@pytest.mark.asyncio
+async def test_container_scroll_passes_the_container_to_the_helper():
+    """
+    Unit Test: Verifies the container branch hands the found container to the
+    scrollIntoView helper rather than ignoring it.
+    """
+    executor = _executor()
+    locator = MagicMock()
+    locator.evaluate = AsyncMock(return_value=True)
+    container = MagicMock()
+
+    assert await executor._scroll_element_in_container_js(locator, container) is True
+    assert locator.evaluate.await_args.kwargs["arg"] is container
+
+
+@pytest.mark.asyncio
+async def test_scrollable_ancestor_cache_revalidates_against_the_target(mocker):
+    """
+    Unit Test: Verifies a cached container is reused only while the page
+    confirms it still holds the target, is looked up again otherwise, and is
+    forgotten when the main frame navigates.
+    """
+    executor = _executor()
+    first, second = MagicMock(name="first"), MagicMock(name="second")
+    first.dispose = AsyncMock()
+    find = mocker.patch.object(
+        executor, "_find_scrollable_ancestor", AsyncMock(side_effect=[first, second])
+    )
+    locator = MagicMock()
+
+    assert await executor._cached_scrollable_ancestor(locator, "#item") == (first, True)
+
+    locator.evaluate = AsyncMock(return_value=True)
+    assert await executor._cached_scrollable_ancestor(locator, "#item") == (first, True)
+    assert locator.evaluate.await_args.args[1] is first
+    assert find.await_count == 1
+
+    locator.evaluate = AsyncMock(side_effect=PlaywrightError("detached"))
+    assert await executor._cached_scrollable_ancestor(locator, "#item") == (
+        second,
+        True,
+    )
+    first.dispose.assert_awaited_once()
+    assert find.await_count == 2
+
+    executor._on_frame_navigated(executor.page.main_frame)
+    assert executor._scrollable_container_cache == {}
+
+
+@pytest.mark.asyncio
+async def test_scrollable_ancestor_without_selector_is_not_cached(mocker):
+    """
+    Unit Test: Verifies containers found for a target without a selector
+    string are returned uncached, so the caller disposes them.
+    """
+    executor = _executor()
+    container = MagicMock()
+    mocker.patch.object(
+        executor, "_find_scrollable_ancestor", AsyncMock(return_value=container)
+    )
+
+    assert await executor._cached_scrollable_ancestor(MagicMock(), None) == (
+        container,
+        False,
+    )
+    assert executor._scrollable_container_cache == {}
+
+
+@pytest.mark.asyncio
+async def test_evaluate_helper_falls_back_only_when_helpers_are_missing():
+    """
+    Unit Test: Verifies an installed helper that throws is not re-run from
+    source, while a document without the helpers gets the source shipped.
+    """
+    executor = _executor()
+    executor._helpers_installed = True
+    locator = MagicMock()
+
+    locator.evaluate = AsyncMock(side_effect=PlaywrightError("Element is detached"))
+    with pytest.raises(PlaywrightError):
+        await executor._evaluate_helper(locator, "size")
+    assert locator.evaluate.await_count == 1
+
+    locator.evaluate = AsyncMock(
+        side_effect=[PlaywrightError("Error: cx-action-helpers-missing"), [10, 20]]
+    )
+    assert await executor._evaluate_helper(locator, "size") == [10, 20]
+    assert "getBoundingClientRect" in locator.evaluate.await_args.args[0]
@@ -0,0 +1,316 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from cx_shell.engine.connector.providers.browser.agent.locator_resolver import (
+    LocatorResolver,
+    _build_target_selector_str,
+    _escape_css_string,
+    _first_resolved,
+    _is_plain_css,
+    _normalize_whitespace,
+)
+
+# The strategies _inapplicable_strategies can rule out up front
+_GUARDED_STRATEGIES = (
+    "_try_label",
+    "_try_placeholder",
+    "_try_name_attribute",
+    "_try_value_attribute",
+    "_try_test_id",
+    "_try_id_attribute",
+    "_try_autocomplete_item",
+    "_try_relative_locator",
+)
+
+
+def _resolver() -> LocatorResolver:
+    return LocatorResolver(MagicMock())
+
+
+def test_escape_css_string_escapes_quotes_and_backslashes():
+    """
+    Unit Test: Verifies backslashes and both quote characters are escaped,
+    and that escapes already added are not escaped again.
+    """
+    assert _escape_css_string("a\"b'c\\d") == "a\\\"b\\'c\\\\d"
+
+
+def test_normalize_whitespace_collapses_runs():
+    """
+    Unit Test: Verifies runs of whitespace collapse to single spaces and the
+    ends are stripped.
+    """
+    assert _normalize_whitespace("  Sign \n\t in  ") == "Sign in"
+
+
+def test_is_plain_css_rejects_playwright_only_syntax():
+    """
+    Unit Test: Verifies selectors the browser's own CSS engine would reject
+    are told apart from plain CSS.
+    """
+    assert _is_plain_css("form input[name='q']")
+    assert not _is_plain_css("text=Sign in")
+    assert not _is_plain_css("div >> button")
+    assert not _is_plain_css("button:has-text('Go')")
+
+
+@pytest.mark.parametrize(
+    "fields, expected",
+    [
+        (
+            ("button", " Save  now ", None, None, None, "button", 100),
+            ("button[role='button']:has-text('Save now')", "Role/Name approx"),
+        ),
+        (
+            (None, None, None, None, "It's here", "*", 100),
+            (":has-text('It\\'s here')", "Tag/Text"),
+        ),
+        (
+            (None, None, "submit", "q", "x" * 200, "input", 100),
+            ('[data-testid="submit"]', "Test ID"),
+        ),
+        (
+            (None, None, None, "q", None, "input", 100),
+            ('input[name="q"]', "Name Attr"),
+        ),
+        ((None, None, None, None, None, "span", 100), ("span", "Tag only")),
+        ((None, None, None, None, None, "*", 100), None),
+    ],
+)
+def test_build_target_selector_str_follows_field_priority(fields, expected):
+    """
+    Unit Test: Verifies the target selector prefers role+name, then text,
+    then test id and name attribute, and leaves wildcard tags out.
+    """
+    assert _build_target_selector_str(*fields) == expected
+
+
+def test_attribute_probes_are_simple_compound_selectors():
+    """
+    Unit Test: Verifies the pruning probe only counts test-id, id and name
+    selectors, and leaves out the stored CSS selector, whose combinators may
+    cross shadow roots that the in-page count cannot follow.
+    """
+    element_info = {
+        "locators": {"css_selector": "my-app form button"},
+        "attributes": {
+            "id": "send",
+            "name": "send",
+            "data_attributes": {"testid": "send-button"},
+        },
+    }
+
+    probes = _resolver()._attribute_probe_selectors(
+        element_info, {"element_type": "button"}
+    )
+
+    assert probes == {
+        "_try_test_id": '[data-testid="send-button"]',
+        "_try_id_attribute": "#send",
+        "_try_name_attribute": 'button[name="send"]',
+    }
+
+
+def test_match_candidates_keeps_case_variants_unless_told_to_ignore_case():
+    """
+    Unit Test: Verifies candidate texts keep priority order and drop empty,
+    over-long and non-string values, and that case-only variants survive
+    (get_by_text's exact pass is case-sensitive) unless ignore_case is set.
+    """
+    resolver = _resolver()
+    too_long = "x" * resolver.MAX_TEXT_MATCH_LENGTH
+    texts = (" Sign  in ", None, "SIGN IN", "", too_long, 42, "Sign in", "Log in")
+
+    assert resolver._match_candidates(*texts) == ["Sign in", "SIGN IN", "Log in"]
+    assert resolver._match_candidates(*texts, ignore_case=True) == [
+        "Sign in",
+        "Log in",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_first_resolved_honours_list_order_and_cancels_the_rest():
+    """
+    Unit Test: Verifies a later awaitable finishing first does not win over
+    an earlier truthy one, and that still-pending awaitables are cancelled.
+    """
+    cancelled = asyncio.Event()
+
+    async def slow_winner():
+        await asyncio.sleep(0.02)
+        return "first"
+
+    async def fast_loser():
+        return "second"
+
+    async def never_finishes():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    result = await _first_resolved([slow_winner(), fast_loser(), never_finishes()])
+
+    assert result == "first"
+    assert cancelled.is_set()
+
+
+@pytest.mark.asyncio
+async def test_first_resolved_skips_falsy_results_and_surfaces_errors_in_order():
+    """
+    Unit Test: Verifies falsy results fall through to the next awaitable and
+    that an exception surfaces when reached in list order.
+    """
+
+    async def value(v):
+        return v
+
+    async def boom():
+        raise RuntimeError("boom")
+
+    assert await _first_resolved([value(None), value(""), value("ok")]) == "ok"
+    assert await _first_resolved([value(None)]) is None
+    with pytest.raises(RuntimeError):
+        await _first_resolved([value(None), boom(), value("late")])
+    assert await _first_resolved([value("early"), boom()]) == "early"
+
+
+@pytest.mark.asyncio
+async def test_race_strategies_returns_the_earliest_listed_winner(mocker):
+    """
+    Unit Test: Verifies raced strategies report the first strategy in list
+    order that resolves, and that losing strategies are not logged as successes.
+    """
+    resolver = _resolver()
+    winner, loser = MagicMock(name="winner"), MagicMock(name="loser")
+
+    async def _try_label(element_info, command_info):
+        await asyncio.sleep(0.02)
+        return winner
+
+    async def _try_placeholder(element_info, command_info):
+        return loser
+
+    async def verify(locator, *args, **kwargs):
+        return True
+
+    for candidate in (winner, loser):
+        candidate.count = AsyncMock(return_value=1)
+    mocker.patch.object(resolver, "_verify_element_match", side_effect=verify)
+    log_info = mocker.patch(
+        "cx_shell.engine.connector.providers.browser.agent.locator_resolver.logger.info"
+    )
+
+    result = await resolver._race_strategies(
+        [_try_label, _try_placeholder], {}, {"command_type": "click"}, 0
+    )
+
+    assert result == ("label", winner)
+    assert not any(
+        call.args and call.args[0] == "Locator resolution successful"
+        for call in log_info.call_args_list
+    )
+
+
+@pytest.mark.parametrize(
+    "element_info, element_type",
+    [
+        ({}, "div"),
+        ({"attributes": "not-a-dict", "accessibility": ["nor", "this"]}, "input"),
+        (
+            {
+                "locators": {"label_text": "Email"},
+                "attributes": {
+                    "placeholder": "you@example.com",
+                    "name": "email",
+                    "value": "a",
+                    "id": "email",
+                    "data_attributes": {"testid": "email-input"},
+                },
+            },
+            "input",
+        ),
+        (
+            {
+                "text": "Paris",
+                "accessibility": {"name": "Paris"},
+                "attributes": {"data_attributes": {"ngClick": "increaseRoomAdult(0)"}},
+            },
+            "a",
+        ),
+    ],
+)
+@pytest.mark.asyncio
+async def test_inapplicable_strategies_match_each_strategy_guard(
+    element_info, element_type
+):
+    """
+    Unit Test: Verifies every strategy _inapplicable_strategies skips would
+    have returned None before touching the page, and every strategy it keeps
+    gets past its own guard.
+    """
+    command_info = {"command_type": "click", "element_type": element_type}
+    skipped = _resolver()._inapplicable_strategies(element_info, command_info)
+
+    for name in _GUARDED_STRATEGIES:
+        resolver = _resolver()
+        resolver.page.reset_mock()  # Drop the constructor's truthiness check
+        result = await getattr(resolver, name)(element_info, command_info)
+        page_used = bool(resolver.page.mock_calls)
+        assert page_used is (name not in skipped), name
+        if name in skipped:
+            assert result is None, name
+
+
+def test_element_features_ignore_non_dict_attributes():
+    """
+    Unit Test: Verifies malformed attributes/accessibility values fall back
+    to empty dicts instead of breaking every later lookup.
+    """
+    features = _resolver()._element_features(
+        {"attributes": "class=primary", "accessibility": ["button"]}
+    )
+
+    assert (features.attrs, features.acc, features.data_attrs) == ({}, {}, {})
+    assert (features.role, features.acc_name, features.test_id) == (None, None, None)
+
+
+@pytest.mark.asyncio
+async def test_bulk_element_properties_are_cached_per_selector():
+    """
+    Unit Test: Verifies one evaluate_all round-trip serves repeat property
+    reads for the same selector, and that a failed read returns None once
+    the cache is reset as find_locator does.
+    """
+    resolver = _resolver()
+    locator = MagicMock()
+    locator.__str__.return_value = "Locator@button"
+    locator.evaluate_all = AsyncMock(
+        return_value=[
+            {"tag": "button", "txt": "Go", "acc": "Go", "attrs": {"class": "primary"}}
+        ]
+    )
+
+    first = await resolver._get_all_element_properties(locator)
+    second = await resolver._get_all_element_properties(locator)
+
+    assert (
+        first
+        == second
+        == [
+            {
+                "tag_name": "button",
+                "text": "Go",
+                "acc_name": "Go",
+                "attrs": {"class": "primary", "class_str": "primary"},
+            }
+        ]
+    )
+    assert locator.evaluate_all.await_count == 1
+
+    resolver._element_properties_cache = {}
+    locator.evaluate_all.side_effect = RuntimeError("detached")
+    assert await resolver._get_all_element_properties(locator) is None
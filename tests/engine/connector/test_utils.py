@@ -0,0 +1,35 @@
+# ~/repositories/cx-shell/tests/engine/connector/test_utils.py
+
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from uuid import UUID
+
+from cx_shell.engine.connector.utils import safe_serialize
+
+
+def test_safe_serialize_converts_nested_non_json_types():
+    """
+    Unit Test: Verifies that safe_serialize converts datetimes, dates, UUIDs and
+    Decimals anywhere in a nested structure and leaves JSON-native values alone.
+    """
+    payload = {
+        "created": datetime(2024, 1, 1, 12, 30),
+        "rows": [
+            {"day": date(2024, 1, 2), "amount": Decimal("1.50")},
+            {"id": UUID(int=1), "active": True, "note": None},
+        ],
+        "updated": datetime(2024, 1, 1, tzinfo=timezone.utc),
+    }
+
+    assert safe_serialize(payload) == {
+        "created": "2024-01-01T12:30:00Z",
+        "rows": [
+            {"day": "2024-01-02", "amount": 1.5},
+            {
+                "id": "00000000-0000-0000-0000-000000000001",
+                "active": True,
+                "note": None,
+            },
+        ],
+        "updated": "2024-01-01T00:00:00Z",
+    }
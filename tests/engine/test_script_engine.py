@@ -1,4 +1,6 @@
 from pathlib import Path
+import jmespath
+import networkx as nx
 import pytest
 import yaml
 from pytest_mock import MockerFixture
@@ -8,6 +10,15 @@ from cx_shell.interactive.session import SessionState
 from cx_shell.engine.context import RunContext
 from cx_core_schemas.api_catalog import ApiCatalog
 from cx_shell.engine.connector.config import ConnectionResolver
+from cx_core_schemas.connector_script import ConnectorStep, ReadContentAction
+from cx_shell.engine.connector.engine import (
+    ScriptEngine,
+    _implicit_step_references,
+    compile_jmespath,
+    recursive_render_factory,
+    sql_quote_filter,
+)
+from jinja2 import Environment
 
 
 @pytest.mark.asyncio
@@ -102,3 +113,151 @@ async def test_script_engine_executes_blueprint_action_with_mocks(
     user_data = results["get_user"]
     assert "error" not in user_data, user_data.get("error")
     assert user_data["id"] == 1024025
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (None, "NULL"),
+        ("plain", "'plain'"),
+        ("O'Brien", "'O''Brien'"),
+        ("''", "''''''"),
+        (42, "'42'"),
+    ],
+)
+def test_sql_quote_filter_escapes_single_quotes(value, expected):
+    assert sql_quote_filter(value) == expected
+
+
+def test_recursive_render_reuses_untemplated_subtrees():
+    """
+    Unit Test: Verifies that recursive_render renders Jinja strings without
+    mutating its input and returns template-free subtrees by reference.
+    """
+    recursive_render = recursive_render_factory(Environment())
+    static_block = {"headers": ["id", "name"], "options": {"paginate": False}}
+    step = {"query": "{{ table }}", "static": static_block, "items": ["a", "{{ n }}"]}
+
+    rendered = recursive_render(step, {"table": "users", "n": 2})
+
+    assert rendered == {"query": "users", "static": static_block, "items": ["a", "2"]}
+    assert rendered["static"] is static_block
+    assert step["query"] == "{{ table }}"
+    assert recursive_render(static_block, {}) is static_block
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("user.login", "torvalds"),
+        ("user.missing.deeper", None),
+        ("repos[0].name", "linux"),
+        ("repos[?stars > `100`].name", ["linux"]),
+        ("user.login.length", None),
+    ],
+)
+def test_compile_jmespath_matches_jmespath_semantics(query, expected):
+    data = {
+        "user": {"login": "torvalds"},
+        "repos": [{"name": "linux", "stars": 1000}, {"name": "test", "stars": 1}],
+    }
+
+    assert compile_jmespath(query).search(data) == expected
+    assert compile_jmespath(query).search(data) == jmespath.search(query, data)
+
+
+def test_implicit_step_references_cover_inputs_templates_and_if():
+    """
+    Unit Test: Verifies that a step's reads of other steps through `inputs`,
+    templates and its `if` expression are found, so they become DAG edges.
+    """
+    step = ConnectorStep(
+        id="report",
+        engine="ui-component",
+        inputs=["get_data.rows"],
+        content="title: {{ steps.get_meta.outputs.title }}\ncount: {{ steps['get-count'].result }}",
+        **{"if": "steps.check.result"},
+    )
+    plain = ConnectorStep(id="notes", engine="markdown", content="See steps.get_data")
+
+    assert _implicit_step_references(step) == {
+        "get_data",
+        "get_meta",
+        "get-count",
+        "check",
+    }
+    assert _implicit_step_references(plain) == set()
+
+
+def test_split_generation_runs_only_side_effect_free_steps_together():
+    """
+    Unit Test: Verifies that only consecutive side-effect-free steps share a
+    batch, while writes, queries, transforms and the like run one at a time
+    in document order.
+    """
+    dag = nx.DiGraph()
+    for step in [
+        ConnectorStep(id="r1", run=ReadContentAction(action="read_content", path="a")),
+        ConnectorStep(id="r2", run=ReadContentAction(action="read_content", path="b")),
+        ConnectorStep(id="note", engine="markdown", content="# Notes"),
+        ConnectorStep(id="insert", engine="sql", content="insert into t values (1)"),
+        ConnectorStep(id="select", engine="sql", content="select * from t"),
+        ConnectorStep(id="t", engine="transform", content="steps: []"),
+        ConnectorStep(id="r3", run=ReadContentAction(action="read_content", path="c")),
+    ]:
+        dag.add_node(step.id, step_data=step)
+
+    batches = ScriptEngine._split_generation(dag, list(dag.nodes))
+
+    assert batches == [
+        ["r1", "r2", "note"],
+        ["insert"],
+        ["select"],
+        ["t"],
+        ["r3"],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_run_records_steps_that_succeeded_beside_a_failed_one(
+    tmp_path: Path, mocker: MockerFixture
+):
+    """
+    Unit Test: Verifies that when one step of a concurrent batch fails, the
+    steps that succeeded beside it still reach the manifest (so a re-run
+    finds their cache entries) before the run is marked failed.
+    """
+    mocker.patch("cx_shell.engine.connector.engine.RUNS_DIR", tmp_path)
+    mocker.patch("cx_shell.engine.connector.engine.CacheManager")
+    engine = ScriptEngine(mocker.MagicMock(), mocker.MagicMock())
+    written = {}
+    mocker.patch.object(
+        ScriptEngine,
+        "_write_manifest_sync",
+        side_effect=lambda path, manifest, indent: written.update(manifest=manifest),
+    )
+    ok_result = mocker.MagicMock(step_id="ok", output_hash="abc")
+
+    async def run_step(context, dag, predecessors, step_id, *args):
+        if step_id == "bad":
+            raise RuntimeError("boom")
+        return ok_result, "ok-result", {}
+
+    mocker.patch.object(engine, "_run_single_step", side_effect=run_step)
+    context = mocker.MagicMock(script_input={}, steps={})
+    script = {
+        "name": "flow",
+        "steps": [
+            {"id": "bad", "engine": "markdown", "content": "# a"},
+            {"id": "ok", "engine": "markdown", "content": "# b"},
+        ],
+    }
+
+    results = await engine.run_script_model(context, script)
+
+    assert results["ok"] == "ok-result"
+    assert results["error"] == "RuntimeError: boom"
+    manifest = written["manifest"]
+    assert manifest.status == "failed"
+    assert manifest.steps[0] is ok_result
+    assert context.steps["ok"]["result"] == "ok-result"
@@ -0,0 +1,29 @@
+# ~/repositories/cx-shell/tests/management/test_cache_manager.py
+
+import pytest
+from pathlib import Path
+
+from cx_shell.management import cache_manager as cache_manager_module
+from cx_shell.management.cache_manager import CacheManager
+
+
+@pytest.fixture
+def cache(tmp_path: Path, monkeypatch) -> CacheManager:
+    """Provides a CacheManager whose content-addressable store lives in tmp_path."""
+    monkeypatch.setattr(cache_manager_module, "CACHE_DIR", tmp_path / "cache")
+    return CacheManager()
+
+
+def test_write_stream_matches_in_memory_write(cache: CacheManager, tmp_path: Path):
+    """
+    Unit Test: Verifies that streaming a file into the cache produces the same
+    content hash as writing its bytes, and leaves the source file in place.
+    """
+    source = tmp_path / "report.csv"
+    source.write_bytes(b"id,name\n1,alpha\n2,beta\n")
+
+    streamed_hash = cache.write_stream(source)
+
+    assert streamed_hash == cache.write(source.read_bytes())
+    assert cache.read_bytes(streamed_hash) == source.read_bytes()
+    assert source.exists()